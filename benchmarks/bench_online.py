@@ -0,0 +1,41 @@
+"""Throughput of OnlineEstimator.update, in bars per second."""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.online import OnlineEstimator
+
+
+def bench_online(n_assets, n_bars, alpha=None, seed=0):
+    """Return the number of bars per second processed by ``update``."""
+    bars = np.random.default_rng(seed).normal(0.0, 0.01, size=(n_bars, n_assets))
+    estimator = OnlineEstimator(n_assets, alpha=alpha)
+
+    start = time.perf_counter()
+    for bar in bars:
+        estimator.update(bar)
+    elapsed = time.perf_counter() - start
+
+    return n_bars / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--assets', type=int, nargs='+', default=[10, 100, 500, 1000])
+    parser.add_argument('--bars', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'assets':>8} {'welford bars/s':>16} {'ewma bars/s':>16}")
+    for n_assets in args.assets:
+        welford = bench_online(n_assets, args.bars)
+        ewma = bench_online(n_assets, args.bars, alpha=0.05)
+        print(f"{n_assets:>8} {welford:>16,.0f} {ewma:>16,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Memory, speed and accuracy of float32 versus float64 storage of return panels and scenarios."""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.data_loader import DataLoader
+from src.data.market_data import MarketData, SyntheticSource
+from src.optimization.batch import BatchOptimizer
+from src.optimization.resampling import _SAMPLE_CHUNK, draw_samples
+
+PRECISIONS = ('float64', 'float32')
+
+
+def bench_statistics(n_assets, start_date, end_date, precision, seed=0):
+    """Load a synthetic universe and compute its annualized statistics."""
+    symbols = [f'S{i:04d}' for i in range(n_assets)]
+    loader = DataLoader(symbols, start_date, end_date, market_data=MarketData(SyntheticSource(seed=seed)),
+                        precision=precision)
+    loader.load_data()
+
+    start = time.perf_counter()
+    returns = loader.calculate_returns()
+    expected_returns = loader.get_annualized_returns()
+    cov_matrix = loader.get_covariance_matrix()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'panel_mb': returns.memory_usage(index=False).sum() / 1024 ** 2,
+        'seconds': elapsed,
+        'returns': returns,
+        'expected_returns': expected_returns,
+        'cov_matrix': cov_matrix,
+    }
+
+
+def bench_scenarios(returns, precision, n_samples=_SAMPLE_CHUNK, seed=0):
+    """Time parametric scenario sampling and report the size of one chunk of panels."""
+    start = time.perf_counter()
+    draw_samples(returns, n_samples, method='parametric', seed=seed, precision=precision)
+    elapsed = time.perf_counter() - start
+    n_obs, n_assets = returns.shape
+    chunk_mb = _SAMPLE_CHUNK * n_obs * n_assets * np.dtype(precision).itemsize / 1024 ** 2
+    return {'chunk_mb': chunk_mb, 'seconds': elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--assets', type=int, nargs='+', default=[100, 500, 1000])
+    parser.add_argument('--start-date', default='2016-01-01')
+    parser.add_argument('--end-date', default='2020-12-31')
+    parser.add_argument('--risk-aversion', type=float, nargs='+', default=[2.0, 5.0, 10.0])
+    args = parser.parse_args()
+
+    print(f"{'assets':>7} {'precision':>9} {'panel MB':>9} {'stats s':>8} {'scen MB':>8} {'scen s':>7} "
+          f"{'max cov rel err':>16} {'max |dw|':>10}")
+    for n_assets in args.assets:
+        results = {}
+        for precision in PRECISIONS:
+            stats = bench_statistics(n_assets, args.start_date, args.end_date, precision)
+            stats.update({'scenario_' + k: v for k, v in
+                          bench_scenarios(stats['returns'], precision).items()})
+            weights = BatchOptimizer(stats['expected_returns'], stats['cov_matrix']).solve(
+                args.risk_aversion, n_jobs=1)['weights']
+            stats['weights'] = weights.to_numpy()
+            results[precision] = stats
+
+        reference = results['float64']
+        scale = np.abs(reference['cov_matrix'].to_numpy()).max()
+        for precision in PRECISIONS:
+            stats = results[precision]
+            cov_error = np.abs(stats['cov_matrix'].to_numpy() - reference['cov_matrix'].to_numpy()).max() / scale
+            weight_error = np.abs(stats['weights'] - reference['weights']).max()
+            print(f"{n_assets:>7} {precision:>9} {stats['panel_mb']:>9.1f} {stats['seconds']:>8.2f} "
+                  f"{stats['scenario_chunk_mb']:>8.1f} {stats['scenario_seconds']:>7.2f} "
+                  f"{cov_error:>16.2e} {weight_error:>10.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Wall time of fresh interpreters importing the package or running the CLI no-op path."""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Dependencies that should only be imported on first use
+HEAVY_MODULES = ('scipy.optimize', 'matplotlib', 'yfinance')
+
+CASES = {
+    'interpreter': [sys.executable, '-c', 'pass'],
+    'import markowitz': [sys.executable, '-c', 'import src.optimization.markowitz'],
+    'import package': [sys.executable, '-c',
+                       'import src.optimization.markowitz, src.optimization.black_litterman, '
+                       'src.data.data_loader, src.visualization.efficient_frontier'],
+    'cli --help': [sys.executable, os.path.join('src', 'main.py'), '--help'],
+}
+
+
+def time_command(command, repeat):
+    """Return the wall time in seconds of each of ``repeat`` runs of ``command``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def heavy_modules_loaded(statement):
+    """Names in ``HEAVY_MODULES`` that end up in sys.modules after ``statement``."""
+    check = f"{statement}\nimport sys\nprint(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, '-c', check], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return output.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'case':>18} {'median ms':>10} {'min ms':>10}")
+    for name, command in CASES.items():
+        timings = time_command(command, args.repeat)
+        print(f"{name:>18} {statistics.median(timings) * 1e3:>10.1f} {min(timings) * 1e3:>10.1f}")
+
+    loaded = heavy_modules_loaded(CASES['import package'][-1])
+    print(f"\nheavy modules loaded by 'import package': {', '.join(loaded) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+"""
+Scalability benchmarks for the optimizers, data statistics and risk metrics.
+
+Every case runs on seeded synthetic factor-model data over a grid of
+universe sizes (N assets x T days). Results are written to a JSON file so
+that two runs, e.g. before and after a change, can be compared:
+
+    python benchmarks/run_benchmarks.py --output before.json
+    python benchmarks/run_benchmarks.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import scipy
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.alignment import align_series
+from src.data.data_loader import DataLoader
+from src.data.synthetic import generate_market_caps, generate_prices, generate_returns
+from src.optimization.batch import BatchOptimizer
+from src.optimization.black_litterman import BlackLittermanModel
+from src.optimization.discrete_allocation import DiscreteAllocation
+from src.optimization.markowitz import MarkowitzOptimizer
+from src.utils import risk_metrics
+
+GRIDS = {
+    'quick': {'n_assets': [10, 50], 'n_days': [252, 1260]},
+    'full': {'n_assets': [10, 50, 100, 250], 'n_days': [252, 1260, 2520]},
+}
+
+
+def _statistics(n_assets, n_days):
+    returns = generate_returns(n_assets, n_days, seed=n_assets)
+    return returns.mean() * 252, returns.cov() * 252
+
+
+def case_minimize_volatility(n_assets, n_days):
+    expected_returns, cov_matrix = _statistics(n_assets, n_days)
+    optimizer = MarkowitzOptimizer(expected_returns, cov_matrix)
+    return optimizer.minimize_volatility
+
+
+def case_efficient_frontier(n_assets, n_days):
+    expected_returns, cov_matrix = _statistics(n_assets, n_days)
+    optimizer = MarkowitzOptimizer(expected_returns, cov_matrix)
+    return lambda: optimizer.efficient_frontier(points=10)
+
+
+def case_black_litterman_adjust_views(n_assets, n_days):
+    _, cov_matrix = _statistics(n_assets, n_days)
+    model = BlackLittermanModel(generate_market_caps(n_assets), 2.5, cov_matrix)
+    n_views = max(1, n_assets // 10)
+    P = np.zeros((n_views, n_assets))
+    P[np.arange(n_views), np.arange(n_views)] = 1.0
+    P[np.arange(n_views), np.arange(n_views) + 1] = -1.0
+    Q = np.full(n_views, 0.02)
+    return lambda: model.adjust_views(P, Q)
+
+
+def case_black_litterman_idzorek(n_assets, n_days):
+    _, cov_matrix = _statistics(n_assets, n_days)
+    model = BlackLittermanModel(generate_market_caps(n_assets), 2.5, cov_matrix)
+    n_views = min(50, n_assets - 1)
+    P = np.zeros((n_views, n_assets))
+    P[np.arange(n_views), np.arange(n_views)] = 1.0
+    P[np.arange(n_views), np.arange(n_views) + 1] = -1.0
+    Q = np.full(n_views, 0.02)
+    confidences = np.linspace(0.1, 1.0, n_views)
+    return lambda: model.incorporate_views(P, Q, confidences=confidences)
+
+
+def case_batch_solve(n_assets, n_days):
+    expected_returns, cov_matrix = _statistics(n_assets, n_days)
+    optimizer = BatchOptimizer(expected_returns, cov_matrix)
+    risk_aversion = np.linspace(1, 10, 1000)
+    holdings = np.full(n_assets, 1.0 / n_assets)
+    return lambda: optimizer.solve(risk_aversion, lower=-1, upper=1, holdings=holdings,
+                                   turnover_penalty=1.0, n_jobs=1)
+
+
+def case_discrete_allocation(n_assets, n_days):
+    prices = generate_prices(n_assets, n_days, seed=n_assets)
+    weights = np.random.default_rng(n_assets).dirichlet(np.ones(n_assets))
+    allocation = DiscreteAllocation(weights, prices.iloc[-1].values, total_portfolio_value=1e6)
+
+    def run():
+        allocation.greedy_portfolio()
+        allocation.milp_portfolio()
+
+    return run
+
+
+def _loader(n_assets, n_days):
+    loader = DataLoader([f'ASSET{i:04d}' for i in range(n_assets)])
+    loader.data = generate_prices(n_assets, n_days, seed=n_assets)
+    return loader
+
+
+def case_data_loader_returns(n_assets, n_days):
+    return _loader(n_assets, n_days).calculate_returns
+
+
+def case_data_loader_covariance(n_assets, n_days):
+    return _loader(n_assets, n_days).get_covariance_matrix
+
+
+def _mixed_calendar_series(n_assets, n_days):
+    """Synthetic prices where every asset misses ~3% of days and a tenth list late."""
+    prices = generate_prices(n_assets, n_days, seed=n_assets)
+    rng = np.random.default_rng(n_assets)
+    series = {}
+    for j, name in enumerate(prices.columns):
+        column = prices[name][rng.random(n_days) >= 0.03]
+        series[name] = column.iloc[n_days // 2:] if j % 10 == 0 else column
+    return series
+
+
+def case_align_series(n_assets, n_days):
+    series = _mixed_calendar_series(n_assets, n_days)
+    return lambda: align_series(series)
+
+
+def case_data_loader_pairwise(n_assets, n_days):
+    prices = align_series(_mixed_calendar_series(n_assets, n_days))
+
+    def run():
+        loader = DataLoader(list(prices.columns), missing='pairwise')
+        loader.data = prices
+        loader.get_covariance_matrix()
+
+    return run
+
+
+def case_risk_metrics(n_assets, n_days):
+    returns = generate_returns(n_assets, n_days, seed=n_assets)
+    portfolio = returns.mean(axis=1).values
+
+    def run():
+        risk_metrics.calculate_sharpe_ratio(portfolio)
+        risk_metrics.calculate_sortino_ratio(portfolio)
+        risk_metrics.calculate_maximum_drawdown(portfolio)
+        risk_metrics.calculate_var(portfolio)
+        risk_metrics.calculate_cvar(portfolio)
+
+    return run
+
+
+CASES = {
+    'minimize_volatility': case_minimize_volatility,
+    'efficient_frontier': case_efficient_frontier,
+    'black_litterman_adjust_views': case_black_litterman_adjust_views,
+    'black_litterman_idzorek': case_black_litterman_idzorek,
+    'batch_solve': case_batch_solve,
+    'discrete_allocation': case_discrete_allocation,
+    'data_loader_returns': case_data_loader_returns,
+    'data_loader_covariance': case_data_loader_covariance,
+    'align_series': case_align_series,
+    'data_loader_pairwise': case_data_loader_pairwise,
+    'risk_metrics': case_risk_metrics,
+}
+
+
+def time_call(func, repeat, min_time=0.05):
+    """Time ``func`` ``repeat`` times, looping fast calls to reach ``min_time``."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    loops = max(1, int(min_time / elapsed)) if elapsed > 0 else 1000
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter() - start) / loops)
+    return timings
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=os.path.dirname(__file__), text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(cases, grid, repeat):
+    """Run the selected cases over the size grid and return the result records."""
+    results = []
+    for name in cases:
+        for n_assets in grid['n_assets']:
+            for n_days in grid['n_days']:
+                timings = time_call(CASES[name](n_assets, n_days), repeat)
+                record = {
+                    'case': name,
+                    'n_assets': n_assets,
+                    'n_days': n_days,
+                    'min': min(timings),
+                    'median': statistics.median(timings),
+                    'repeat': repeat,
+                }
+                results.append(record)
+                print(f"{name:<30} N={n_assets:<5} T={n_days:<5} "
+                      f"min={record['min'] * 1e3:10.3f} ms  median={record['median'] * 1e3:10.3f} ms")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the change against a previous run and return the regressions."""
+    previous = {(r['case'], r['n_assets'], r['n_days']): r for r in baseline['results']}
+    regressions = []
+
+    print(f"\nComparison with {baseline['meta'].get('revision') or 'baseline'} (min times):")
+    for record in results:
+        key = (record['case'], record['n_assets'], record['n_days'])
+        if key not in previous:
+            continue
+        ratio = record['min'] / previous[key]['min']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressions.append((key, ratio))
+        print(f"{key[0]:<30} N={key[1]:<5} T={key[2]:<5} {ratio:6.2f}x{flag}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), default=list(CASES))
+    parser.add_argument('--grid', choices=sorted(GRIDS), default='quick')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='JSON file to write the results to')
+    parser.add_argument('--compare', help='JSON file from a previous run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slowdown reported as a regression')
+    args = parser.parse_args()
+
+    results = run(args.cases, GRIDS[args.grid], args.repeat)
+    report = {
+        'meta': {
+            'revision': _git_revision(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'scipy': scipy.__version__,
+            'machine': platform.machine(),
+            'grid': args.grid,
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+
+# Values processed at a time by align_prices and pairwise_returns (512 KB of float64)
+_BLOCK_SIZE = 2 ** 16
+
+
+def union_calendar(indexes):
+    """
+    Sorted union of several date indexes.
+
+    Parameters:
+    -----------
+    indexes : list of pandas.DatetimeIndex
+        Dates of each series
+
+    Returns:
+    --------
+    pandas.DatetimeIndex
+        Every date that appears in at least one index
+    """
+    stamps = [pd.DatetimeIndex(index).to_numpy() for index in indexes]
+    if not stamps:
+        return pd.DatetimeIndex([])
+    return pd.DatetimeIndex(np.unique(np.concatenate(stamps)))
+
+
+def align_series(series, calendar=None):
+    """
+    Place price series with different calendars side by side.
+
+    Each series is scattered into a preallocated array at the positions of
+    its dates, which costs O(T log T) per series instead of pandas'
+    repeated index alignment.
+
+    Parameters:
+    -----------
+    series : dict
+        Mapping of name to pandas.Series indexed by date
+    calendar : pandas.DatetimeIndex, optional
+        Dates of the panel (the union of the series' dates if None);
+        observations on other dates are dropped
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One column per series, NaN where a series has no observation
+    """
+    if calendar is None:
+        calendar = union_calendar([values.index for values in series.values()])
+        index_names = {values.index.name for values in series.values()}
+        if len(index_names) == 1:
+            calendar = calendar.rename(index_names.pop())
+
+    keys = pd.DatetimeIndex(calendar).to_numpy()
+    panel = np.full((len(keys), len(series)), np.nan)
+    for j, values in enumerate(series.values()):
+        if not len(values) or not len(keys):
+            continue
+        dates = pd.DatetimeIndex(values.index).to_numpy()
+        rows = np.searchsorted(keys, dates).clip(max=max(len(keys) - 1, 0))
+        found = keys[rows] == dates
+        panel[rows[found], j] = np.asarray(values, dtype=float)[found]
+
+    return pd.DataFrame(panel, index=calendar, columns=list(series))
+
+
+def listing_mask(values):
+    """
+    True between each column's first and last observation (inclusive).
+
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Panel of shape (T, N) with NaN for missing observations
+
+    Returns:
+    --------
+    numpy.ndarray
+        Boolean mask of shape (T, N)
+    """
+    observed = ~np.isnan(values)
+    listed = np.logical_or.accumulate(observed, axis=0)
+    not_delisted = np.logical_or.accumulate(observed[::-1], axis=0)[::-1]
+    return listed & not_delisted
+
+
+def forward_fill(values, limit=None):
+    """
+    Forward-fill missing values down each column.
+
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Panel of shape (T, N) with NaN for missing observations
+    limit : int, optional
+        Largest number of consecutive rows filled after an observation
+        (no limit if None)
+
+    Returns:
+    --------
+    numpy.ndarray
+        Filled copy of ``values``; leading NaN stay missing
+    """
+    values = np.asarray(values, dtype=float)
+    rows = np.arange(values.shape[0])[:, None]
+    last = np.maximum.accumulate(np.where(np.isnan(values), -1, rows), axis=0)
+
+    keep = last >= 0
+    if limit is not None:
+        keep &= rows - last <= limit
+    filled = values[last.clip(min=0), np.arange(values.shape[1])]
+    return np.where(keep, filled, np.nan)
+
+
+def align_prices(prices, fill_limit=5):
+    """
+    Fill short gaps in a price panel on a union calendar.
+
+    Gaps of at most ``fill_limit`` rows inside an asset's listing period,
+    e.g. holidays of its exchange, are forward-filled. Dates before the
+    first or after the last observation of an asset stay missing, so
+    listings and delistings do not produce stale prices. Columns are
+    processed in blocks, so the temporaries stay small next to the panel.
+
+    Parameters:
+    -----------
+    prices : pandas.DataFrame or numpy.ndarray
+        Price panel (dates x assets) with NaN for missing prices
+    fill_limit : int, optional
+        Largest gap forward-filled (None fills every gap inside a listing
+        period, 0 fills none)
+
+    Returns:
+    --------
+    pandas.DataFrame or numpy.ndarray
+        Aligned prices, of the same type as ``prices``
+    """
+    values = np.asarray(prices, dtype=float)
+    if values.ndim == 1:
+        return align_prices(values[:, None], fill_limit)[:, 0]
+
+    aligned = np.empty_like(values)
+    block_columns = max(1, _BLOCK_SIZE // max(1, len(values)))
+    for start in range(0, values.shape[1], block_columns):
+        block = values[:, start:start + block_columns]
+        aligned[:, start:start + block_columns] = np.where(
+            listing_mask(block), forward_fill(block, fill_limit), np.nan)
+
+    if isinstance(prices, pd.DataFrame):
+        return pd.DataFrame(aligned, index=prices.index, columns=prices.columns, copy=False)
+    return aligned
+
+
+def pairwise_returns(prices, dtype=np.float64):
+    """
+    Simple returns wherever a price and the previous one are both available.
+
+    Returns are computed in float64 one block of rows at a time and written
+    into a panel of ``dtype``, so a float32 panel never needs a full-size
+    float64 temporary.
+
+    Parameters:
+    -----------
+    prices : pandas.DataFrame, pandas.Series or numpy.ndarray
+        Price panel (dates x assets), typically from ``align_prices``
+    dtype : numpy.dtype, optional
+        Storage dtype of the returns
+
+    Returns:
+    --------
+    pandas.DataFrame, pandas.Series or numpy.ndarray
+        Returns for every date but the first, NaN where either price is
+        missing. Statistics over them use, for every asset (or pair of
+        assets), all the dates where it is observed.
+    """
+    values = np.asarray(prices, dtype=float)
+    returns = np.empty((max(len(values) - 1, 0),) + values.shape[1:], dtype=dtype)
+    block_rows = max(1, _BLOCK_SIZE // max(1, int(np.prod(values.shape[1:]))))
+    for start in range(0, len(returns), block_rows):
+        stop = min(start + block_rows, len(returns))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # NaN prices give NaN returns
+            block = values[start + 1:stop + 1] / values[start:stop]
+        block -= 1
+        returns[start:stop] = block
+
+    if isinstance(prices, pd.DataFrame):
+        return pd.DataFrame(returns, index=prices.index[1:], columns=prices.columns, copy=False)
+    if isinstance(prices, pd.Series):
+        return pd.Series(returns, index=prices.index[1:], name=prices.name, copy=False)
+    return returns
@@ -0,0 +1,269 @@
+import numpy as np
+import pandas as pd
+
+
+class CovarianceAccumulator:
+    """
+    Streaming covariance estimator built from blocks of returns.
+
+    For every pair of assets (i, j) the accumulator keeps the number of
+    rows where both are observed, the pairwise means of i and j over those
+    rows and the centred cross-product. Blocks are folded in with the
+    parallel update of Chan et al., so partial accumulators computed on
+    different workers can be merged and give the same result as a single
+    pass over the full panel. Missing values are handled pairwise, which
+    matches ``pandas.DataFrame.cov``.
+    """
+
+    def __init__(self, columns=None):
+        """
+        Initialize the CovarianceAccumulator.
+
+        Parameters:
+        -----------
+        columns : list, optional
+            Asset names. If None, they are taken from the first DataFrame
+            passed to ``update``.
+        """
+        self.columns = list(columns) if columns is not None else None
+        self.count = None
+        self.mean = None
+        self.comoment = None
+
+    @property
+    def n_assets(self):
+        """Number of assets tracked, or None before the first update."""
+        return None if self.count is None else self.count.shape[0]
+
+    def _block_statistics(self, block):
+        """Sufficient statistics (count, pairwise mean, co-moment) of one block."""
+        values = np.asarray(block, dtype=float)
+        if values.ndim == 1:
+            values = values.reshape(1, -1)
+
+        mask = ~np.isnan(values)
+        observed = mask.astype(float)
+
+        # Shift each column by its block mean before forming cross-products so
+        # the co-moment does not suffer from cancellation on large levels
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shift = np.nansum(values, axis=0) / observed.sum(axis=0)
+        shift = np.where(np.isfinite(shift), shift, 0.0)
+        centred = np.where(mask, values - shift, 0.0)
+
+        count = observed.T @ observed
+        sums = centred.T @ observed  # sums[i, j] = sum of x_i over rows where j is observed too
+        cross = centred.T @ centred
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            local_mean = np.where(count > 0, sums / count, 0.0)
+        comoment = cross - count * local_mean * local_mean.T
+        mean = local_mean + shift[:, None]
+
+        return count, mean, comoment
+
+    def _combine(self, count, mean, comoment):
+        """Fold a set of sufficient statistics into the accumulator."""
+        if self.count is None:
+            self.count, self.mean, self.comoment = count, mean, comoment
+            return
+
+        if count.shape != self.count.shape:
+            raise ValueError("Cannot combine statistics for a different number of assets")
+
+        total = self.count + count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(total > 0, count / total, 0.0)
+        delta = mean - self.mean
+
+        self.comoment = (self.comoment + comoment +
+                         delta * delta.T * self.count * weight)
+        self.mean = self.mean + delta * weight
+        self.count = total
+
+    def update(self, block):
+        """
+        Add a block of returns to the accumulator.
+
+        Parameters:
+        -----------
+        block : pandas.DataFrame or numpy.ndarray
+            Rows are observations and columns are assets. NaN marks a
+            missing observation.
+
+        Returns:
+        --------
+        CovarianceAccumulator
+            The accumulator itself, to allow chaining
+        """
+        if self.columns is None and isinstance(block, pd.DataFrame):
+            self.columns = list(block.columns)
+
+        if len(block) == 0:
+            return self
+
+        self._combine(*self._block_statistics(block))
+        return self
+
+    def merge(self, other):
+        """
+        Merge a partial accumulator, e.g. one computed in another process.
+
+        Parameters:
+        -----------
+        other : CovarianceAccumulator
+            Accumulator over a disjoint set of observations
+
+        Returns:
+        --------
+        CovarianceAccumulator
+            The accumulator itself, to allow chaining
+        """
+        if other.count is None:
+            return self
+        if self.columns is None:
+            self.columns = other.columns
+        self._combine(other.count.copy(), other.mean.copy(), other.comoment.copy())
+        return self
+
+    def means(self):
+        """
+        Mean return of each asset over all of its observations.
+
+        Returns:
+        --------
+        pandas.Series or numpy.ndarray
+            Per-asset means (Series if asset names are known)
+        """
+        if self.count is None:
+            raise ValueError("No data has been accumulated")
+
+        with np.errstate(invalid='ignore'):
+            means = np.where(np.diag(self.count) > 0, np.diag(self.mean), np.nan)
+        if self.columns is not None:
+            return pd.Series(means, index=self.columns)
+        return means
+
+    def covariance(self, ddof=1, min_periods=None):
+        """
+        Covariance matrix of the accumulated returns.
+
+        Parameters:
+        -----------
+        ddof : int, optional
+            Delta degrees of freedom
+        min_periods : int, optional
+            Minimum number of paired observations required for a valid
+            entry (defaults to ddof + 1)
+
+        Returns:
+        --------
+        pandas.DataFrame or numpy.ndarray
+            Covariance matrix (DataFrame if asset names are known)
+        """
+        if self.count is None:
+            raise ValueError("No data has been accumulated")
+
+        min_periods = ddof + 1 if min_periods is None else max(min_periods, ddof + 1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = self.comoment / (self.count - ddof)
+        cov = np.where(self.count >= min_periods, cov, np.nan)
+
+        if self.columns is not None:
+            return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+        return cov
+
+
+def iter_blocks(returns, block_size):
+    """
+    Split a return panel into consecutive row blocks.
+
+    Parameters:
+    -----------
+    returns : pandas.DataFrame or numpy.ndarray
+        Return panel
+    block_size : int
+        Number of rows per block
+
+    Yields:
+    -------
+    pandas.DataFrame or numpy.ndarray
+        Consecutive blocks of at most ``block_size`` rows
+    """
+    if block_size <= 0:
+        raise ValueError("block_size must be positive")
+
+    for start in range(0, len(returns), block_size):
+        if isinstance(returns, pd.DataFrame):
+            yield returns.iloc[start:start + block_size]
+        else:
+            yield returns[start:start + block_size]
+
+
+def blocked_covariance(blocks, columns=None, ddof=1, min_periods=None):
+    """
+    Covariance matrix from an iterable of return blocks.
+
+    Only one block is held in memory at a time, so ``blocks`` may be a
+    generator reading from disk (e.g. ``pandas.read_csv(..., chunksize=...)``).
+
+    Parameters:
+    -----------
+    blocks : iterable
+        Iterable of DataFrames or arrays with the same columns
+    columns : list, optional
+        Asset names, if the blocks are plain arrays
+    ddof : int, optional
+        Delta degrees of freedom
+    min_periods : int, optional
+        Minimum number of paired observations per entry
+
+    Returns:
+    --------
+    pandas.DataFrame or numpy.ndarray
+        Covariance matrix
+    """
+    accumulator = CovarianceAccumulator(columns=columns)
+    for block in blocks:
+        accumulator.update(block)
+    return accumulator.covariance(ddof=ddof, min_periods=min_periods)
+
+
+def nearest_psd(cov_matrix, min_eigenvalue=0.0):
+    """
+    Positive semi-definite approximation of a covariance matrix.
+
+    Pairwise-complete covariances can be indefinite because each entry is
+    estimated over different dates. Negative eigenvalues are clipped to
+    ``min_eigenvalue`` and the result is rescaled to keep the original
+    variances, which keeps it positive semi-definite.
+
+    Parameters:
+    -----------
+    cov_matrix : pandas.DataFrame or numpy.ndarray
+        Symmetric covariance matrix without missing entries
+    min_eigenvalue : float, optional
+        Smallest eigenvalue kept before rescaling
+
+    Returns:
+    --------
+    pandas.DataFrame or numpy.ndarray
+        Repaired matrix, or ``cov_matrix`` itself if it already was
+        positive semi-definite
+    """
+    values = np.asarray(cov_matrix, dtype=np.float64)
+    values = (values + values.T) / 2
+    eigenvalues, eigenvectors = np.linalg.eigh(values)
+    # Tolerate rounding error so repaired matrices are not repaired again
+    if eigenvalues.min() >= min_eigenvalue - 1e-12 * np.abs(eigenvalues).max():
+        return cov_matrix
+
+    repaired = (eigenvectors * np.maximum(eigenvalues, min_eigenvalue)) @ eigenvectors.T
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scale = np.sqrt(np.diag(values) / np.diag(repaired))
+    scale = np.where(np.isfinite(scale), scale, 1.0)
+    repaired = repaired * np.outer(scale, scale)
+
+    if isinstance(cov_matrix, pd.DataFrame):
+        return pd.DataFrame(repaired, index=cov_matrix.index, columns=cov_matrix.columns)
+    return repaired
@@ -1,12 +1,20 @@
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from datetime import datetime, timedelta
 
+from .alignment import align_prices, pairwise_returns
+from .covariance import CovarianceAccumulator, iter_blocks, nearest_psd
+from ..utils.precision import storage_dtype
+from ..utils.profiling import profiled
+
+# Rows per block when float32 or gappy returns go through CovarianceAccumulator
+_ACCUMULATOR_BLOCK_ROWS = 4096
+
 class DataLoader:
     """Class for loading and processing financial data."""
     
-    def __init__(self, symbols, start_date=None, end_date=None):
+    def __init__(self, symbols, start_date=None, end_date=None, market_data=None, precision=None,
+                 missing='drop', fill_limit=5):
         """
         Initialize the DataLoader.
         
@@ -18,17 +26,45 @@ class DataLoader:
             Start date in YYYY-MM-DD format
         end_date : str, optional
             End date in YYYY-MM-DD format
+        market_data : MarketData, optional
+            Cached market-data service to load prices from. If None, prices
+            are downloaded directly from Yahoo Finance.
+        precision : str, optional
+            'float64' or 'float32' storage of the returns (``Config.PRECISION``
+            if None). Means and covariances are accumulated in float64 either way.
+        missing : str, optional
+            'drop' keeps only the dates where every symbol has a return;
+            'pairwise' aligns the prices (see ``align_prices``) and keeps
+            every return whose price and previous price are available, so
+            statistics use all the data of symbols with different
+            calendars, listing dates or gaps
+        fill_limit : int, optional
+            With missing='pairwise', largest gap (in rows) forward-filled
+            inside a symbol's listing period
         """
+        if missing not in ('drop', 'pairwise'):
+            raise ValueError("missing must be 'drop' or 'pairwise'")
         self.symbols = symbols
         self.start_date = start_date or (datetime.now() - timedelta(days=365*5)).strftime('%Y-%m-%d')
         self.end_date = end_date or datetime.now().strftime('%Y-%m-%d')
+        self.market_data = market_data
+        self.dtype = storage_dtype(precision)
+        self.missing = missing
+        self.fill_limit = fill_limit
         self.data = None
         
+    @profiled('data.load')
     def load_data(self):
-        """Load historical price data from Yahoo Finance."""
-        self.data = yf.download(self.symbols, start=self.start_date, end=self.end_date)['Adj Close']
+        """Load historical price data from the market-data service or Yahoo Finance."""
+        if self.market_data is not None:
+            self.data = self.market_data.get_price_data(self.symbols, self.start_date, self.end_date)
+        else:
+            import yfinance as yf
+            
+            self.data = yf.download(self.symbols, start=self.start_date, end=self.end_date)['Adj Close']
         return self.data
     
+    @profiled('data.returns')
     def calculate_returns(self, period='daily'):
         """
         Calculate returns from price data.
@@ -41,26 +77,35 @@ class DataLoader:
         Returns:
         --------
         pandas.DataFrame
-            DataFrame of returns
+            DataFrame of returns, stored with the loader's precision. With
+            missing='pairwise' it contains NaN where a return is unavailable.
         """
         if self.data is None:
             self.load_data()
             
         if period == 'daily':
-            returns = self.data.pct_change().dropna()
+            prices = self.data
         elif period == 'monthly':
-            returns = self.data.resample('M').last().pct_change().dropna()
+            prices = self.data.resample('ME').last()
         else:
             raise ValueError("Period must be 'daily' or 'monthly'")
-            
+        
+        # Returns are written straight into the storage dtype, so float32
+        # storage never builds a float64 return panel first
+        if self.missing == 'pairwise':
+            returns = pairwise_returns(align_prices(prices, self.fill_limit), self.dtype).dropna(how='all')
+        else:
+            returns = pairwise_returns(prices, self.dtype).dropna()
         return returns
     
     def get_annualized_returns(self):
         """Calculate annualized returns based on daily returns."""
         daily_returns = self.calculate_returns(period='daily')
-        return daily_returns.mean() * 252
+        means = np.nanmean(daily_returns.to_numpy(), axis=0, dtype=np.float64)
+        return pd.Series(means, index=daily_returns.columns) * 252
     
-    def get_covariance_matrix(self, period='daily'):
+    @profiled('data.covariance')
+    def get_covariance_matrix(self, period='daily', block_size=None, min_periods=None, repair=None):
         """
         Calculate the covariance matrix of returns.
         
@@ -68,15 +113,58 @@ class DataLoader:
         -----------
         period : str
             'daily' or 'monthly'
+        block_size : int, optional
+            If given, the covariance is accumulated over blocks of this many
+            rows with a CovarianceAccumulator instead of ``DataFrame.cov``.
+            float32 returns and returns with missing values (missing='pairwise')
+            always go through the accumulator, which works in float64 one
+            block at a time and handles missing values pairwise.
+        min_periods : int, optional
+            Minimum number of returns two symbols must share for their
+            covariance to be estimated (2 if None)
+        repair : bool, optional
+            Replace the matrix by its nearest positive semi-definite
+            approximation (see ``nearest_psd``) if it is indefinite, which
+            pairwise estimates can be. Defaults to True with
+            missing='pairwise' and False otherwise.
             
         Returns:
         --------
         pandas.DataFrame
             Covariance matrix
+        
+        Raises:
+        -------
+        ValueError
+            If some pair of symbols shares fewer than ``min_periods``
+            returns, e.g. one was delisted before the other was listed
         """
         returns = self.calculate_returns(period=period)
         
+        if block_size is None and (self.dtype != np.float64 or self.missing == 'pairwise'):
+            block_size = _ACCUMULATOR_BLOCK_ROWS
+        
+        if block_size is None:
+            cov = returns.cov(min_periods=min_periods)
+        else:
+            accumulator = CovarianceAccumulator(columns=returns.columns)
+            for block in iter_blocks(returns, block_size):
+                accumulator.update(block)
+            cov = accumulator.covariance(min_periods=min_periods)
+        
+        missing = np.argwhere(np.triu(cov.isna().to_numpy()))
+        if len(missing):
+            pairs = ', '.join(f'{cov.index[i]}/{cov.columns[j]}' for i, j in missing[:5])
+            raise ValueError(f"Not enough overlapping returns to estimate the covariance of "
+                             f"{len(missing)} pair(s) of symbols ({pairs}); shorten the date range "
+                             f"or remove symbols whose histories do not overlap")
+        
+        if repair is None:
+            repair = self.missing == 'pairwise'
+        if repair:
+            cov = nearest_psd(cov)
+        
         if period == 'daily':
-            return returns.cov() * 252
+            return cov * 252
         elif period == 'monthly':
-            return returns.cov() * 12
\ No newline at end of file
+            return cov * 12
\ No newline at end of file
@@ -1,12 +1,443 @@
+import os
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from .alignment import align_series
+from .synthetic import TRADING_DAYS, asset_parameters, factor_returns
+
+
+class MarketDataSource(ABC):
+    """Interface for a provider of historical prices."""
+
+    @abstractmethod
+    def fetch(self, tickers, start_date, end_date):
+        """
+        Fetch prices for several tickers.
+
+        Parameters:
+        -----------
+        tickers : list
+            Ticker symbols
+        start_date : pandas.Timestamp
+            First date (inclusive)
+        end_date : pandas.Timestamp
+            Last date (inclusive)
+
+        Returns:
+        --------
+        pandas.DataFrame
+            Prices indexed by date with one column per ticker
+        """
+
+
+class YFinanceSource(MarketDataSource):
+    """Adjusted close prices downloaded from Yahoo Finance."""
+
+    def __init__(self, field='Adj Close'):
+        """
+        Initialize the YFinanceSource.
+
+        Parameters:
+        -----------
+        field : str, optional
+            Price field to keep from the download
+        """
+        self.field = field
+
+    def fetch(self, tickers, start_date, end_date):
+        import yfinance as yf
+
+        # Yahoo treats the end date as exclusive
+        data = yf.download(list(tickers), start=start_date.strftime('%Y-%m-%d'),
+                           end=(end_date + pd.Timedelta(days=1)).strftime('%Y-%m-%d'),
+                           auto_adjust=False, progress=False)[self.field]
+        if isinstance(data, pd.Series):
+            data = data.to_frame(tickers[0])
+        return data
+
+
+class FileSource(MarketDataSource):
+    """
+    Prices read from CSV or Parquet files.
+
+    ``path`` is either a single file holding a wide panel (dates as the
+    first column, one column per ticker) or a directory holding one file per
+    ticker named ``<ticker>.csv`` or ``<ticker>.parquet``.
+    """
+
+    def __init__(self, path, column='Adj Close', date_column=None):
+        """
+        Initialize the FileSource.
+
+        Parameters:
+        -----------
+        path : str
+            File or directory to read from
+        column : str, optional
+            Price column in per-ticker files ('Close' is used if missing)
+        date_column : str, optional
+            Name of the date column (defaults to the first column)
+        """
+        self.path = path
+        self.column = column
+        self.date_column = date_column
+        self._panel = None
+
+    def _read(self, filename):
+        if filename.endswith('.parquet'):
+            frame = pd.read_parquet(filename)
+            if self.date_column is not None:
+                frame = frame.set_index(self.date_column)
+        else:
+            frame = pd.read_csv(filename, index_col=self.date_column or 0)
+        frame.index = pd.to_datetime(frame.index)
+        return frame.sort_index()
+
+    def _ticker_file(self, ticker):
+        for extension in ('.parquet', '.csv'):
+            filename = os.path.join(self.path, ticker + extension)
+            if os.path.exists(filename):
+                return filename
+        raise KeyError(f"No price file for {ticker} in {self.path}")
+
+    def fetch(self, tickers, start_date, end_date):
+        if os.path.isdir(self.path):
+            columns = {}
+            for ticker in tickers:
+                frame = self._read(self._ticker_file(ticker))
+                column = self.column if self.column in frame.columns else 'Close'
+                columns[ticker] = frame[column]
+            data = align_series(columns)
+        else:
+            if self._panel is None:
+                self._panel = self._read(self.path)
+            missing = [ticker for ticker in tickers if ticker not in self._panel.columns]
+            if missing:
+                raise KeyError(f"No prices for {missing} in {self.path}")
+            data = self._panel[list(tickers)]
+
+        return data.loc[start_date:end_date]
+
+
+class SyntheticSource(MarketDataSource):
+    """
+    Reproducible factor-model prices for testing without network access.
+
+    Common factor returns are drawn from ``seed`` and each ticker's loadings
+    and idiosyncratic noise from the ticker name, so the same ticker always
+    has the same history regardless of which other tickers are requested
+    with it, while tickers remain correlated through the factors.
+    """
+
+    def __init__(self, seed=0, n_factors=3, annual_return=0.08,
+                 idiosyncratic_volatility=0.2, origin='2000-01-03'):
+        """
+        Initialize the SyntheticSource.
+
+        Parameters:
+        -----------
+        seed : int, optional
+            Base random seed
+        n_factors : int, optional
+            Number of common factors
+        annual_return : float, optional
+            Average annualized drift across tickers
+        idiosyncratic_volatility : float, optional
+            Average annualized idiosyncratic volatility
+        origin : str, optional
+            Date at which every price path starts at 100
+        """
+        self.seed = seed
+        self.n_factors = n_factors
+        self.annual_return = annual_return
+        self.idiosyncratic_volatility = idiosyncratic_volatility
+        self.origin = pd.Timestamp(origin)
+
+    def fetch(self, tickers, start_date, end_date):
+        dates = pd.bdate_range(self.origin, end_date)
+        factors = factor_returns(len(dates), self.n_factors, np.random.default_rng(self.seed))
+
+        columns = {}
+        for ticker in tickers:
+            rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode())])
+            drift, loadings, idio = asset_parameters(1, self.n_factors, rng, self.annual_return,
+                                                     self.idiosyncratic_volatility)
+            returns = factors @ loadings[0] + rng.standard_normal(len(dates)) * idio[0]
+            returns += drift[0] / TRADING_DAYS
+            returns[0] = 0.0
+            columns[ticker] = 100 * np.cumprod(1 + returns)
+
+        return pd.DataFrame(columns, index=dates).loc[start_date:end_date]
+
+
 class MarketData:
-    def __init__(self):
-        self.price_data = None
-        self.returns_data = None
+    """
+    Cached access to historical prices from a pluggable source.
+
+    Prices are cached per ticker and date range in an in-memory LRU cache
+    bounded by size. A request is served from any cached range that covers
+    it; when a cached range only overlaps it, just the missing dates are
+    fetched and the cached entry is replaced by the union of both ranges.
+    Concurrent requests for data that is already being loaded wait for that
+    load instead of starting another one. The last prices retrieved (used by
+    ``get_returns``) are kept per thread, so one instance can be shared by
+    concurrent callers.
+    """
+
+    def __init__(self, source=None, max_cache_bytes=256 * 1024 ** 2):
+        """
+        Initialize the MarketData service.
+
+        Parameters:
+        -----------
+        source : MarketDataSource, optional
+            Where prices come from (Yahoo Finance if None)
+        max_cache_bytes : int, optional
+            Upper bound on the memory used by cached prices
+        """
+        self.source = source if source is not None else YFinanceSource()
+        self.max_cache_bytes = max_cache_bytes
+
+        self._cache = OrderedDict()  # (ticker, start, end) -> pandas.Series
+        self._ranges = {}  # ticker -> set of cached (start, end)
+        self._cache_bytes = 0
+        self._inflight = {}  # (ticker, start, end) -> Future
+        self._lock = threading.Lock()
+        self._local = threading.local()  # price_data / returns_data of each thread
+        self._stats = {'hits': 0, 'misses': 0, 'loads': 0, 'coalesced': 0, 'evictions': 0}
+
+    def _lookup(self, ticker, start, end):
+        """Find a cached series covering the range (caller holds the lock)."""
+        for cached_start, cached_end in self._ranges.get(ticker, ()):
+            if cached_start <= start and cached_end >= end:
+                key = (ticker, cached_start, cached_end)
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        return None
+
+    def _overlap(self, ticker, start, end):
+        """Cached range sharing the most dates with the range, or None (caller holds the lock)."""
+        best, best_days = None, None
+        for cached_start, cached_end in self._ranges.get(ticker, ()):
+            if cached_start <= end and cached_end >= start:
+                days = min(cached_end, end) - max(cached_start, start)
+                if best_days is None or days > best_days:
+                    best, best_days = (cached_start, cached_end), days
+        if best is None:
+            return None
+        key = (ticker,) + best
+        self._cache.move_to_end(key)
+        return best, self._cache[key]
+
+    def _pending(self, ticker, start, end):
+        """Find an in-flight load covering the range (caller holds the lock)."""
+        for (name, pending_start, pending_end), future in self._inflight.items():
+            if name == ticker and pending_start <= start and pending_end >= end:
+                return future
+        return None
+
+    def _discard(self, key):
+        """Remove a cache entry (caller holds the lock)."""
+        series = self._cache.pop(key)
+        self._cache_bytes -= int(series.memory_usage(deep=True))
+        ranges = self._ranges[key[0]]
+        ranges.discard(key[1:])
+        if not ranges:
+            del self._ranges[key[0]]
+
+    def _store(self, key, series):
+        """Insert a series and evict least recently used entries (caller holds the lock)."""
+        size = int(series.memory_usage(deep=True))
+        if size > self.max_cache_bytes:
+            return
+        if key in self._cache:
+            self._discard(key)
+        self._cache[key] = series
+        self._ranges.setdefault(key[0], set()).add(key[1:])
+        self._cache_bytes += size
+        while self._cache_bytes > self.max_cache_bytes:
+            self._discard(next(iter(self._cache)))
+            self._stats['evictions'] += 1
 
     def get_price_data(self, ticker, start_date, end_date):
-        # Implementation for retrieving price data for the given ticker
-        pass
+        """
+        Retrieve price data for one or several tickers.
+
+        Parameters:
+        -----------
+        ticker : str or list
+            Ticker symbol or list of symbols
+        start_date : str
+            Start date in YYYY-MM-DD format (inclusive)
+        end_date : str
+            End date in YYYY-MM-DD format (inclusive)
+
+        Returns:
+        --------
+        pandas.Series or pandas.DataFrame
+            Prices for a single ticker, or one column per ticker
+        """
+        single = isinstance(ticker, str)
+        tickers = [ticker] if single else list(ticker)
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+
+        found, waiting, to_load, partial = {}, {}, [], {}
+        with self._lock:
+            for name in tickers:
+                cached = self._lookup(name, start, end)
+                if cached is not None:
+                    self._stats['hits'] += 1
+                    found[name] = cached
+                    continue
+                self._stats['misses'] += 1
+                pending = self._pending(name, start, end)
+                if pending is not None:
+                    self._stats['coalesced'] += 1
+                    waiting[name] = pending
+                else:
+                    to_load.append(name)
+                    overlap = self._overlap(name, start, end)
+                    if overlap is not None:
+                        partial[name] = overlap
+
+            # Tickers missing the same dates are fetched together
+            fetches = {}
+            for name in to_load:
+                if name in partial:
+                    (cached_start, cached_end), _ = partial[name]
+                    gaps = []
+                    if start < cached_start:
+                        gaps.append((start, cached_start - pd.Timedelta(days=1)))
+                    if end > cached_end:
+                        gaps.append((cached_end + pd.Timedelta(days=1), end))
+                else:
+                    gaps = [(start, end)]
+                for gap in gaps:
+                    fetches.setdefault(gap, []).append(name)
+
+            own = {}
+            for name in to_load:
+                own[name] = Future()
+                self._inflight[(name, start, end)] = own[name]
+            self._stats['loads'] += len(fetches)
+
+        if to_load:
+            pieces = {name: [] for name in to_load}
+            try:
+                for (gap_start, gap_end), names in fetches.items():
+                    loaded = self.source.fetch(names, gap_start, gap_end)
+                    for name in names:
+                        if name in loaded.columns:
+                            pieces[name].append(loaded[name])
+            except BaseException as exc:
+                with self._lock:
+                    for name in to_load:
+                        del self._inflight[(name, start, end)]
+                for future in own.values():
+                    future.set_exception(exc)
+                raise
+
+            with self._lock:
+                for name in to_load:
+                    key_start, key_end = start, end
+                    if name in partial:
+                        (cached_start, cached_end), cached = partial[name]
+                        pieces[name].append(cached)
+                        key_start, key_end = min(start, cached_start), max(end, cached_end)
+                        # The union replaces every cached range it contains
+                        for cached_range in list(self._ranges.get(name, ())):
+                            if key_start <= cached_range[0] and cached_range[1] <= key_end:
+                                self._discard((name,) + cached_range)
+                    if pieces[name]:
+                        series = pd.concat(pieces[name]).sort_index()
+                        series = series[~series.index.duplicated()]
+                    else:
+                        series = pd.Series(dtype=float, index=pd.DatetimeIndex([]))
+                    series = series.rename(name)
+                    self._store((name, key_start, key_end), series)
+                    del self._inflight[(name, start, end)]
+                    found[name] = series
+            for name in to_load:
+                own[name].set_result(found[name])
+
+        for name, future in waiting.items():
+            found[name] = future.result()
+
+        prices = align_series({name: found[name].loc[start:end] for name in tickers})
+        self._local.price_data = prices
+        self._local.returns_data = None
+        return prices[tickers[0]] if single else prices
+
+    @property
+    def price_data(self):
+        """Prices last retrieved by the calling thread (None if none yet)."""
+        return getattr(self._local, 'price_data', None)
+
+    @property
+    def returns_data(self):
+        """Returns last calculated by the calling thread (None if none yet)."""
+        return getattr(self._local, 'returns_data', None)
+
+    def get_returns(self, period='daily', prices=None):
+        """
+        Calculate returns from price data.
+
+        Parameters:
+        -----------
+        period : str
+            'daily' or 'monthly'
+        prices : pandas.Series or pandas.DataFrame, optional
+            Prices to use (the prices most recently retrieved by the calling
+            thread if None)
+
+        Returns:
+        --------
+        pandas.DataFrame
+            DataFrame of returns
+        """
+        if prices is None:
+            prices = self.price_data
+            if prices is None:
+                raise ValueError("No price data has been retrieved")
+
+        self._local.returns_data = self._returns(prices, period)
+        return self._local.returns_data
+
+    @staticmethod
+    def _returns(prices, period):
+        """Simple returns of a price panel at the given frequency."""
+        if period == 'daily':
+            return prices.pct_change().dropna()
+        elif period == 'monthly':
+            return prices.resample('ME').last().pct_change().dropna()
+        else:
+            raise ValueError("Period must be 'daily' or 'monthly'")
+
+    def cache_info(self):
+        """
+        Cache statistics.
+
+        Returns:
+        --------
+        dict
+            Hit, miss, load, coalesced-request and eviction counts, plus the
+            number of entries and bytes currently cached
+        """
+        with self._lock:
+            info = dict(self._stats)
+            info['entries'] = len(self._cache)
+            info['bytes'] = self._cache_bytes
+        return info
 
-    def get_returns(self):
-        # Implementation for calculating returns from the price data
-        pass
\ No newline at end of file
+    def clear_cache(self):
+        """Drop every cached price series."""
+        with self._lock:
+            self._cache.clear()
+            self._ranges.clear()
+            self._cache_bytes = 0
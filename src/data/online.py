@@ -0,0 +1,170 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from scipy.linalg.blas import dger
+
+EstimatorSnapshot = namedtuple('EstimatorSnapshot', ['expected_returns', 'cov_matrix', 'nobs'])
+EstimatorSnapshot.__doc__ = """
+Point-in-time estimates from an OnlineEstimator.
+
+``expected_returns`` and ``cov_matrix`` can be passed straight to
+``MarkowitzOptimizer(expected_returns, cov_matrix)`` or used as the
+``cov_matrix`` of a ``BlackLittermanModel``.
+"""
+
+
+class OnlineEstimator:
+    """
+    Streaming estimator of the mean and covariance of returns.
+
+    Each call to ``update`` costs O(N^2) for N assets and no history is
+    kept. Without a decay the estimates are the exact sample mean and
+    covariance (Welford's algorithm); with a decay they are exponentially
+    weighted moving averages, equal to ``DataFrame.ewm(alpha=...,
+    adjust=False)`` with ``cov(bias=True)``.
+    """
+
+    def __init__(self, n_assets=None, columns=None, halflife=None, alpha=None,
+                 annualization=1):
+        """
+        Initialize the OnlineEstimator.
+
+        Parameters:
+        -----------
+        n_assets : int, optional
+            Number of assets (inferred from ``columns`` if omitted)
+        columns : list, optional
+            Asset names used to label snapshots
+        halflife : float, optional
+            Half-life of the exponential weights, in bars
+        alpha : float, optional
+            Smoothing factor in (0, 1]; alternative to ``halflife``
+        annualization : float, optional
+            Factor applied to snapshot means and covariances
+            (e.g. 252 for daily bars)
+        """
+        if columns is not None:
+            columns = list(columns)
+            n_assets = len(columns) if n_assets is None else n_assets
+        if n_assets is None:
+            raise ValueError("Either n_assets or columns must be given")
+        if columns is not None and len(columns) != n_assets:
+            raise ValueError("columns must have n_assets entries")
+        if halflife is not None and alpha is not None:
+            raise ValueError("Specify only one of halflife and alpha")
+
+        if halflife is not None:
+            if halflife <= 0:
+                raise ValueError("halflife must be positive")
+            alpha = 1 - np.exp(np.log(0.5) / halflife)
+        if alpha is not None and not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+
+        self.n_assets = n_assets
+        self.columns = columns
+        self.alpha = alpha
+        self.annualization = annualization
+        self.nobs = 0
+
+        self._mean = np.zeros(n_assets)
+        self._delta = np.empty(n_assets)
+        # The co-moment is stored as _scale * _comoment so the exponential
+        # decay does not need a pass over the matrix on every bar. It is kept
+        # in Fortran order so BLAS can apply rank-one updates in place.
+        self._comoment = np.zeros((n_assets, n_assets), order='F')
+        self._scale = 1.0
+
+    def update(self, bar):
+        """
+        Incorporate one bar of returns.
+
+        Parameters:
+        -----------
+        bar : array-like
+            Returns of every asset for one period
+
+        Returns:
+        --------
+        OnlineEstimator
+            The estimator itself, to allow chaining
+        """
+        x = np.asarray(bar, dtype=float)
+        if x.shape != (self.n_assets,):
+            raise ValueError(f"Expected a bar of {self.n_assets} returns, got shape {x.shape}")
+
+        self.nobs += 1
+        delta = np.subtract(x, self._mean, out=self._delta)
+
+        if self.alpha is None or self.nobs == 1:
+            # Welford: C += (x - mean_old)(x - mean_new)^T
+            self._mean += delta / self.nobs
+            self._rank_one_update(1.0, delta, x - self._mean)
+        else:
+            # Exponentially weighted: S = (1 - a)(S + a * delta delta^T)
+            a = self.alpha
+            self._mean += a * delta
+            self._rank_one_update(a, delta, delta)
+            self._scale *= 1 - a
+            if self._scale < 1e-100:
+                self._comoment *= self._scale
+                self._scale = 1.0
+
+        return self
+
+    def _rank_one_update(self, alpha, x, y):
+        """Add alpha * x y^T to the (scaled) co-moment in place."""
+        self._comoment = dger(alpha / self._scale, x, y, a=self._comoment, overwrite_a=1)
+
+    def update_many(self, bars):
+        """
+        Incorporate several bars in order.
+
+        Parameters:
+        -----------
+        bars : pandas.DataFrame or numpy.ndarray
+            One row per bar
+
+        Returns:
+        --------
+        OnlineEstimator
+            The estimator itself, to allow chaining
+        """
+        for bar in np.asarray(bars, dtype=float):
+            self.update(bar)
+        return self
+
+    @property
+    def mean(self):
+        """Current (per-bar) mean estimate."""
+        return self._mean.copy()
+
+    @property
+    def covariance(self):
+        """Current (per-bar) covariance estimate."""
+        if self.alpha is None:
+            if self.nobs < 2:
+                return np.full((self.n_assets, self.n_assets), np.nan)
+            return self._comoment / (self.nobs - 1)
+        if self.nobs < 1:
+            return np.full((self.n_assets, self.n_assets), np.nan)
+        return self._comoment * self._scale
+
+    def snapshot(self):
+        """
+        Take a snapshot of the current estimates.
+
+        Returns:
+        --------
+        EstimatorSnapshot
+            Annualized expected returns and covariance matrix, labelled with
+            the asset names when they are known
+        """
+        expected_returns = self.mean * self.annualization
+        cov_matrix = self.covariance * self.annualization
+
+        if self.columns is not None:
+            expected_returns = pd.Series(expected_returns, index=self.columns)
+            cov_matrix = pd.DataFrame(cov_matrix, index=self.columns, columns=self.columns)
+
+        return EstimatorSnapshot(expected_returns, cov_matrix, self.nobs)
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def factor_returns(n_days, n_factors, rng, factor_volatility=0.15):
+    """
+    Daily returns of the common factors.
+
+    Parameters:
+    -----------
+    n_days : int
+        Number of days
+    n_factors : int
+        Number of factors
+    rng : numpy.random.Generator
+        Random generator to draw from
+    factor_volatility : float, optional
+        Annualized volatility of the first (market) factor; the others
+        have half of it
+
+    Returns:
+    --------
+    numpy.ndarray
+        Factor returns of shape (n_days, n_factors)
+    """
+    vols = np.full(n_factors, factor_volatility * 0.5)
+    vols[0] = factor_volatility
+    return rng.standard_normal((n_days, n_factors)) * vols / np.sqrt(TRADING_DAYS)
+
+
+def asset_parameters(n_assets, n_factors, rng, annual_return, idiosyncratic_volatility):
+    """
+    Random factor-model parameters of each asset.
+
+    Parameters:
+    -----------
+    n_assets : int
+        Number of assets
+    n_factors : int
+        Number of factors
+    rng : numpy.random.Generator
+        Random generator to draw from
+    annual_return : float
+        Average annualized drift across assets
+    idiosyncratic_volatility : float
+        Average annualized idiosyncratic volatility
+
+    Returns:
+    --------
+    tuple
+        Annual drift (n_assets,), factor loadings (n_assets, n_factors) with
+        market loadings around 1, and idiosyncratic daily volatility (n_assets,)
+    """
+    loadings = rng.normal(0.0, 0.5, size=(n_assets, n_factors))
+    loadings[:, 0] = rng.normal(1.0, 0.3, size=n_assets)
+    drift = annual_return + rng.normal(0.0, 0.04, size=n_assets)
+    idio = idiosyncratic_volatility * rng.uniform(0.5, 1.5, size=n_assets) / np.sqrt(TRADING_DAYS)
+    return drift, loadings, idio
+
+
+def generate_returns(n_assets, n_days, n_factors=3, seed=0, annual_return=0.08,
+                     idiosyncratic_volatility=0.2, start_date='2015-01-02', columns=None):
+    """
+    Generate daily returns with a linear factor structure.
+
+    Returns follow r_t = mu + B f_t + e_t, where f_t are independent normal
+    factor returns (the first one a market factor with loadings around 1)
+    and e_t is independent idiosyncratic noise.
+
+    Parameters:
+    -----------
+    n_assets : int
+        Number of assets
+    n_days : int
+        Number of business days
+    n_factors : int, optional
+        Number of common factors
+    seed : int, optional
+        Random seed; the same seed always gives the same panel
+    annual_return : float, optional
+        Average annualized drift across assets
+    idiosyncratic_volatility : float, optional
+        Average annualized idiosyncratic volatility
+    start_date : str, optional
+        First date of the business-day index
+    columns : list, optional
+        Asset names (defaults to ASSET0000, ASSET0001, ...)
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Daily returns, one column per asset
+    """
+    rng = np.random.default_rng(seed)
+    factors = factor_returns(n_days, n_factors, rng)
+    drift, loadings, idio = asset_parameters(n_assets, n_factors, rng, annual_return,
+                                             idiosyncratic_volatility)
+
+    returns = factors @ loadings.T
+    returns += rng.standard_normal((n_days, n_assets)) * idio
+    returns += drift / TRADING_DAYS
+
+    if columns is None:
+        columns = [f'ASSET{i:04d}' for i in range(n_assets)]
+    index = pd.bdate_range(start_date, periods=n_days)
+    return pd.DataFrame(returns, index=index, columns=columns)
+
+
+def generate_prices(n_assets, n_days, initial_price=100.0, **kwargs):
+    """
+    Generate a price panel from factor-structured returns.
+
+    Parameters:
+    -----------
+    n_assets : int
+        Number of assets
+    n_days : int
+        Number of business days
+    initial_price : float, optional
+        Price of every asset on the first day
+    **kwargs
+        Passed on to ``generate_returns``
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Daily prices, one column per asset
+    """
+    returns = generate_returns(n_assets, n_days, **kwargs)
+    returns.iloc[0] = 0.0
+    return initial_price * (1 + returns).cumprod()
+
+
+def generate_market_caps(n_assets, seed=0):
+    """
+    Generate log-normally distributed market capitalizations.
+
+    Parameters:
+    -----------
+    n_assets : int
+        Number of assets
+    seed : int, optional
+        Random seed
+
+    Returns:
+    --------
+    numpy.ndarray
+        Market capitalizations in billions
+    """
+    rng = np.random.default_rng([seed, n_assets])
+    return np.exp(rng.normal(3.0, 1.0, size=n_assets))
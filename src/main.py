@@ -1,18 +1,37 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from data.data_loader import DataLoader
-from optimization.markowitz import MarkowitzOptimizer
-from optimization.black_litterman import BlackLittermanModel
-from visualization.efficient_frontier import plot_efficient_frontier
-from visualization.performance_charts import plot_performance_charts
+import argparse
+import sys
+import os
 
-def main():
-    # Define a sample portfolio of stocks
-    symbols = ['AAPL', 'MSFT', 'AMZN', 'GOOGL', 'BRK-B', 'JPM', 'JNJ', 'V', 'PG', 'UNH']
+# Import through the src package so that intra-package imports resolve
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+# Sample portfolio of stocks
+DEFAULT_SYMBOLS = ['AAPL', 'MSFT', 'AMZN', 'GOOGL', 'BRK-B', 'JPM', 'JNJ', 'V', 'PG', 'UNH']
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Optimize a sample portfolio and plot its efficient frontier.')
+    parser.add_argument('--symbols', nargs='+', default=DEFAULT_SYMBOLS,
+                        help='Ticker symbols of the portfolio')
+    parser.add_argument('--start-date', default='2018-01-01',
+                        help='First date of the price history (YYYY-MM-DD)')
+    parser.add_argument('--points', type=int, default=50,
+                        help='Number of points on the efficient frontier')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    # Import the optimizers (and with them pandas and scipy) only once there is work to do
+    from src.data.data_loader import DataLoader
+    from src.optimization.markowitz import MarkowitzOptimizer
+    from src.utils.config import get_config
+    from src.utils.profiling import get_profiler
+    
+    profiler = get_profiler()
     
     # Load data
-    data_loader = DataLoader(symbols=symbols, start_date='2018-01-01')
+    data_loader = DataLoader(symbols=args.symbols, start_date=args.start_date)
     data_loader.load_data()
     
     # Calculate expected returns and covariance matrix
@@ -32,9 +51,18 @@ def main():
     print(min_vol_portfolio['weights'])
     
     # Calculate the efficient frontier
-    efficient_frontier = optimizer.efficient_frontier(points=50)
+    efficient_frontier = optimizer.efficient_frontier(points=args.points)
     
     # Plot the efficient frontier
+    with profiler.stage('visualization.main'):
+        plot_main_frontier(efficient_frontier, min_vol_portfolio)
+    
+    if profiler.enabled:
+        profiler.export_json(get_config().PROFILING_REPORT)
+
+def plot_main_frontier(efficient_frontier, min_vol_portfolio):
+    import matplotlib.pyplot as plt
+    
     plt.figure(figsize=(10, 6))
     plt.scatter(efficient_frontier['Volatility'], efficient_frontier['Return'], 
                 c=efficient_frontier['Sharpe'], cmap='viridis')
@@ -0,0 +1,212 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ..utils.profiling import profiled
+
+# Tolerance used to decide whether a closed-form solution respects the bounds
+_BOUND_TOLERANCE = 1e-10
+
+
+def _solve_accounts(mu, cov, risk_aversion, lower, upper, holdings, penalty, x0):
+    """
+    Solve a chunk of bound-constrained accounts with SLSQP (worker process).
+
+    Every account maximizes w'mu - lambda/2 w'Sigma w - kappa/2 |w - h|^2
+    subject to sum(w) = 1 and lower <= w <= upper.
+    """
+    from scipy.optimize import minimize
+
+    n_accounts, n_assets = x0.shape
+    weights = np.empty_like(x0)
+    success = np.empty(n_accounts, dtype=bool)
+    iterations = np.empty(n_accounts, dtype=int)
+    budget = {'type': 'eq', 'fun': lambda w: np.sum(w) - 1, 'jac': lambda w: np.ones(n_assets)}
+
+    for k in range(n_accounts):
+        lam, kappa, h = risk_aversion[k], penalty[k], holdings[k]
+
+        def objective(w):
+            cov_w = cov @ w
+            diff = w - h
+            value = -mu @ w + 0.5 * lam * w @ cov_w + 0.5 * kappa * diff @ diff
+            grad = -mu + lam * cov_w + kappa * diff
+            return value, grad
+
+        result = minimize(objective, x0[k], jac=True, method='SLSQP',
+                          bounds=list(zip(lower[k], upper[k])), constraints=[budget])
+        weights[k] = result['x']
+        success[k] = result['success']
+        iterations[k] = result['nit']
+
+    return weights, success, iterations
+
+
+class BatchOptimizer:
+    """
+    Mean-variance optimization of many accounts sharing one universe.
+
+    All accounts use the same expected returns and covariance matrix but
+    may differ in risk aversion, weight bounds, current holdings and the
+    penalty on deviating from those holdings. The covariance matrix is
+    eigendecomposed once; accounts whose unconstrained optimum respects
+    their bounds are solved in closed form all at once, and only the
+    remaining ones are handed to SLSQP, in chunks over a process pool.
+    Black-Litterman accounts can be batched by passing the posterior
+    returns of ``BlackLittermanModel.incorporate_views`` as
+    ``expected_returns``.
+    """
+
+    def __init__(self, expected_returns, cov_matrix):
+        """
+        Initialize the BatchOptimizer.
+
+        Parameters:
+        -----------
+        expected_returns : pandas.Series or numpy.ndarray
+            Expected returns for each asset
+        cov_matrix : pandas.DataFrame or numpy.ndarray
+            Covariance matrix of returns
+        """
+        self.expected_returns = np.asarray(expected_returns, dtype=float)
+        self.cov_matrix = np.asarray(cov_matrix, dtype=float)
+        self.asset_names = expected_returns.index if isinstance(expected_returns, pd.Series) else None
+
+        eigenvalues, self._eigenvectors = np.linalg.eigh(self.cov_matrix)
+        self._eigenvalues = np.clip(eigenvalues, 0.0, None)
+
+    @property
+    def n_assets(self):
+        return len(self.expected_returns)
+
+    def _broadcast(self, value, n_accounts, name):
+        """Expand a scalar, per-asset or per-account-per-asset value to (K, N)."""
+        value = np.asarray(value, dtype=float)
+        if value.ndim == 0 or value.shape == (self.n_assets,):
+            return np.broadcast_to(value, (n_accounts, self.n_assets)).copy()
+        if value.shape == (n_accounts, self.n_assets):
+            return value.copy()
+        raise ValueError(f"{name} must be a scalar, have shape (n_assets,) or (n_accounts, n_assets)")
+
+    def _closed_form(self, risk_aversion, holdings, penalty):
+        """
+        Budget-constrained optimum of every account, ignoring the bounds.
+
+        With A = lambda Sigma + kappa I and b = mu + kappa h, the solution is
+        w = A^-1 (b - gamma 1) with gamma chosen so that sum(w) = 1. A shares
+        the eigenvectors of Sigma, so A^-1 is applied to all accounts at once.
+        """
+        V = self._eigenvectors
+        scale = risk_aversion[:, None] * self._eigenvalues[None, :] + penalty[:, None]
+        with np.errstate(divide='ignore'):
+            inv_scale = np.where(scale > 0, 1.0 / scale, 0.0)
+
+        b = self.expected_returns[None, :] + penalty[:, None] * holdings
+        a_inv_b = ((b @ V) * inv_scale) @ V.T
+        a_inv_1 = (V.sum(axis=0)[None, :] * inv_scale) @ V.T
+
+        gamma = (a_inv_b.sum(axis=1) - 1) / a_inv_1.sum(axis=1)
+        return a_inv_b - gamma[:, None] * a_inv_1
+
+    @profiled('batch.solve')
+    def solve(self, risk_aversion, lower=0.0, upper=1.0, holdings=None, turnover_penalty=0.0,
+              account_ids=None, n_jobs=None, chunk_size=64):
+        """
+        Optimize a batch of accounts.
+
+        Parameters:
+        -----------
+        risk_aversion : array-like
+            Risk aversion of each account; its length sets the number of accounts
+        lower : float or array-like, optional
+            Lower weight bounds: scalar, per asset (N,) or per account (K, N)
+        upper : float or array-like, optional
+            Upper weight bounds, same shapes as ``lower``
+        holdings : array-like, optional
+            Current weights of each account, shape (K, N) or (N,), used as
+            the anchor of ``turnover_penalty``. Bound-constrained accounts
+            start SLSQP from the closed-form solution clipped into the bounds.
+        turnover_penalty : float or array-like, optional
+            Quadratic penalty kappa/2 |w - holdings|^2 (scalar or per account)
+        account_ids : list, optional
+            Labels of the accounts
+        n_jobs : int, optional
+            Worker processes for the bound-constrained accounts (defaults to
+            the number of CPUs; 1 solves them in-process)
+        chunk_size : int, optional
+            Number of accounts per worker task
+
+        Returns:
+        --------
+        dict
+            'weights': DataFrame of weights (accounts x assets);
+            'diagnostics': DataFrame with the solution method, success flag,
+            iterations, expected return, volatility, utility (the objective,
+            turnover penalty included) and turnover (NaN without ``holdings``)
+            of each account
+        """
+        risk_aversion = np.atleast_1d(np.asarray(risk_aversion, dtype=float))
+        n_accounts = len(risk_aversion)
+        lower = self._broadcast(lower, n_accounts, 'lower')
+        upper = self._broadcast(upper, n_accounts, 'upper')
+        has_holdings = holdings is not None
+        holdings = self._broadcast(holdings if has_holdings else 0.0, n_accounts, 'holdings')
+        penalty = np.broadcast_to(np.asarray(turnover_penalty, dtype=float), (n_accounts,)).copy()
+
+        if ((risk_aversion <= 0) & (penalty <= 0)).any():
+            raise ValueError("Each account needs a positive risk aversion or turnover penalty")
+        if (lower.sum(axis=1) > 1).any() or (upper.sum(axis=1) < 1).any():
+            raise ValueError("Bounds of some accounts do not admit fully invested weights")
+
+        weights = self._closed_form(risk_aversion, holdings, penalty)
+        method = np.full(n_accounts, 'closed_form', dtype=object)
+        success = np.ones(n_accounts, dtype=bool)
+        iterations = np.zeros(n_accounts, dtype=int)
+
+        bounded = ((weights < lower - _BOUND_TOLERANCE) | (weights > upper + _BOUND_TOLERANCE)).any(axis=1)
+        todo = np.flatnonzero(bounded)
+        if len(todo):
+            # Warm start from the closed form projected into the bounds
+            x0 = np.clip(weights[todo], lower[todo], upper[todo])
+            x0 /= x0.sum(axis=1, keepdims=True)
+            x0 = np.nan_to_num(x0, nan=1.0 / self.n_assets)
+
+            starts = range(0, len(todo), chunk_size)
+            chunks = [todo[i:i + chunk_size] for i in starts]
+            args = [(self.expected_returns, self.cov_matrix, risk_aversion[idx], lower[idx],
+                     upper[idx], holdings[idx], penalty[idx], x0[i:i + chunk_size])
+                    for i, idx in zip(starts, chunks)]
+
+            n_jobs = n_jobs or os.cpu_count() or 1
+            if n_jobs == 1 or len(chunks) == 1:
+                results = [_solve_accounts(*a) for a in args]
+            else:
+                with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                    results = list(pool.map(_solve_accounts, *zip(*args)))
+
+            for idx, (chunk_weights, chunk_success, chunk_iterations) in zip(chunks, results):
+                weights[idx] = chunk_weights
+                success[idx] = chunk_success
+                iterations[idx] = chunk_iterations
+            method[todo] = 'slsqp'
+
+        port_returns = weights @ self.expected_returns
+        variances = np.einsum('ki,ij,kj->k', weights, self.cov_matrix, weights)
+        deviations = weights - holdings
+        diagnostics = pd.DataFrame({
+            'method': method,
+            'success': success,
+            'iterations': iterations,
+            'expected_return': port_returns,
+            'volatility': np.sqrt(variances),
+            'utility': (port_returns - 0.5 * risk_aversion * variances
+                        - 0.5 * penalty * np.einsum('ki,ki->k', deviations, deviations)),
+            'turnover': np.abs(deviations).sum(axis=1) if has_holdings else np.nan,
+        }, index=account_ids)
+
+        return {
+            'weights': pd.DataFrame(weights, index=account_ids, columns=self.asset_names),
+            'diagnostics': diagnostics
+        }
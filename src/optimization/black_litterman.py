@@ -1,12 +1,16 @@
 import numpy as np
 import pandas as pd
-from scipy.optimize import minimize
+
+from .cache import hash_problem, problem_features
+from .rebalancing import RebalancingOptimizer
+from ..utils.precision import as_float64
+from ..utils.profiling import get_profiler, profiled
 
 class BlackLittermanModel:
     """Implementation of the Black-Litterman asset allocation model."""
     
     def __init__(self, market_caps, risk_aversion, cov_matrix, 
-                 equil_returns=None, tau=0.025):
+                 equil_returns=None, tau=0.025, cache=None):
         """
         Initialize the Black-Litterman model.
         
@@ -22,11 +26,15 @@ class BlackLittermanModel:
             Equilibrium returns (if None, will be calculated)
         tau : float, optional
             Scaling factor for estimation uncertainty
+        cache : SolutionCache, optional
+            Cache of previous solutions, shared between models
         """
+        self.cache = cache
         self.market_caps = np.array(market_caps, dtype=float)
         self.weights_market = self.market_caps / np.sum(self.market_caps)
         self.risk_aversion = risk_aversion
-        self.cov_matrix = cov_matrix
+        # The linear solves work in float64 even if the inputs were stored in float32
+        self.cov_matrix = as_float64(cov_matrix)
         self.tau = tau
         
         if equil_returns is None:
@@ -38,7 +46,55 @@ class BlackLittermanModel:
         """Calculate implied equilibrium returns using market weights."""
         return self.risk_aversion * self.cov_matrix.dot(self.weights_market)
     
-    def incorporate_views(self, P, Q, omega=None):
+    def _view_covariances(self, P):
+        """
+        tau Sigma P' (N x K) and P tau Sigma P' (K x K) for a pick matrix.
+
+        These are the only products with the full covariance matrix needed
+        by the posterior and the view calibration.
+        """
+        scaled_picks = self.tau * np.asarray(self.cov_matrix, dtype=float) @ P.T
+        return scaled_picks, P @ scaled_picks
+    
+    @staticmethod
+    def _idzorek_variances(view_variances, confidences):
+        """Diagonal of omega for confidences in (0, 1], given s_k = p_k tau Sigma p_k'."""
+        confidences = np.broadcast_to(np.asarray(confidences, dtype=float), view_variances.shape)
+        if ((confidences <= 0) | (confidences > 1)).any():
+            raise ValueError("confidences must be in (0, 1]")
+        return view_variances * (1 - confidences) / confidences
+    
+    def idzorek_omega(self, P, confidences):
+        """
+        View uncertainty matrix implied by a confidence level for each view.
+        
+        Following Idzorek, omega_k is chosen so that view k on its own tilts
+        the unconstrained optimal weights away from the market portfolio by
+        the fraction c_k of the tilt the same view would cause at 100%
+        confidence. For a single view that tilt is proportional to
+        s_k / (s_k + omega_k) with s_k = p_k tau Sigma p_k', so each
+        calibration has the exact solution omega_k = s_k (1 - c_k) / c_k
+        and all views are calibrated at once from diag(P tau Sigma P').
+        
+        Parameters:
+        -----------
+        P : ndarray
+            Pick matrix for the views (each row corresponds to a view)
+        confidences : float or array-like
+            Confidence in each view, between 0 (excluded) and 1 (the view
+            holds exactly), e.g. 0.6 for 60%
+            
+        Returns:
+        --------
+        ndarray
+            Diagonal uncertainty matrix of the views
+        """
+        P = np.atleast_2d(np.asarray(P, dtype=float))
+        _, view_cov = self._view_covariances(P)
+        return np.diag(self._idzorek_variances(np.diag(view_cov), confidences))
+    
+    @profiled('black_litterman.incorporate_views')
+    def incorporate_views(self, P, Q, omega=None, confidences=None):
         """
         Incorporate investor views into the model.
         
@@ -49,33 +105,41 @@ class BlackLittermanModel:
         Q : ndarray
             Expected returns for each view
         omega : ndarray, optional
-            Uncertainty matrix for each view. If None, it will be calculated.
+            Uncertainty matrix for each view. If None, it is derived from
+            ``confidences`` or, without those, as tau * diag(P Sigma P').
+        confidences : float or array-like, optional
+            Confidence in each view in (0, 1], converted to omega with
+            ``idzorek_omega``
             
         Returns:
         --------
         ndarray
             Posterior expected returns
         """
-        # Number of assets and views
-        n_assets = len(self.equil_returns)
-        n_views = len(Q)
-        
-        # If omega not provided, calculate it using the method in the paper
-        if omega is None:
-            omega = np.diag(np.dot(np.dot(P, self.cov_matrix), P.T)) * self.tau
-            omega = np.diag(np.diag(omega))  # Just to ensure it's diagonal
+        if omega is not None and confidences is not None:
+            raise ValueError("Pass either omega or confidences, not both")
         
-        # Calculate posterior mean
-        term1 = np.linalg.inv(np.linalg.inv(self.tau * self.cov_matrix) + 
-                             np.dot(P.T, np.dot(np.linalg.inv(omega), P)))
-        term2 = (np.dot(np.linalg.inv(self.tau * self.cov_matrix), self.equil_returns) + 
-                np.dot(P.T, np.dot(np.linalg.inv(omega), Q)))
+        P = np.atleast_2d(np.asarray(P, dtype=float))
+        Q = np.asarray(Q, dtype=float)
+        prior = np.asarray(self.equil_returns, dtype=float)
+        scaled_picks, view_cov = self._view_covariances(P)
         
-        posterior_returns = np.dot(term1, term2)
+        if confidences is not None:
+            omega = np.diag(self._idzorek_variances(np.diag(view_cov), confidences))
+        elif omega is None:
+            # Diagonal matrix of the view variances, as in the paper
+            omega = np.diag(np.diag(view_cov))
+        else:
+            omega = np.asarray(omega, dtype=float)
+            if omega.ndim == 1:
+                omega = np.diag(omega)
         
-        return posterior_returns
+        # Posterior mean pi + tau Sigma P' (P tau Sigma P' + Omega)^-1 (Q - P pi):
+        # only a K x K system is solved, and omega may be singular (certain views)
+        return prior + scaled_picks @ np.linalg.solve(view_cov + omega, Q - P @ prior)
     
-    def optimize_portfolio(self, expected_returns, cov_matrix=None):
+    @profiled('black_litterman.optimize_portfolio')
+    def optimize_portfolio(self, expected_returns, cov_matrix=None, initial_weights=None):
         """
         Find the optimal portfolio weights given expected returns.
         
@@ -85,12 +149,16 @@ class BlackLittermanModel:
             Expected returns for each asset
         cov_matrix : ndarray, optional
             Covariance matrix (if None, use the one provided at initialization)
+        initial_weights : ndarray, optional
+            Starting point of the solver (equal weights if None)
             
         Returns:
         --------
         ndarray
             Optimal portfolio weights
         """
+        from scipy.optimize import minimize
+        
         if cov_matrix is None:
             cov_matrix = self.cov_matrix
         
@@ -104,14 +172,19 @@ class BlackLittermanModel:
         
         constraints = ({'type': 'eq', 'fun': lambda x: np.sum(x) - 1})
         bounds = tuple((0, 1) for _ in range(n_assets))
-        initial_weights = np.ones(n_assets) / n_assets
+        if initial_weights is None:
+            initial_weights = np.ones(n_assets) / n_assets
         
+        profiler = get_profiler()
+        constraints = profiler.count_constraints([constraints])
         result = minimize(objective, initial_weights, method='SLSQP', 
                          bounds=bounds, constraints=constraints)
+        profiler.record_solver('black_litterman.optimize_portfolio', result, constraints)
         
         return result['x']
     
-    def adjust_views(self, P, Q, omega=None):
+    @profiled('black_litterman.adjust_views')
+    def adjust_views(self, P, Q, omega=None, confidences=None):
         """
         Adjust views and find optimal portfolio weights.
         
@@ -123,21 +196,86 @@ class BlackLittermanModel:
             Expected returns for each view
         omega : ndarray, optional
             Uncertainty matrix for each view
+        confidences : float or array-like, optional
+            Confidence in each view in (0, 1], used instead of omega
             
         Returns:
         --------
         dict
             Dictionary containing optimal weights and portfolio statistics
         """
-        posterior_returns = self.incorporate_views(P, Q, omega)
-        optimal_weights = self.optimize_portfolio(posterior_returns)
+        key = None
+        if self.cache is not None:
+            key = hash_problem(self.cov_matrix, self.equil_returns, P, Q, omega, confidences,
+                               method='black_litterman.adjust_views',
+                               risk_aversion=self.risk_aversion, tau=self.tau)
+            # Only raw arrays are cached: the key ignores asset labels, so the
+            # output is rebuilt with this model's own names
+            cached = self.cache.get(key)
+            if cached is not None:
+                return self._solution(*cached)
         
+        posterior_returns = self.incorporate_views(P, Q, omega, confidences)
+        
+        initial_weights = None
+        if self.cache is not None:
+            features = problem_features(posterior_returns, self.cov_matrix)
+            initial_weights = self.cache.warm_start('black_litterman.adjust_views', features)
+        optimal_weights = self.optimize_portfolio(posterior_returns, initial_weights=initial_weights)
+        
+        if key is not None:
+            self.cache.put(key, (np.asarray(posterior_returns), optimal_weights),
+                           kind='black_litterman.adjust_views', features=features, weights=optimal_weights)
+        
+        return self._solution(posterior_returns, optimal_weights)
+    
+    def _solution(self, posterior_returns, weights):
+        """Format raw solver weights with this model's asset names."""
         if hasattr(self.equil_returns, 'index'):
             # If we have asset names
-            optimal_weights = pd.Series(optimal_weights, index=self.equil_returns.index)
+            weights = pd.Series(weights, index=self.equil_returns.index)
         
         return {
-            'weights': optimal_weights,
-            'expected_return': np.sum(posterior_returns * optimal_weights),
-            'volatility': np.sqrt(np.dot(optimal_weights.T, np.dot(self.cov_matrix, optimal_weights)))
-        }
\ No newline at end of file
+            'weights': weights,
+            'expected_return': np.sum(np.asarray(posterior_returns) * np.asarray(weights)),
+            'volatility': np.sqrt(np.dot(weights.T, np.dot(self.cov_matrix, weights)))
+        }
+    
+    def rebalance(self, P, Q, current_weights, omega=None, linear_cost=0.0, impact_cost=0.0,
+                  impact_exponent=1.5, no_trade_band=0.0, confidences=None):
+        """
+        Incorporate views and rebalance from current holdings net of costs.
+        
+        Parameters:
+        -----------
+        P : ndarray
+            Pick matrix for the views
+        Q : ndarray
+            Expected returns for each view
+        current_weights : pandas.Series or ndarray
+            Current portfolio weights
+        omega : ndarray, optional
+            Uncertainty matrix for each view
+        linear_cost : float or array-like, optional
+            Cost per unit of weight traded
+        impact_cost : float or array-like, optional
+            Coefficient of the power-law market-impact cost
+        impact_exponent : float, optional
+            Exponent of the market-impact cost
+        no_trade_band : float, optional
+            Trades smaller than this (in weight) are not executed
+        confidences : float or array-like, optional
+            Confidence in each view in (0, 1], used instead of omega
+            
+        Returns:
+        --------
+        dict
+            See ``RebalancingOptimizer.rebalance``
+        """
+        posterior_returns = self.incorporate_views(P, Q, omega, confidences)
+        if hasattr(self.equil_returns, 'index'):
+            posterior_returns = pd.Series(posterior_returns, index=self.equil_returns.index)
+        
+        rebalancer = RebalancingOptimizer(posterior_returns, self.cov_matrix, self.risk_aversion)
+        return rebalancer.rebalance(current_weights, linear_cost=linear_cost, impact_cost=impact_cost,
+                                    impact_exponent=impact_exponent, no_trade_band=no_trade_band)
\ No newline at end of file
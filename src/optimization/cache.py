@@ -0,0 +1,263 @@
+import copy
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
+
+
+def hash_problem(*arrays, **params):
+    """
+    Content hash of an optimization problem.
+
+    Parameters:
+    -----------
+    *arrays : array-like
+        Input arrays (expected returns, covariance matrix, views, ...).
+        Their shape and raw float64 bytes are hashed, so labels and the
+        container type (pandas or numpy) do not matter: callers cache raw
+        arrays and attach their own labels on a hit.
+    **params
+        Scalar parameters (method name, target return, bounds, ...)
+
+    Returns:
+    --------
+    str
+        Hexadecimal digest
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    for array in arrays:
+        if array is None:
+            digest.update(b'none;')
+            continue
+        values = np.ascontiguousarray(np.asarray(array, dtype=np.float64))
+        digest.update(repr(values.shape).encode())
+        digest.update(values.tobytes())
+    digest.update(repr(sorted(params.items())).encode())
+    return digest.hexdigest()
+
+
+def problem_features(expected_returns, cov_matrix):
+    """
+    Compact fingerprint of (mu, Sigma) used to find near-identical problems.
+
+    Consists of mu, the variances and the row sums of Sigma, so comparing
+    two problems costs O(N) instead of O(N^2).
+    """
+    cov = np.asarray(cov_matrix, dtype=float)
+    return np.concatenate([np.asarray(expected_returns, dtype=float), np.diag(cov), cov.sum(axis=1)])
+
+
+class SolutionCache:
+    """
+    Two-tier memoization of optimizer solutions.
+
+    Solutions are keyed by ``hash_problem`` and kept in an in-memory LRU
+    tier and, optionally, in a directory of pickles bounded by total size
+    (least recently used files are evicted first). Solutions that carry
+    weights are also indexed by ``problem_features`` so that a problem
+    that misses the cache can still be warm-started from the solution of
+    the closest previous problem of the same kind.
+    """
+
+    def __init__(self, max_entries=1024, directory=None, max_disk_bytes=512 * 1024 ** 2,
+                 warm_start_tolerance=0.05):
+        """
+        Initialize the SolutionCache.
+
+        Parameters:
+        -----------
+        max_entries : int, optional
+            Number of solutions kept in memory
+        directory : str, optional
+            Directory of the on-disk tier (disabled if None)
+        max_disk_bytes : int, optional
+            Upper bound on the total size of the on-disk tier
+        warm_start_tolerance : float, optional
+            Largest relative distance between problem fingerprints for which
+            a previous solution is offered as a warm start
+        """
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.warm_start_tolerance = warm_start_tolerance
+
+        self._memory = OrderedDict()
+        self._neighbours = {}  # kind -> deque of (features, weights)
+        self._disk = OrderedDict()  # key -> file size, least recently used first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'memory_hits': 0, 'disk_hits': 0, 'misses': 0,
+                       'warm_starts': 0, 'evictions': 0, 'disk_evictions': 0}
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            files = []
+            for entry in os.scandir(directory):
+                if entry.name.endswith('.pkl'):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+            for _, key, size in sorted(files):
+                self._disk[key] = size
+                self._disk_bytes += size
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.pkl')
+
+    def get(self, key):
+        """
+        Look up a solution.
+
+        Parameters:
+        -----------
+        key : str
+            Key from ``hash_problem``
+
+        Returns:
+        --------
+        object or None
+            A copy of the cached solution, or None on a miss
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats['hits'] += 1
+                self._stats['memory_hits'] += 1
+                return copy.deepcopy(self._memory[key])
+
+            if key in self._disk:
+                try:
+                    with open(self._path(key), 'rb') as f:
+                        value = pickle.load(f)
+                except (OSError, pickle.UnpicklingError, EOFError):
+                    self._drop_file(key)
+                else:
+                    self._disk.move_to_end(key)
+                    os.utime(self._path(key))
+                    self._store_memory(key, value)
+                    self._stats['hits'] += 1
+                    self._stats['disk_hits'] += 1
+                    return copy.deepcopy(value)
+
+            self._stats['misses'] += 1
+            return None
+
+    def put(self, key, value, kind=None, features=None, weights=None):
+        """
+        Store a solution.
+
+        Parameters:
+        -----------
+        key : str
+            Key from ``hash_problem``
+        value : object
+            Solution to cache (must be picklable for the on-disk tier)
+        kind : str, optional
+            Problem family (e.g. 'markowitz.minimize_volatility') used for
+            warm starts
+        features : numpy.ndarray, optional
+            Fingerprint from ``problem_features``
+        weights : numpy.ndarray, optional
+            Solution weights to offer as a warm start to similar problems
+        """
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._store_memory(key, value)
+            if kind is not None and features is not None and weights is not None:
+                neighbours = self._neighbours.setdefault(kind, deque(maxlen=self.max_entries))
+                neighbours.append((np.asarray(features, dtype=float), np.array(weights, dtype=float)))
+            if self.directory is not None:
+                self._store_disk(key, value)
+
+    def warm_start(self, kind, features):
+        """
+        Weights of the most similar cached problem of the same kind.
+
+        Parameters:
+        -----------
+        kind : str
+            Problem family
+        features : numpy.ndarray
+            Fingerprint from ``problem_features``
+
+        Returns:
+        --------
+        numpy.ndarray or None
+            Weights to start from, or None if no cached problem is within
+            ``warm_start_tolerance``
+        """
+        features = np.asarray(features, dtype=float)
+        scale = np.linalg.norm(features) or 1.0
+        best, best_distance = None, self.warm_start_tolerance
+        with self._lock:
+            for cached_features, weights in self._neighbours.get(kind, ()):
+                if cached_features.shape != features.shape:
+                    continue
+                distance = np.linalg.norm(cached_features - features) / scale
+                if distance <= best_distance:
+                    best, best_distance = weights, distance
+            if best is not None:
+                self._stats['warm_starts'] += 1
+                return best.copy()
+        return None
+
+    def _store_memory(self, key, value):
+        """Insert into the memory tier (caller holds the lock)."""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def _store_disk(self, key, value):
+        """Write to the disk tier and evict old files (caller holds the lock)."""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_disk_bytes:
+            return
+        # Write to a temporary file first so readers never see a partial pickle
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, self._path(key))
+
+        self._disk_bytes += len(data) - self._disk.pop(key, 0)
+        self._disk[key] = len(data)
+        while self._disk_bytes > self.max_disk_bytes:
+            self._drop_file(next(iter(self._disk)))
+            self._stats['disk_evictions'] += 1
+
+    def _drop_file(self, key):
+        """Remove an entry of the disk tier (caller holds the lock)."""
+        self._disk_bytes -= self._disk.pop(key)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def stats(self):
+        """
+        Cache statistics.
+
+        Returns:
+        --------
+        dict
+            Hit (memory and disk), miss, warm-start and eviction counts, plus
+            the number of entries in memory and bytes on disk
+        """
+        with self._lock:
+            info = dict(self._stats)
+            info['entries'] = len(self._memory)
+            info['disk_entries'] = len(self._disk)
+            info['disk_bytes'] = self._disk_bytes
+        return info
+
+    def clear(self):
+        """Drop every cached solution from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._neighbours.clear()
+            for key in list(self._disk):
+                self._drop_file(key)
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+from ..utils.profiling import profiled
+
+
+class DiscreteAllocation:
+    """
+    Convert continuous portfolio weights into whole numbers of shares.
+
+    The deviation from the target is measured as the sum over assets of
+    |target value - held value|, i.e. the L1 tracking error of the money
+    allocated to each asset.
+    """
+
+    def __init__(self, weights, latest_prices, total_portfolio_value=10000):
+        """
+        Initialize the DiscreteAllocation.
+
+        Parameters:
+        -----------
+        weights : pandas.Series or numpy.ndarray
+            Target weights, e.g. ``minimize_volatility()['weights']`` or
+            ``adjust_views(...)['weights']``. Must be non-negative.
+        latest_prices : pandas.Series or numpy.ndarray
+            Latest price of each asset, e.g. ``DataLoader.data.iloc[-1]``
+        total_portfolio_value : float, optional
+            Cash budget to invest
+        """
+        if isinstance(weights, pd.Series) and isinstance(latest_prices, pd.Series):
+            latest_prices = latest_prices.reindex(weights.index)
+
+        self.asset_names = weights.index if isinstance(weights, pd.Series) else None
+        self.weights = np.asarray(weights, dtype=float)
+        self.latest_prices = np.asarray(latest_prices, dtype=float)
+        self.total_portfolio_value = float(total_portfolio_value)
+
+        if self.weights.shape != self.latest_prices.shape:
+            raise ValueError("weights and latest_prices must have the same length")
+        if np.isnan(self.latest_prices).any() or (self.latest_prices <= 0).any():
+            raise ValueError("latest_prices must be positive for every asset")
+        if (self.weights < 0).any():
+            raise ValueError("Only long-only weights can be allocated")
+
+        self.target_values = self.weights * self.total_portfolio_value
+
+    def _result(self, shares):
+        """Format an allocation (shares per asset) as an output dictionary."""
+        shares = shares.astype(int)
+        values = shares * self.latest_prices
+        leftover = self.total_portfolio_value - values.sum()
+        allocation = pd.Series(shares, index=self.asset_names) if self.asset_names is not None else shares
+        realized = values / self.total_portfolio_value
+
+        return {
+            'allocation': allocation,
+            'leftover': leftover,
+            'weights': pd.Series(realized, index=self.asset_names) if self.asset_names is not None else realized,
+            'tracking_error': np.abs(self.target_values - values).sum() / self.total_portfolio_value
+        }
+
+    @profiled('discrete_allocation.greedy')
+    def greedy_portfolio(self):
+        """
+        Allocate shares by rounding down and then topping up greedily.
+
+        Every asset first receives the whole number of shares its target
+        value can buy. The leftover cash then buys one more share of the
+        assets where that reduces the deviation most, in rounds that each
+        take as many of the best remaining candidates as the cash allows.
+
+        Returns:
+        --------
+        dict
+            'allocation': shares per asset; 'leftover': unspent cash;
+            'weights': realized weights; 'tracking_error': L1 deviation of
+            the allocated value from the target, as a fraction of the budget
+        """
+        prices = self.latest_prices
+        shares = np.floor(self.target_values / prices)
+        cash = self.total_portfolio_value - shares @ prices
+
+        # After rounding down each asset is short of its target by less than
+        # one share, so each gets at most one more share. Buying it reduces
+        # the deviation by 2 * shortfall - price.
+        shortfall = self.target_values - shares * prices
+        gain = 2 * shortfall - prices
+        candidates = np.flatnonzero(gain > 0)
+        candidates = candidates[np.argsort(-gain[candidates], kind='stable')]
+
+        while len(candidates):
+            affordable = candidates[prices[candidates] <= cash]
+            if not len(affordable):
+                break
+            bought = affordable[np.cumsum(prices[affordable]) <= cash]
+            shares[bought] += 1
+            cash -= prices[bought].sum()
+            candidates = np.setdiff1d(affordable, bought, assume_unique=True)
+            candidates = candidates[np.argsort(-gain[candidates], kind='stable')]
+
+        return self._result(shares)
+
+    @profiled('discrete_allocation.milp')
+    def milp_portfolio(self, time_limit=None):
+        """
+        Allocate shares by mixed-integer linear programming.
+
+        Minimizes the L1 deviation of the allocated value from the target,
+        sum_i |w_i V - p_i x_i|, subject to the cash budget, with each x_i
+        rounded either down or up from w_i V / p_i. Rounding everything down
+        is always affordable, so the problem reduces to a 0/1 knapsack over
+        the assets worth rounding up, solved with ``scipy.optimize.milp``.
+        Its feasible set contains the greedy allocation, so the result is
+        never worse than ``greedy_portfolio``.
+
+        Parameters:
+        -----------
+        time_limit : float, optional
+            Maximum solver time in seconds; the best allocation found so far
+            is returned when it is reached
+
+        Returns:
+        --------
+        dict
+            'allocation': shares per asset; 'leftover': unspent cash;
+            'weights': realized weights; 'tracking_error': L1 deviation of
+            the allocated value from the target, as a fraction of the budget
+        """
+        from scipy.optimize import Bounds, LinearConstraint, milp
+
+        prices = self.latest_prices
+        shares = np.floor(self.target_values / prices)
+        cash = self.total_portfolio_value - shares @ prices
+
+        gain = 2 * (self.target_values - shares * prices) - prices
+        candidates = np.flatnonzero(gain > 0)
+        if not len(candidates):
+            return self._result(shares)
+
+        options = {'mip_rel_gap': 1e-9}
+        if time_limit is not None:
+            options['time_limit'] = time_limit
+        result = milp(
+            -gain[candidates],
+            integrality=np.ones(len(candidates)),
+            bounds=Bounds(0, 1),
+            constraints=[LinearConstraint(prices[candidates][None, :], -np.inf, cash)],
+            options=options
+        )
+        if result.x is None:
+            raise RuntimeError(f"MILP allocation failed: {result.message}")
+
+        shares[candidates] += np.round(result.x)
+        return self._result(shares)
@@ -1,11 +1,16 @@
 import numpy as np
 import pandas as pd
-from scipy.optimize import minimize
+
+from .cache import hash_problem, problem_features
+from .rebalancing import RebalancingOptimizer
+from .resampling import resampled_efficient_frontier
+from ..utils.precision import as_float64
+from ..utils.profiling import get_profiler, profiled
 
 class MarkowitzOptimizer:
     """Implementation of Markowitz's Modern Portfolio Theory."""
     
-    def __init__(self, expected_returns, cov_matrix):
+    def __init__(self, expected_returns, cov_matrix, cache=None):
         """
         Initialize the MarkowitzOptimizer.
         
@@ -15,9 +20,13 @@ class MarkowitzOptimizer:
             Expected returns for each asset
         cov_matrix : pandas.DataFrame or numpy.ndarray
             Covariance matrix of returns
+        cache : SolutionCache, optional
+            Cache of previous solutions, shared between optimizers
         """
-        self.expected_returns = expected_returns
-        self.cov_matrix = cov_matrix
+        # The solver works in float64 even if the inputs were stored in float32
+        self.expected_returns = as_float64(expected_returns)
+        self.cov_matrix = as_float64(cov_matrix)
+        self.cache = cache
         self.asset_names = expected_returns.index if isinstance(expected_returns, pd.Series) else None
         
     def portfolio_return(self, weights):
@@ -52,7 +61,16 @@ class MarkowitzOptimizer:
         """
         return np.sqrt(np.dot(weights.T, np.dot(self.cov_matrix, weights)))
     
-    def minimize_volatility(self, target_return=None):
+    def _solution(self, weights):
+        """Format raw solver weights with this optimizer's asset names."""
+        return {
+            'weights': pd.Series(weights, index=self.asset_names) if self.asset_names is not None else weights,
+            'expected_return': self.portfolio_return(weights),
+            'volatility': self.portfolio_volatility(weights)
+        }
+    
+    @profiled('markowitz.minimize_volatility')
+    def minimize_volatility(self, target_return=None, initial_weights=None):
         """
         Find the portfolio weights that minimize volatility, 
         optionally subject to a target return constraint.
@@ -61,26 +79,48 @@ class MarkowitzOptimizer:
         -----------
         target_return : float, optional
             Target portfolio return
+        initial_weights : numpy.ndarray, optional
+            Starting point of the solver (equal weights if None, or the
+            solution of a similar cached problem when a cache is set)
             
         Returns:
         --------
         dict
             Dictionary containing optimal weights and portfolio statistics
         """
+        key = None
+        if self.cache is not None:
+            key = hash_problem(self.expected_returns, self.cov_matrix,
+                               method='markowitz.minimize_volatility', target_return=target_return)
+            # Only the raw weights are cached: the key ignores asset labels, so
+            # the output is rebuilt with the caller's own names
+            cached = self.cache.get(key)
+            if cached is not None:
+                return self._solution(cached)
+            kind = 'markowitz.minimize_volatility' + ('' if target_return is None else '.target')
+            features = np.append(problem_features(self.expected_returns, self.cov_matrix),
+                                 0.0 if target_return is None else target_return)
+            if initial_weights is None:
+                initial_weights = self.cache.warm_start(kind, features)
+        
+        from scipy.optimize import minimize
+        
         num_assets = len(self.expected_returns)
         args = (self.cov_matrix,)
         constraints = [{'type': 'eq', 'fun': lambda x: np.sum(x) - 1}]
         
         if target_return is not None:
-            args = (self.cov_matrix, self.expected_returns)
             constraints.append({
                 'type': 'eq',
                 'fun': lambda x: self.portfolio_return(x) - target_return
             })
             
         bounds = tuple((0, 1) for _ in range(num_assets))
-        initial_weights = np.array(num_assets * [1. / num_assets])
+        if initial_weights is None:
+            initial_weights = np.array(num_assets * [1. / num_assets])
         
+        profiler = get_profiler()
+        constraints = profiler.count_constraints(constraints)
         result = minimize(
             fun=lambda w, c: np.sqrt(np.dot(w.T, np.dot(c, w))),
             x0=initial_weights,
@@ -89,18 +129,17 @@ class MarkowitzOptimizer:
             bounds=bounds,
             constraints=constraints
         )
+        profiler.record_solver('markowitz.minimize_volatility', result, constraints)
         
         optimal_weights = result['x']
         
-        # Format the output as a dictionary
-        output = {
-            'weights': pd.Series(optimal_weights, index=self.asset_names) if self.asset_names is not None else optimal_weights,
-            'expected_return': self.portfolio_return(optimal_weights),
-            'volatility': self.portfolio_volatility(optimal_weights)
-        }
+        if key is not None:
+            self.cache.put(key, optimal_weights, kind=kind, features=features, weights=optimal_weights)
         
-        return output
+        # Format the output as a dictionary
+        return self._solution(optimal_weights)
     
+    @profiled('markowitz.efficient_frontier')
     def efficient_frontier(self, points=20):
         """
         Calculate the efficient frontier.
@@ -115,12 +154,19 @@ class MarkowitzOptimizer:
         pandas.DataFrame
             DataFrame containing return, volatility, and Sharpe ratio for each point
         """
+        key = None
+        if self.cache is not None:
+            key = hash_problem(self.expected_returns, self.cov_matrix,
+                               method='markowitz.efficient_frontier', points=points)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
         # Get min and max returns for the range
         min_return = self.minimize_volatility()['expected_return']
         
         # Find maximum return portfolio (100% in the best performing asset)
-        max_return_idx = np.argmax(self.expected_returns)
-        max_return = self.expected_returns[max_return_idx]
+        max_return = np.max(np.asarray(self.expected_returns))
         
         # Create range of target returns
         target_returns = np.linspace(min_return, max_return, points)
@@ -137,8 +183,84 @@ class MarkowitzOptimizer:
         sharpe_ratios = [r/v for r, v in zip(returns, volatilities)]
         
         # Create DataFrame with results
-        return pd.DataFrame({
+        frontier = pd.DataFrame({
             'Return': returns,
             'Volatility': volatilities,
             'Sharpe': sharpe_ratios
-        })
\ No newline at end of file
+        })
+        
+        if key is not None:
+            self.cache.put(key, frontier)
+        
+        return frontier
+    
+    @profiled('markowitz.resampled_efficient_frontier')
+    def resampled_efficient_frontier(self, returns, n_samples=500, points=50, method='bootstrap',
+                                     n_jobs=None, seed=None, annualization=252, precision=None):
+        """
+        Calculate the resampled (Michaud) efficient frontier.
+        
+        Frontiers are computed for many (mu, Sigma) samples drawn from the
+        historical returns, their weights are averaged point by point, and
+        the averaged portfolios are evaluated with this optimizer's
+        expected returns and covariance matrix.
+        
+        Parameters:
+        -----------
+        returns : pandas.DataFrame
+            Historical returns, e.g. from ``DataLoader.calculate_returns``
+        n_samples : int
+            Number of (mu, Sigma) samples
+        points : int
+            Number of points on each frontier
+        method : str
+            'bootstrap' or 'parametric'
+        n_jobs : int, optional
+            Worker processes (defaults to the number of CPUs)
+        seed : int, optional
+            Random seed
+        annualization : float
+            Factor applied to the sampled means and covariances
+        precision : str, optional
+            'float64' or 'float32' storage of the simulated panels
+            
+        Returns:
+        --------
+        dict
+            'frontier': DataFrame containing return, volatility, and Sharpe
+            ratio for each point; 'weights': DataFrame of averaged weights
+        """
+        return resampled_efficient_frontier(
+            returns, self.expected_returns, self.cov_matrix,
+            n_samples=n_samples, points=points, method=method,
+            n_jobs=n_jobs, seed=seed, annualization=annualization, precision=precision
+        )
+    
+    def rebalance(self, current_weights, risk_aversion=1.0, linear_cost=0.0, impact_cost=0.0,
+                  impact_exponent=1.5, no_trade_band=0.0):
+        """
+        Rebalance from current holdings, maximizing net-of-cost utility.
+        
+        Parameters:
+        -----------
+        current_weights : pandas.Series or numpy.ndarray
+            Current portfolio weights
+        risk_aversion : float
+            Risk aversion coefficient
+        linear_cost : float or array-like
+            Cost per unit of weight traded
+        impact_cost : float or array-like
+            Coefficient of the power-law market-impact cost
+        impact_exponent : float
+            Exponent of the market-impact cost
+        no_trade_band : float
+            Trades smaller than this (in weight) are not executed
+            
+        Returns:
+        --------
+        dict
+            See ``RebalancingOptimizer.rebalance``
+        """
+        rebalancer = RebalancingOptimizer(self.expected_returns, self.cov_matrix, risk_aversion)
+        return rebalancer.rebalance(current_weights, linear_cost=linear_cost, impact_cost=impact_cost,
+                                    impact_exponent=impact_exponent, no_trade_band=no_trade_band)
\ No newline at end of file
@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+
+from ..utils.profiling import get_profiler, profiled
+
+
+# Trades smaller than this are treated as no trade
+_TRADE_TOLERANCE = 1e-10
+
+# Tolerance on the budget constraint of the returned weights
+_BUDGET_TOLERANCE = 1e-8
+
+
+class RebalancingOptimizer:
+    """
+    Mean-variance rebalancing from current holdings with transaction costs.
+
+    Maximizes the net-of-cost utility
+
+        w'mu - lambda/2 w'Sigma w - sum_i c_i |t_i| - sum_i k_i |t_i|^p
+
+    over the new weights w = h + t, where h are the current weights, c_i a
+    linear (commission and spread) cost and k_i |t_i|^p a power-law market
+    impact cost. Trades are split into buys and sells so the cost terms are
+    smooth and have analytic gradients, and the solver starts from the
+    current holdings (no trade).
+
+    A no-trade band makes the problem semi-continuous (each trade is either
+    zero or at least the band). It is handled by re-solving: assets whose
+    optimal trade falls inside the band are fixed at zero trade and the
+    others re-optimized, until every trade is zero or outside the band.
+    Each returned solution is the net-of-cost optimum given the assets that
+    are not traded, but that set is chosen greedily, so it is not
+    guaranteed to be the best one.
+    """
+
+    def __init__(self, expected_returns, cov_matrix, risk_aversion=1.0):
+        """
+        Initialize the RebalancingOptimizer.
+
+        Parameters:
+        -----------
+        expected_returns : pandas.Series or numpy.ndarray
+            Expected returns for each asset
+        cov_matrix : pandas.DataFrame or numpy.ndarray
+            Covariance matrix of returns
+        risk_aversion : float, optional
+            Risk aversion coefficient
+        """
+        self.expected_returns = np.asarray(expected_returns, dtype=float)
+        self.cov_matrix = np.asarray(cov_matrix, dtype=float)
+        self.risk_aversion = risk_aversion
+        self.asset_names = expected_returns.index if isinstance(expected_returns, pd.Series) else None
+
+    def _costs(self, trades, linear_cost, impact_cost, impact_exponent):
+        """Linear and impact cost of each trade."""
+        size = np.abs(trades)
+        return linear_cost * size, impact_cost * size ** impact_exponent
+
+    @profiled('rebalancing.rebalance')
+    def rebalance(self, current_weights, linear_cost=0.0, impact_cost=0.0, impact_exponent=1.5,
+                  no_trade_band=0.0, bounds=(0, 1)):
+        """
+        Find the cost-aware target portfolio and the trades to reach it.
+
+        Parameters:
+        -----------
+        current_weights : pandas.Series or numpy.ndarray
+            Current portfolio weights (aligned by name if a Series)
+        linear_cost : float or array-like, optional
+            Cost per unit of weight traded, per asset or for all
+        impact_cost : float or array-like, optional
+            Coefficient k of the market-impact cost k |t|^p
+        impact_exponent : float, optional
+            Exponent p >= 1 of the market-impact cost (1.5 for the
+            square-root impact law)
+        no_trade_band : float, optional
+            Trades smaller than this (in weight) are not executed; the
+            assets concerned are held fixed and the others re-optimized
+        bounds : tuple, optional
+            Lower and upper bound on every new weight
+
+        Returns:
+        --------
+        dict
+            'weights': new weights; 'trades': DataFrame of executed trades
+            with current and target weights and their expected costs;
+            'costs': linear, impact and total expected cost; plus
+            'expected_return', 'volatility', 'turnover', 'net_utility',
+            'band_solves' (number of solves, more than one when the
+            no-trade band fixed some assets) and 'success', which is False
+            if a solve failed or the weights do not meet the budget, e.g.
+            when the band leaves no trade large enough to invest the cash
+        """
+        from scipy.optimize import minimize
+
+        if impact_exponent < 1:
+            raise ValueError("impact_exponent must be at least 1")
+        if isinstance(current_weights, pd.Series) and self.asset_names is not None:
+            current_weights = current_weights.reindex(self.asset_names).fillna(0.0)
+
+        mu, cov, lam = self.expected_returns, self.cov_matrix, self.risk_aversion
+        holdings = np.asarray(current_weights, dtype=float)
+        n_assets = len(mu)
+        linear_cost = np.broadcast_to(np.asarray(linear_cost, dtype=float), (n_assets,))
+        impact_cost = np.broadcast_to(np.asarray(impact_cost, dtype=float), (n_assets,))
+        p = impact_exponent
+        lower, upper = bounds
+
+        def objective(z):
+            buys, sells = z[:n_assets], z[n_assets:]
+            w = holdings + buys - sells
+            cov_w = cov @ w
+            value = (-mu @ w + 0.5 * lam * w @ cov_w
+                     + linear_cost @ (buys + sells)
+                     + impact_cost @ (buys ** p + sells ** p))
+            grad_w = -mu + lam * cov_w
+            grad = np.concatenate([
+                grad_w + linear_cost + impact_cost * p * buys ** (p - 1),
+                -grad_w + linear_cost + impact_cost * p * sells ** (p - 1),
+            ])
+            return value, grad
+
+        budget = {
+            'type': 'eq',
+            'fun': lambda z: np.sum(holdings + z[:n_assets] - z[n_assets:]) - 1,
+            'jac': lambda z: np.concatenate([np.ones(n_assets), -np.ones(n_assets)])
+        }
+        max_buys = np.maximum(0.0, upper - holdings)
+        max_sells = np.maximum(0.0, holdings - lower)
+
+        profiler = get_profiler()
+        constraints = profiler.count_constraints([budget])
+        fixed = np.zeros(n_assets, dtype=bool)
+        z = np.zeros(2 * n_assets)
+        success = True
+        solves = 0
+        while True:
+            trade_bounds = ([(0.0, 0.0 if f else b) for f, b in zip(fixed, max_buys)] +
+                            [(0.0, 0.0 if f else s) for f, s in zip(fixed, max_sells)])
+            result = minimize(objective, z, jac=True, method='SLSQP',
+                              bounds=trade_bounds, constraints=constraints)
+            profiler.record_solver('rebalancing.rebalance', result, constraints)
+            solves += 1
+            success = success and result['success']
+
+            z = result['x']
+            trades = z[:n_assets] - z[n_assets:]
+            trades = np.where(np.abs(trades) < _TRADE_TOLERANCE, 0.0, trades)
+            inside = (trades != 0) & (np.abs(trades) < no_trade_band)
+            if not inside.any():
+                break
+            # Hold the assets whose trades fall inside the band and re-solve
+            fixed |= inside
+            z[:n_assets][fixed] = 0.0
+            z[n_assets:][fixed] = 0.0
+
+        weights = holdings + trades
+        success = bool(success and abs(weights.sum() - 1) <= _BUDGET_TOLERANCE)
+
+        linear, impact = self._costs(trades, linear_cost, impact_cost, p)
+        port_return = mu @ weights
+        variance = weights @ cov @ weights
+
+        names = self.asset_names if self.asset_names is not None else pd.RangeIndex(n_assets)
+        trade_list = pd.DataFrame({
+            'current': holdings,
+            'target': weights,
+            'trade': trades,
+            'side': np.where(trades > 0, 'buy', 'sell'),
+            'linear_cost': linear,
+            'impact_cost': impact,
+        }, index=names)
+        trade_list = trade_list[trade_list['trade'] != 0]
+
+        return {
+            'weights': pd.Series(weights, index=self.asset_names) if self.asset_names is not None else weights,
+            'trades': trade_list,
+            'costs': {
+                'linear': linear.sum(),
+                'impact': impact.sum(),
+                'total': linear.sum() + impact.sum()
+            },
+            'expected_return': port_return,
+            'volatility': np.sqrt(variance),
+            'turnover': np.abs(trades).sum(),
+            'net_utility': port_return - 0.5 * lam * variance - linear.sum() - impact.sum(),
+            'band_solves': solves,
+            'success': success
+        }
@@ -0,0 +1,258 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ..utils.precision import storage_dtype
+
+# Number of samples whose bootstrap or simulated panels are materialized at once
+_SAMPLE_CHUNK = 32
+
+
+def _moments(panels, counts=None):
+    """
+    Means and covariances of a stack of return panels.
+
+    ``panels`` is either (S, T, N) or, with ``counts`` of shape (S, T), a
+    single (T, N) panel whose rows are weighted by the bootstrap counts.
+    Moments are accumulated in float64 whatever the dtype of the panels.
+    """
+    if counts is None:
+        n_obs = panels.shape[1]
+        means = panels.mean(axis=1, dtype=np.float64)
+        if panels.dtype == np.float64:
+            second = np.matmul(panels.transpose(0, 2, 1), panels)
+        else:
+            # Upcast one sample at a time so that only one float64 panel exists
+            second = np.stack([panel.T @ panel for panel in
+                               (sample.astype(np.float64) for sample in panels)])
+    else:
+        n_obs = counts.shape[1]
+        means = counts @ panels / n_obs
+        second = np.matmul((panels[None, :, :] * counts[:, :, None]).transpose(0, 2, 1), panels)
+
+    covs = (second - n_obs * means[:, :, None] * means[:, None, :]) / (n_obs - 1)
+    return means, covs
+
+
+def draw_samples(returns, n_samples, method='bootstrap', seed=None, annualization=252, precision=None):
+    """
+    Draw (mu, Sigma) estimates that reflect estimation error in ``returns``.
+
+    Parameters:
+    -----------
+    returns : pandas.DataFrame or numpy.ndarray
+        Historical returns, one column per asset
+    n_samples : int
+        Number of samples to draw
+    method : str, optional
+        'bootstrap' resamples the historical rows with replacement;
+        'parametric' simulates panels of the same length from a normal
+        distribution with the sample mean and covariance (Michaud)
+    seed : int, optional
+        Random seed
+    annualization : float, optional
+        Factor applied to the sampled means and covariances
+    precision : str, optional
+        'float64' or 'float32' storage of the simulated panels of the
+        parametric method (``Config.PRECISION`` if None)
+
+    Returns:
+    --------
+    tuple of numpy.ndarray
+        Means of shape (n_samples, N) and covariances of shape
+        (n_samples, N, N), in float64
+    """
+    dtype = storage_dtype(precision)
+    values = np.asarray(returns, dtype=float)
+    n_obs, n_assets = values.shape
+    rng = np.random.default_rng(seed)
+
+    # Moments are shift-invariant; centring keeps the second moments well conditioned
+    center = values.mean(axis=0)
+    centred = values - center
+
+    if method == 'parametric':
+        chol = np.linalg.cholesky(np.cov(centred, rowvar=False)).astype(dtype, copy=False)
+    elif method != 'bootstrap':
+        raise ValueError("method must be 'bootstrap' or 'parametric'")
+
+    means = np.empty((n_samples, n_assets))
+    covs = np.empty((n_samples, n_assets, n_assets))
+    for start in range(0, n_samples, _SAMPLE_CHUNK):
+        stop = min(start + _SAMPLE_CHUNK, n_samples)
+        if method == 'bootstrap':
+            counts = rng.multinomial(n_obs, np.full(n_obs, 1.0 / n_obs), size=stop - start)
+            means[start:stop], covs[start:stop] = _moments(centred, counts.astype(float))
+        else:
+            shocks = rng.standard_normal((stop - start, n_obs, n_assets), dtype=dtype)
+            means[start:stop], covs[start:stop] = _moments(shocks @ chol.T)
+
+    means += center
+    return means * annualization, covs * annualization
+
+
+def frontier_weights(expected_returns, cov_matrix, points=50, bounds=(0, 1)):
+    """
+    Weights along the efficient frontier of one (mu, Sigma) estimate.
+
+    Each point is warm-started from the solution of the previous one and
+    the variance objective and constraints use analytic gradients.
+
+    Parameters:
+    -----------
+    expected_returns : numpy.ndarray
+        Expected returns of shape (N,)
+    cov_matrix : numpy.ndarray
+        Covariance matrix of shape (N, N)
+    points : int, optional
+        Number of frontier points, from the minimum-volatility portfolio to
+        the maximum attainable return
+    bounds : tuple, optional
+        Lower and upper bound on every weight
+
+    Returns:
+    --------
+    numpy.ndarray
+        Weights of shape (points, N), ordered by increasing target return
+    """
+    from scipy.optimize import minimize
+
+    mu = np.asarray(expected_returns, dtype=float)
+    cov = np.asarray(cov_matrix, dtype=float)
+    n_assets = len(mu)
+    lower, upper = bounds
+
+    def variance(w):
+        return w @ cov @ w
+
+    def variance_grad(w):
+        return 2 * cov @ w
+
+    budget = {'type': 'eq', 'fun': lambda w: np.sum(w) - 1, 'jac': lambda w: np.ones(n_assets)}
+    box = [(lower, upper)] * n_assets
+
+    result = minimize(variance, np.full(n_assets, 1.0 / n_assets), jac=variance_grad,
+                      method='SLSQP', bounds=box, constraints=[budget])
+    weights = np.empty((points, n_assets))
+    weights[0] = result['x']
+
+    # Highest return reachable under the bounds: every asset at its lower
+    # bound, with the rest of the budget filling the best assets to their cap
+    order = np.argsort(-mu)
+    extra = np.clip(1 - lower * n_assets - np.arange(n_assets) * (upper - lower), 0, upper - lower)
+    max_return = lower * mu.sum() + extra @ mu[order]
+
+    targets = np.linspace(mu @ weights[0], max_return, points)
+    for k in range(1, points):
+        target = targets[k]
+        constraints = [budget, {'type': 'eq', 'fun': lambda w, t=target: mu @ w - t,
+                                'jac': lambda w: mu}]
+        result = minimize(variance, weights[k - 1], jac=variance_grad, method='SLSQP',
+                          bounds=box, constraints=constraints)
+        weights[k] = result['x']
+
+    return weights
+
+
+def _frontier_batch(means, covs, points, bounds):
+    """Frontier weights for a batch of samples (runs in a worker process)."""
+    return np.stack([frontier_weights(mu, cov, points, bounds) for mu, cov in zip(means, covs)])
+
+
+def resampled_frontier_weights(means, covs, points=50, bounds=(0, 1), n_jobs=None):
+    """
+    Average frontier weights by rank over many (mu, Sigma) samples.
+
+    Parameters:
+    -----------
+    means : numpy.ndarray
+        Sampled expected returns of shape (S, N)
+    covs : numpy.ndarray
+        Sampled covariances of shape (S, N, N)
+    points : int, optional
+        Number of frontier points per sample
+    bounds : tuple, optional
+        Lower and upper bound on every weight
+    n_jobs : int, optional
+        Worker processes (defaults to the number of CPUs; 1 runs in-process)
+
+    Returns:
+    --------
+    numpy.ndarray
+        Averaged weights of shape (points, N)
+    """
+    n_jobs = n_jobs or os.cpu_count() or 1
+    n_samples = len(means)
+
+    if n_jobs == 1 or n_samples == 1:
+        return _frontier_batch(means, covs, points, bounds).mean(axis=0)
+
+    # A few batches per worker balances load without shipping one task per sample
+    batches = np.array_split(np.arange(n_samples), min(n_samples, n_jobs * 4))
+    total = np.zeros((points, means.shape[1]))
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        futures = [pool.submit(_frontier_batch, means[idx], covs[idx], points, bounds)
+                   for idx in batches]
+        for future in futures:
+            total += future.result().sum(axis=0)
+
+    return total / n_samples
+
+
+def resampled_efficient_frontier(returns, expected_returns, cov_matrix, n_samples=500, points=50,
+                                 method='bootstrap', bounds=(0, 1), n_jobs=None, seed=None,
+                                 annualization=252, precision=None):
+    """
+    Resampled (Michaud) efficient frontier.
+
+    Parameters:
+    -----------
+    returns : pandas.DataFrame or numpy.ndarray
+        Historical returns used to draw the samples
+    expected_returns : pandas.Series or numpy.ndarray
+        Point estimate used to evaluate the averaged portfolios
+    cov_matrix : pandas.DataFrame or numpy.ndarray
+        Point estimate used to evaluate the averaged portfolios
+    n_samples : int, optional
+        Number of (mu, Sigma) samples
+    points : int, optional
+        Number of frontier points
+    method : str, optional
+        'bootstrap' or 'parametric', see ``draw_samples``
+    bounds : tuple, optional
+        Lower and upper bound on every weight
+    n_jobs : int, optional
+        Worker processes (defaults to the number of CPUs)
+    seed : int, optional
+        Random seed
+    annualization : float, optional
+        Factor applied to the sampled means and covariances
+    precision : str, optional
+        Storage precision of the simulated panels, see ``draw_samples``
+
+    Returns:
+    --------
+    dict
+        'frontier': DataFrame with Return, Volatility and Sharpe for each
+        point; 'weights': DataFrame of the averaged weights (points x assets)
+    """
+    means, covs = draw_samples(returns, n_samples, method=method, seed=seed,
+                               annualization=annualization, precision=precision)
+    weights = resampled_frontier_weights(means, covs, points=points, bounds=bounds, n_jobs=n_jobs)
+
+    mu = np.asarray(expected_returns, dtype=float)
+    cov = np.asarray(cov_matrix, dtype=float)
+    port_returns = weights @ mu
+    volatilities = np.sqrt(np.einsum('pi,ij,pj->p', weights, cov, weights))
+
+    asset_names = expected_returns.index if isinstance(expected_returns, pd.Series) else None
+    return {
+        'frontier': pd.DataFrame({
+            'Return': port_returns,
+            'Volatility': volatilities,
+            'Sharpe': port_returns / volatilities
+        }),
+        'weights': pd.DataFrame(weights, columns=asset_names)
+    }
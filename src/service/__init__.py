@@ -0,0 +1,2 @@
+# Local optimization service.
+from .server import OptimizationService, ServiceError, serve
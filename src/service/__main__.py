@@ -0,0 +1,32 @@
+"""Run the optimization service: python -m src.service [--port PORT | --unix PATH]"""
+import argparse
+import asyncio
+
+from ..utils.config import get_config
+from .server import serve
+
+
+def main(argv=None):
+    config = get_config()
+    parser = argparse.ArgumentParser(description='Local portfolio optimization service.')
+    parser.add_argument('--host', default=config.SERVICE_HOST, help='Interface to bind')
+    parser.add_argument('--port', type=int, default=config.SERVICE_PORT, help='TCP port')
+    parser.add_argument('--unix', default=None, help='Listen on this Unix socket instead of TCP')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for the solves (defaults to the number of CPUs)')
+    parser.add_argument('--max-queue', type=int, default=config.SERVICE_MAX_QUEUE,
+                        help='Pending solves before requests are rejected with 503')
+    parser.add_argument('--max-universes', type=int, default=config.SERVICE_MAX_UNIVERSES,
+                        help='Universes kept warm in memory')
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(host=args.host, port=args.port, path=args.unix,
+                          max_workers=args.workers, max_queue=args.max_queue,
+                          max_universes=args.max_universes))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,630 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ..data.data_loader import DataLoader
+from ..data.market_data import MarketData
+
+# Largest request body accepted, in bytes
+_MAX_BODY = 16 * 1024 ** 2
+
+# Universes each worker keeps in memory between solves
+_WORKER_MAX_UNIVERSES = 8
+
+# Solved problems each worker caches per universe
+_WORKER_CACHE_ENTRIES = 256
+
+# Universe statistics and solution caches held by this (worker) process:
+# universe token -> dict, least recently used first
+_worker_universes = OrderedDict()
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class ServiceError(Exception):
+    """Error returned to the client with an HTTP status code."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _jsonable(value):
+    """Convert optimizer output (pandas, numpy) to JSON-serializable types."""
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, pd.DataFrame):
+        return {str(k): _jsonable(v) for k, v in value.to_dict(orient='list').items()}
+    if isinstance(value, pd.Series):
+        return {str(k): _jsonable(float(v)) for k, v in value.items()}
+    if isinstance(value, (np.ndarray, list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, (np.bool_, bool)):
+        return bool(value)
+    if isinstance(value, (np.integer, int)):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        # NaN and infinities are not valid JSON
+        return float(value) if np.isfinite(value) else None
+    return value
+
+
+class _UniverseMissing(Exception):
+    """Raised by a worker that does not hold the statistics of a universe yet."""
+
+
+def _worker_universe(token, statistics):
+    """
+    Statistics and solution cache of a universe in this worker.
+
+    Parameters:
+    -----------
+    token : str
+        Identifier of the universe (``Universe.token``)
+    statistics : tuple or None
+        (expected returns, covariance matrix), sent only when the worker
+        raised ``_UniverseMissing`` for this universe
+
+    Returns:
+    --------
+    dict
+        'expected_returns', 'cov_matrix' and 'cache' (SolutionCache shared
+        by the solves of this universe, so repeated and similar requests
+        are answered from the cache or warm-started)
+    """
+    from ..optimization.cache import SolutionCache
+
+    state = _worker_universes.get(token)
+    if state is not None:
+        _worker_universes.move_to_end(token)
+        return state
+    if statistics is None:
+        raise _UniverseMissing(token)
+
+    expected_returns, cov_matrix = statistics
+    state = {'expected_returns': expected_returns, 'cov_matrix': cov_matrix,
+             'cache': SolutionCache(max_entries=_WORKER_CACHE_ENTRIES)}
+    _worker_universes[token] = state
+    while len(_worker_universes) > _WORKER_MAX_UNIVERSES:
+        _worker_universes.popitem(last=False)
+    return state
+
+
+def _solve_markowitz(token, statistics, target_return=None, points=None):
+    """Minimum-volatility portfolio or efficient frontier (runs in a worker process)."""
+    from ..optimization.markowitz import MarkowitzOptimizer
+
+    state = _worker_universe(token, statistics)
+    optimizer = MarkowitzOptimizer(state['expected_returns'], state['cov_matrix'], cache=state['cache'])
+    if points:
+        return _jsonable({'frontier': optimizer.efficient_frontier(points=points)})
+    return _jsonable(optimizer.minimize_volatility(target_return=target_return))
+
+
+def _solve_black_litterman(token, statistics, market_caps, risk_aversion, P, Q, omega=None, tau=0.025):
+    """Black-Litterman portfolio for a set of views (runs in a worker process)."""
+    from ..optimization.black_litterman import BlackLittermanModel
+
+    state = _worker_universe(token, statistics)
+    model = BlackLittermanModel(market_caps, risk_aversion, state['cov_matrix'], tau=tau,
+                                cache=state['cache'])
+    return _jsonable(model.adjust_views(P, Q, omega))
+
+
+def _solve_mean_variance(batch_optimizer, risk_aversion, lower=0.0, upper=1.0):
+    """Mean-variance portfolios of a batch of risk aversions (runs in a thread)."""
+    result = batch_optimizer.solve(risk_aversion, lower=lower, upper=upper, n_jobs=1)
+    return _jsonable({
+        'weights': result['weights'].to_dict(orient='records'),
+        'diagnostics': result['diagnostics'].to_dict(orient='records')
+    })
+
+
+class Universe:
+    """Statistics of one set of symbols and dates, kept warm between requests."""
+
+    def __init__(self, data_loader):
+        """
+        Initialize the Universe from a loaded DataLoader.
+
+        Parameters:
+        -----------
+        data_loader : DataLoader
+            Loader whose prices have been loaded
+        """
+        from ..optimization.batch import BatchOptimizer
+
+        self.symbols = list(data_loader.symbols)
+        self.start_date = data_loader.start_date
+        self.end_date = data_loader.end_date
+        # Names this universe's statistics in the workers; a reloaded universe
+        # gets a new token, so workers never use outdated statistics
+        self.token = uuid.uuid4().hex
+        self.expected_returns = data_loader.get_annualized_returns()
+        self.cov_matrix = data_loader.get_covariance_matrix()
+        # Eigendecomposition of the covariance matrix, computed once
+        self.batch_optimizer = BatchOptimizer(self.expected_returns, self.cov_matrix)
+
+
+class OptimizationService:
+    """
+    Local asyncio HTTP service running portfolio optimizations.
+
+    Universes (symbols and date range) are loaded once through a shared
+    ``MarketData`` cache, and their statistics and covariance
+    factorization stay in memory. Markowitz and Black-Litterman solves run
+    in a process pool. Each worker keeps the statistics and a solution
+    cache of the universes it has solved, so requests carry only their own
+    parameters: the statistics are sent to a worker once, the first time it
+    solves for that universe. Identical requests that arrive while one is being
+    solved wait for that solve instead of starting another, and solves
+    wait in a bounded queue: when it is full new requests are rejected
+    with 503 so that clients back off.
+
+    Routes (JSON bodies):
+
+    - ``GET /health``, ``GET /stats``
+    - ``POST /universe``: load a universe (``symbols``, ``end_date`` and
+      optional ``start_date``, five years before ``end_date`` by default)
+    - ``POST /optimize/markowitz``: universe fields plus optional
+      ``target_return`` or ``points`` (efficient frontier)
+    - ``POST /optimize/black_litterman``: universe fields plus
+      ``market_caps``, ``P``, ``Q`` and optional ``omega``,
+      ``risk_aversion`` and ``tau``
+    - ``POST /optimize/mean_variance``: universe fields plus
+      ``risk_aversion`` (one per account) and optional ``lower`` and
+      ``upper``, solved with the warm factorization
+    """
+
+    def __init__(self, market_data=None, max_workers=None, max_queue=64, executor=None,
+                 latency_window=10000, max_universes=32):
+        """
+        Initialize the OptimizationService.
+
+        Parameters:
+        -----------
+        market_data : MarketData, optional
+            Source of prices (Yahoo Finance through a new cache if None)
+        max_workers : int, optional
+            Number of concurrent solves (defaults to the number of CPUs)
+        max_queue : int, optional
+            Number of solves that may wait for a worker before requests are
+            rejected
+        executor : concurrent.futures.Executor, optional
+            Executor for the solves (a process pool of ``max_workers`` is
+            created on start if None)
+        latency_window : int, optional
+            Number of recent requests per route kept for latency percentiles
+        max_universes : int, optional
+            Number of universes kept warm (least recently used are dropped)
+        """
+        self.market_data = market_data if market_data is not None else MarketData()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.executor = executor
+        self.latency_window = latency_window
+        self.max_universes = max_universes
+        self.address = None
+
+        self._owns_executor = executor is None
+        self._server = None
+        self._queue = None
+        self._dispatchers = []
+        self._universes = OrderedDict()  # (symbols, start, end) -> Future of Universe, LRU order
+        self._inflight = {}  # canonical request -> Future of the result
+        self._latencies = {}  # route -> deque of seconds
+        self._stats = {'requests': 0, 'solves': 0, 'coalesced': 0, 'rejected': 0, 'errors': 0,
+                       'universe_transfers': 0}
+
+        self._routes = {
+            ('GET', '/health'): self._health,
+            ('GET', '/stats'): self._stats_route,
+            ('POST', '/universe'): self._universe_route,
+            ('POST', '/optimize/markowitz'): self._markowitz,
+            ('POST', '/optimize/black_litterman'): self._black_litterman,
+            ('POST', '/optimize/mean_variance'): self._mean_variance,
+        }
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """
+        Start listening.
+
+        Parameters:
+        -----------
+        host : str, optional
+            Interface to bind (localhost by default)
+        port : int, optional
+            TCP port (0 picks a free one, see ``address``)
+        path : str, optional
+            Listen on this Unix socket instead of TCP
+        """
+        if self.executor is None:
+            # Forking a process that already runs the event loop and loader
+            # threads can deadlock the workers; start them from a clean server
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            context = multiprocessing.get_context(method)
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._dispatchers = [asyncio.create_task(self._dispatch_solves())
+                             for _ in range(self.max_workers)]
+
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=path)
+            self.address = path
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        return self
+
+    async def close(self):
+        """Stop listening, cancel queued solves and shut down the worker pool."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        if self._owns_executor and self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    async def serve_forever(self):
+        """Serve until cancelled."""
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    # ------------------------------------------------------------------
+    # Universes and solves
+
+    async def universe(self, symbols, start_date=None, end_date=None):
+        """
+        Load a universe, or return it if it is already warm or loading.
+
+        Parameters:
+        -----------
+        symbols : list of str
+            Ticker symbols
+        start_date : str, optional
+            First date in YYYY-MM-DD format (five years before ``end_date``
+            if None)
+        end_date : str
+            Last date in YYYY-MM-DD format. It is required: a default of
+            "today" would make cached universes go stale when the date
+            changes.
+
+        Returns:
+        --------
+        Universe
+        """
+        if not symbols or not isinstance(symbols, list):
+            raise ServiceError(400, "'symbols' must be a non-empty list")
+        if not end_date:
+            raise ServiceError(400, "Missing field 'end_date'")
+        if not start_date:
+            start_date = (pd.Timestamp(end_date) - pd.Timedelta(days=365 * 5)).strftime('%Y-%m-%d')
+        data_loader = DataLoader(symbols, start_date, end_date, market_data=self.market_data)
+        key = (tuple(data_loader.symbols), data_loader.start_date, data_loader.end_date)
+
+        future = self._universes.get(key)
+        if future is not None:
+            self._universes.move_to_end(key)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._universes[key] = future
+            while len(self._universes) > self.max_universes:
+                self._universes.popitem(last=False)
+            try:
+                universe = await asyncio.get_running_loop().run_in_executor(
+                    None, self._load_universe, data_loader)
+            except BaseException as error:
+                # Also on cancellation, so later requests do not wait forever
+                if self._universes.get(key) is future:
+                    del self._universes[key]
+                if isinstance(error, asyncio.CancelledError):
+                    future.set_exception(ServiceError(503, "Loading the universe was cancelled"))
+                else:
+                    future.set_exception(error)
+                # Mark the exception as retrieved when nobody else waits for it
+                future.exception()
+                raise
+            future.set_result(universe)
+        return await asyncio.shield(future)
+
+    @staticmethod
+    def _load_universe(data_loader):
+        data_loader.load_data()
+        return Universe(data_loader)
+
+    async def solve(self, key, func, *args, universe=None, in_process=False):
+        """
+        Run ``func(*args)`` on a worker, merging identical in-flight requests.
+
+        Parameters:
+        -----------
+        key : hashable
+            Canonical form of the request; requests with the same key that
+            arrive before the first one completes share its result
+        func : callable
+            Picklable module-level function
+        *args
+            Arguments of ``func``
+        universe : Universe, optional
+            Universe the solve uses. ``func`` is then called as
+            ``func(universe.token, None, *args)`` and, if the worker raises
+            ``_UniverseMissing``, again with the universe's statistics in
+            place of None.
+        in_process : bool, optional
+            Run ``func`` in a thread of this process instead of the worker
+            pool, for functions that use state kept in memory here
+
+        Returns:
+        --------
+        object
+            Result of ``func``
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            self._stats['coalesced'] += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((future, func, args, universe, in_process))
+        except asyncio.QueueFull:
+            self._stats['rejected'] += 1
+            raise ServiceError(503, "Too many pending solves, retry later")
+
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _dispatch_solves(self):
+        """Feed queued solves to the executor, one at a time per dispatcher."""
+        loop = asyncio.get_running_loop()
+        while True:
+            future, func, args, universe, in_process = await self._queue.get()
+            try:
+                executor = None if in_process else self.executor
+                if universe is None:
+                    result = await loop.run_in_executor(executor, func, *args)
+                else:
+                    try:
+                        result = await loop.run_in_executor(executor, func, universe.token, None, *args)
+                    except _UniverseMissing:
+                        self._stats['universe_transfers'] += 1
+                        statistics = (universe.expected_returns, universe.cov_matrix)
+                        result = await loop.run_in_executor(executor, func, universe.token,
+                                                            statistics, *args)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as error:
+                future.set_exception(error)
+                future.exception()
+            else:
+                self._stats['solves'] += 1
+                future.set_result(result)
+            finally:
+                self._queue.task_done()
+
+    # ------------------------------------------------------------------
+    # Routes
+
+    @staticmethod
+    def _request_key(route, payload):
+        return route, json.dumps(payload, sort_keys=True)
+
+    async def _health(self, payload):
+        return {'status': 'ok'}
+
+    async def _stats_route(self, payload):
+        return self.stats()
+
+    async def _universe_route(self, payload):
+        universe = await self.universe(payload.get('symbols'), payload.get('start_date'),
+                                       payload.get('end_date'))
+        return {'symbols': universe.symbols, 'n_assets': len(universe.symbols),
+                'start_date': universe.start_date, 'end_date': universe.end_date}
+
+    async def _markowitz(self, payload):
+        universe = await self.universe(payload.get('symbols'), payload.get('start_date'),
+                                       payload.get('end_date'))
+        return await self.solve(self._request_key('markowitz', payload), _solve_markowitz,
+                                payload.get('target_return'), payload.get('points'), universe=universe)
+
+    async def _black_litterman(self, payload):
+        universe = await self.universe(payload.get('symbols'), payload.get('start_date'),
+                                       payload.get('end_date'))
+        try:
+            market_caps = np.asarray(payload['market_caps'], dtype=float)
+            P = np.atleast_2d(np.asarray(payload['P'], dtype=float))
+            Q = np.asarray(payload['Q'], dtype=float)
+        except KeyError as error:
+            raise ServiceError(400, f"Missing field {error}")
+        omega = payload.get('omega')
+        if omega is not None:
+            omega = np.asarray(omega, dtype=float)
+        if len(market_caps) != len(universe.symbols) or P.shape[1] != len(universe.symbols):
+            raise ServiceError(400, "'market_caps' and 'P' must have one entry per symbol")
+
+        return await self.solve(self._request_key('black_litterman', payload), _solve_black_litterman,
+                                market_caps, payload.get('risk_aversion', 2.5), P, Q, omega,
+                                payload.get('tau', 0.025), universe=universe)
+
+    async def _mean_variance(self, payload):
+        universe = await self.universe(payload.get('symbols'), payload.get('start_date'),
+                                       payload.get('end_date'))
+        if 'risk_aversion' not in payload:
+            raise ServiceError(400, "Missing field 'risk_aversion'")
+        return await self.solve(self._request_key('mean_variance', payload), _solve_mean_variance,
+                                universe.batch_optimizer, payload['risk_aversion'],
+                                payload.get('lower', 0.0), payload.get('upper', 1.0),
+                                in_process=True)
+
+    # ------------------------------------------------------------------
+    # Statistics
+
+    def _record_latency(self, route, seconds):
+        latencies = self._latencies.get(route)
+        if latencies is None:
+            latencies = self._latencies[route] = deque(maxlen=self.latency_window)
+        latencies.append(seconds)
+
+    def stats(self):
+        """
+        Service statistics.
+
+        Returns:
+        --------
+        dict
+            Request, solve, coalesced, rejected and error counts, the number
+            of times universe statistics were sent to a worker, queue depth,
+            in-flight solves, warm universes, the ``MarketData`` cache info and,
+            per route, the latency percentiles (milliseconds) of recent requests
+        """
+        latency = {}
+        for route, values in self._latencies.items():
+            p50, p90, p99 = np.percentile(np.asarray(values) * 1e3, [50, 90, 99])
+            latency[route] = {'count': len(values), 'p50': p50, 'p90': p90, 'p99': p99,
+                              'max': max(values) * 1e3}
+
+        info = dict(self._stats)
+        info.update({
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'in_flight': len(self._inflight),
+            'universes': sum(future.done() for future in self._universes.values()),
+            'market_data': self.market_data.cache_info(),
+            'latency_ms': latency,
+        })
+        return _jsonable(info)
+
+    # ------------------------------------------------------------------
+    # HTTP
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except ServiceError as error:
+                    await _write_response(writer, error.status, {'error': str(error)}, False)
+                    break
+                if request is None:
+                    break
+
+                method, path, headers, body = request
+                start = time.perf_counter()
+                status, payload = await self._respond(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await _write_response(writer, status, payload, keep_alive)
+                route = path if any(path == route_path for _, route_path in self._routes) else 'unmatched'
+                self._record_latency(route, time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method, path, body):
+        """Route one request and return its status and JSON payload."""
+        self._stats['requests'] += 1
+        handler = self._routes.get((method, path))
+        try:
+            if handler is None:
+                if any(route_path == path for _, route_path in self._routes):
+                    raise ServiceError(405, f"{method} not allowed on {path}")
+                raise ServiceError(404, f"Unknown route {path}")
+            try:
+                payload = json.loads(body) if body else {}
+            except ValueError:
+                raise ServiceError(400, "Body is not valid JSON")
+            if not isinstance(payload, dict):
+                raise ServiceError(400, "Body must be a JSON object")
+            return 200, await handler(payload)
+        except ServiceError as error:
+            if error.status != 503:
+                self._stats['errors'] += 1
+            return error.status, {'error': str(error)}
+        except (KeyError, ValueError, TypeError) as error:
+            self._stats['errors'] += 1
+            return 400, {'error': str(error)}
+        except Exception as error:
+            self._stats['errors'] += 1
+            return 500, {'error': f"{type(error).__name__}: {error}"}
+
+
+async def _read_request(reader):
+    """Read one HTTP/1.1 request; None when the client closed the connection."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode('latin-1').split()
+    except ValueError:
+        raise ServiceError(400, "Malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0) or 0)
+    except ValueError:
+        raise ServiceError(400, "Invalid Content-Length")
+    if length < 0:
+        raise ServiceError(400, "Invalid Content-Length")
+    if length > _MAX_BODY:
+        raise ServiceError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target.split('?', 1)[0], headers, body
+
+
+async def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode()
+    headers = [
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    if status == 503:
+        headers.append("Retry-After: 1")
+    writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body)
+    await writer.drain()
+
+
+async def serve(host='127.0.0.1', port=8765, path=None, **kwargs):
+    """
+    Run an ``OptimizationService`` until cancelled.
+
+    Parameters:
+    -----------
+    host : str, optional
+        Interface to bind
+    port : int, optional
+        TCP port
+    path : str, optional
+        Listen on this Unix socket instead of TCP
+    **kwargs
+        Passed to ``OptimizationService``
+    """
+    service = OptimizationService(**kwargs)
+    await service.start(host=host, port=port, path=path)
+    await service.serve_forever()
@@ -11,6 +11,13 @@ class Config:
     BLACK_LITTERMAN_TAU = 0.05  # Tau parameter for Black-Litterman model
     BLACK_LITTERMAN_P = None  # Views matrix for Black-Litterman model
     BLACK_LITTERMAN_Q = None  # View returns for Black-Litterman model
+    PROFILING_ENABLED = False  # Record stage timings and solver statistics
+    PROFILING_REPORT = "profiling_report.json"  # Where the CLI writes the timing report
+    PRECISION = "float64"  # Storage of return panels and scenarios: "float64" or "float32"
+    SERVICE_HOST = "127.0.0.1"  # Interface the optimization service binds to
+    SERVICE_PORT = 8765  # TCP port of the optimization service
+    SERVICE_MAX_QUEUE = 64  # Pending solves before the service answers 503
+    SERVICE_MAX_UNIVERSES = 32  # Universes the service keeps warm
 
 def get_config():
     return Config()
\ No newline at end of file
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+
+_DTYPES = {'float64': np.float64, 'float32': np.float32}
+
+
+def storage_dtype(precision=None):
+    """
+    dtype used to store return panels and simulated scenarios.
+
+    Statistics and optimizer internals are always accumulated in float64;
+    'float32' only halves the memory and bandwidth of the stored panels.
+
+    Parameters:
+    -----------
+    precision : str, optional
+        'float64' or 'float32' (``Config.PRECISION`` if None)
+
+    Returns:
+    --------
+    numpy.dtype
+    """
+    if precision is None:
+        precision = get_config().PRECISION
+    try:
+        return np.dtype(_DTYPES[precision])
+    except KeyError:
+        raise ValueError(f"precision must be one of {sorted(_DTYPES)}, got {precision!r}")
+
+
+def as_float64(values):
+    """
+    Return ``values`` in float64, without copying if they already are.
+
+    pandas objects stay pandas objects; anything else becomes an ndarray.
+    """
+    if isinstance(values, pd.Series):
+        return values if values.dtype == np.float64 else values.astype(np.float64)
+    if isinstance(values, pd.DataFrame):
+        return values if (values.dtypes == np.float64).all() else values.astype(np.float64)
+    return np.asarray(values, dtype=np.float64)
@@ -0,0 +1,204 @@
+import functools
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+from .config import get_config
+
+_NULL_STAGE = nullcontext()
+
+
+class _CountingFunction:
+    """Callable wrapper that counts how often a function is evaluated."""
+
+    def __init__(self, func):
+        self.func = func
+        self.calls = 0
+        functools.update_wrapper(self, func)
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self.func(*args, **kwargs)
+
+
+class Profiler:
+    """
+    Collects stage timings and solver statistics for one run.
+
+    When disabled, ``stage`` returns a shared no-op context manager and the
+    other hooks return immediately, so instrumented code pays only an
+    attribute lookup.
+    """
+
+    def __init__(self, enabled=False):
+        """
+        Initialize the Profiler.
+
+        Parameters:
+        -----------
+        enabled : bool, optional
+            Whether timings are recorded
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Discard all recorded data and start a new run."""
+        with self._lock:
+            self.run_id = uuid.uuid4().hex
+            self.started = datetime.now().isoformat(timespec='seconds')
+            self._stages = {}
+            self._solvers = {}
+
+    def stage(self, name):
+        """
+        Context manager timing a named stage.
+
+        Parameters:
+        -----------
+        name : str
+            Stage name, e.g. 'data.load'
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_timing(name, time.perf_counter() - start)
+
+    def add_timing(self, name, seconds):
+        """Record one execution of a stage that took ``seconds``."""
+        if not self.enabled:
+            return
+        with self._lock:
+            stage = self._stages.setdefault(name, {'calls': 0, 'total': 0.0, 'max': 0.0})
+            stage['calls'] += 1
+            stage['total'] += seconds
+            stage['max'] = max(stage['max'], seconds)
+
+    def count_constraints(self, constraints):
+        """
+        Wrap scipy constraint functions so their evaluations are counted.
+
+        Parameters:
+        -----------
+        constraints : list of dict
+            Constraints in ``scipy.optimize.minimize`` format
+
+        Returns:
+        --------
+        list of dict
+            The constraints unchanged when disabled, otherwise copies whose
+            ``fun`` counts its calls
+        """
+        if not self.enabled:
+            return constraints
+        return [dict(c, fun=_CountingFunction(c['fun'])) for c in constraints]
+
+    def record_solver(self, name, result, constraints=()):
+        """
+        Record the statistics of a ``scipy.optimize`` result.
+
+        Parameters:
+        -----------
+        name : str
+            Solver call site, e.g. 'markowitz.minimize_volatility'
+        result : scipy.optimize.OptimizeResult
+            Result returned by the solver
+        constraints : list of dict, optional
+            Constraints returned by ``count_constraints``
+        """
+        if not self.enabled:
+            return
+        constraint_evaluations = sum(c['fun'].calls for c in constraints
+                                     if isinstance(c['fun'], _CountingFunction))
+        with self._lock:
+            solver = self._solvers.setdefault(name, {
+                'calls': 0, 'failures': 0, 'nit': 0, 'nfev': 0, 'njev': 0,
+                'constraint_evaluations': 0,
+            })
+            solver['calls'] += 1
+            solver['failures'] += 0 if result.get('success', True) else 1
+            solver['nit'] += int(result.get('nit', 0))
+            solver['nfev'] += int(result.get('nfev', 0))
+            solver['njev'] += int(result.get('njev', 0))
+            solver['constraint_evaluations'] += constraint_evaluations
+
+    def report(self):
+        """
+        Timing report of the current run.
+
+        Returns:
+        --------
+        dict
+            Run metadata, per-stage call counts and times (seconds), and
+            per-solver iteration and evaluation counts
+        """
+        with self._lock:
+            stages = {name: dict(stats, mean=stats['total'] / stats['calls'])
+                      for name, stats in self._stages.items()}
+            return {
+                'run_id': self.run_id,
+                'started': self.started,
+                'stages': stages,
+                'solvers': {name: dict(stats) for name, stats in self._solvers.items()},
+            }
+
+    def export_json(self, filename):
+        """Write the timing report of the current run to a JSON file."""
+        with open(filename, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+
+_profiler = Profiler(enabled=get_config().PROFILING_ENABLED)
+
+
+def get_profiler():
+    """Return the process-wide profiler."""
+    return _profiler
+
+
+def enable_profiling(reset=True):
+    """Turn on the process-wide profiler, optionally starting a new run."""
+    if reset:
+        _profiler.reset()
+    _profiler.enabled = True
+    return _profiler
+
+
+def disable_profiling():
+    """Turn off the process-wide profiler."""
+    _profiler.enabled = False
+    return _profiler
+
+
+def profiled(name):
+    """
+    Decorator timing every call of a function as the stage ``name``.
+
+    Parameters:
+    -----------
+    name : str
+        Stage name
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _profiler.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _profiler.add_timing(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
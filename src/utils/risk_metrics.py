@@ -17,8 +17,8 @@ def calculate_sharpe_ratio(returns, risk_free_rate=0.0):
     float
         Sharpe ratio
     """
-    expected_return = np.mean(returns)
-    volatility = np.std(returns)
+    expected_return = np.mean(returns, dtype=np.float64)
+    volatility = np.std(returns, dtype=np.float64)
     
     return (expected_return - risk_free_rate) / volatility
 
@@ -38,9 +38,9 @@ def calculate_sortino_ratio(returns, risk_free_rate=0.0):
     float
         Sortino ratio
     """
-    expected_return = np.mean(returns)
+    expected_return = np.mean(returns, dtype=np.float64)
     negative_returns = returns[returns < 0]
-    downside_deviation = np.std(negative_returns) if len(negative_returns) > 0 else 0
+    downside_deviation = np.std(negative_returns, dtype=np.float64) if len(negative_returns) > 0 else 0
     
     return (expected_return - risk_free_rate) / downside_deviation if downside_deviation != 0 else float('inf')
 
@@ -59,7 +59,8 @@ def calculate_maximum_drawdown(returns):
         Maximum drawdown
     """
     # Convert returns to cumulative returns
-    cum_returns = (1 + pd.Series(returns)).cumprod()
+    # Compound in float64: float32 errors would accumulate along the series
+    cum_returns = (1 + pd.Series(returns, dtype=np.float64)).cumprod()
     
     # Calculate running maximum
     running_max = cum_returns.cummax()
@@ -107,4 +108,4 @@ def calculate_cvar(returns, confidence=0.05):
         Conditional Value at Risk
     """
     var = calculate_var(returns, confidence)
-    return np.mean(returns[returns <= var])
\ No newline at end of file
+    return np.mean(returns[returns <= var], dtype=np.float64)
\ No newline at end of file
@@ -1,9 +1,9 @@
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.cm as cm
-from matplotlib.ticker import FuncFormatter
 
+from ..utils.profiling import profiled
+
+@profiled('visualization.plot_efficient_frontier')
 def plot_efficient_frontier(efficient_frontier, min_vol_portfolio=None, max_sharpe_portfolio=None, 
                            title='Efficient Frontier', filename=None, show_assets=False, 
                            asset_returns=None, asset_volatilities=None, asset_names=None):
@@ -31,6 +31,9 @@ def plot_efficient_frontier(efficient_frontier, min_vol_portfolio=None, max_shar
     asset_names : list, optional
         Names of individual assets
     """
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import FuncFormatter
+    
     plt.figure(figsize=(12, 8))
     
     # Format the axes
@@ -79,6 +82,7 @@ def plot_efficient_frontier(efficient_frontier, min_vol_portfolio=None, max_shar
     plt.tight_layout()
     plt.show()
 
+@profiled('visualization.plot_portfolio_weights')
 def plot_portfolio_weights(weights, title='Portfolio Weights', filename=None, sort=True):
     """
     Plot a bar chart of portfolio weights.
@@ -94,6 +98,10 @@ def plot_portfolio_weights(weights, title='Portfolio Weights', filename=None, so
     sort : bool, optional
         Whether to sort weights by value
     """
+    import matplotlib.cm as cm
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import FuncFormatter
+    
     if isinstance(weights, dict):
         weights = pd.Series(weights)
     
@@ -1,6 +1,9 @@
-from matplotlib import pyplot as plt
+from ..utils.profiling import profiled
 
+@profiled('visualization.plot_performance_charts')
 def plot_performance_charts(portfolio_returns, benchmark_returns, title='Portfolio Performance'):
+    from matplotlib import pyplot as plt
+    
     plt.figure(figsize=(10, 6))
     
     plt.plot(portfolio_returns, label='Portfolio Returns', color='blue')
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.alignment import (align_prices, align_series, forward_fill, listing_mask,
+                                pairwise_returns, union_calendar)
+from src.data.data_loader import DataLoader
+from src.data.synthetic import generate_returns
+
+
+def _mixed_calendar_prices(seed=0):
+    """Prices of three assets with different holidays, a late listing and a delisting."""
+    returns = generate_returns(n_assets=3, n_days=400, seed=seed)
+    prices = 100 * (1 + returns).cumprod()
+    rng = np.random.default_rng(seed)
+    series = {}
+    for name in prices.columns:
+        holidays = rng.random(len(prices)) < 0.04
+        series[name] = prices[name][~holidays]
+    series[prices.columns[1]] = series[prices.columns[1]].iloc[120:]
+    series[prices.columns[2]] = series[prices.columns[2]].iloc[:300]
+    return series
+
+
+def test_union_calendar():
+    a = pd.DatetimeIndex(['2021-01-05', '2021-01-04'])
+    b = pd.DatetimeIndex(['2021-01-06', '2021-01-04'])
+    calendar = union_calendar([a, b])
+    assert list(calendar) == list(pd.DatetimeIndex(['2021-01-04', '2021-01-05', '2021-01-06']))
+    assert len(union_calendar([])) == 0
+
+
+def test_align_series_matches_pandas():
+    series = _mixed_calendar_prices()
+    aligned = align_series(series)
+    pd.testing.assert_frame_equal(aligned, pd.DataFrame(series), check_freq=False)
+
+    calendar = aligned.index[10:50]
+    subset = align_series(series, calendar=calendar)
+    pd.testing.assert_frame_equal(subset, pd.DataFrame(series).reindex(calendar), check_freq=False)
+
+
+@pytest.mark.parametrize('limit', [None, 0, 1, 3])
+def test_forward_fill_matches_pandas(limit):
+    values = np.array([[np.nan, 1.0], [2.0, np.nan], [np.nan, np.nan],
+                       [np.nan, 4.0], [5.0, np.nan], [np.nan, np.nan]])
+    expected = pd.DataFrame(values).ffill(limit=limit if limit else None)
+    if limit == 0:
+        expected = pd.DataFrame(values)
+    assert np.array_equal(forward_fill(values, limit), expected.to_numpy(), equal_nan=True)
+
+
+def test_align_prices_keeps_listing_window():
+    values = np.array([[np.nan, 1.0], [2.0, np.nan], [np.nan, np.nan],
+                       [3.0, 4.0], [np.nan, np.nan], [np.nan, np.nan]])
+    assert listing_mask(values)[:, 0].tolist() == [False, True, True, True, False, False]
+
+    aligned = align_prices(values, fill_limit=1)
+    # Gap of two rows: only the first is filled; nothing after the last price
+    assert np.array_equal(aligned[:, 0], [np.nan, 2.0, 2.0, 3.0, np.nan, np.nan], equal_nan=True)
+    assert np.array_equal(aligned[:, 1], [1.0, 1.0, np.nan, 4.0, np.nan, np.nan], equal_nan=True)
+
+
+def test_pairwise_returns():
+    prices = pd.DataFrame({'A': [1.0, 1.1, np.nan, 1.21], 'B': [2.0, 2.2, 2.42, np.nan]},
+                          index=pd.date_range('2021-01-01', periods=4))
+    returns = pairwise_returns(prices)
+    assert list(returns.index) == list(prices.index[1:])
+    assert np.allclose(returns['A'], [0.1, np.nan, np.nan], equal_nan=True)
+    assert np.allclose(returns['B'], [0.1, 0.1, np.nan], equal_nan=True)
+
+
+def test_data_loader_pairwise_uses_all_history():
+    prices = align_series(_mixed_calendar_prices(seed=1))
+    drop = DataLoader(list(prices.columns))
+    pairwise = DataLoader(list(prices.columns), missing='pairwise', fill_limit=2)
+    drop.data = pairwise.data = prices
+
+    dropped = drop.calculate_returns()
+    kept = pairwise.calculate_returns()
+    assert len(kept) > 2 * len(dropped)
+
+    expected = pairwise_returns(align_prices(prices, fill_limit=2))
+    assert np.allclose(pairwise.get_covariance_matrix(), expected.cov() * 252)
+    assert np.allclose(pairwise.get_annualized_returns(), expected.mean() * 252)
+    assert not pairwise.get_covariance_matrix().isna().any().any()
+
+    with pytest.raises(ValueError):
+        DataLoader(['A'], missing='fill')
+
+
+def test_non_overlapping_histories_raise():
+    prices = align_series(_mixed_calendar_prices(seed=2))
+    # Delist C before B is listed
+    prices.iloc[100:, 2] = np.nan
+    loader = DataLoader(list(prices.columns), missing='pairwise')
+    loader.data = prices
+
+    with pytest.raises(ValueError, match='overlapping'):
+        loader.get_covariance_matrix()
+
+    # B and C share fewer than 180 returns
+    loader.data = align_series(_mixed_calendar_prices(seed=2))
+    assert np.isfinite(loader.get_covariance_matrix().to_numpy()).all()
+    with pytest.raises(ValueError, match='overlapping'):
+        loader.get_covariance_matrix(min_periods=200)
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.synthetic import generate_returns
+from src.optimization.batch import BatchOptimizer
+
+
+@pytest.fixture
+def universe():
+    returns = generate_returns(n_assets=6, n_days=750, seed=11)
+    return returns.mean() * 252, returns.cov() * 252
+
+
+def test_closed_form_matches_kkt_solution(universe):
+    """Accounts that respect their bounds are solved exactly in closed form."""
+    expected_returns, cov_matrix = universe
+    optimizer = BatchOptimizer(expected_returns, cov_matrix)
+    risk_aversion = np.array([20.0, 50.0, 100.0])
+    holdings = np.random.default_rng(0).dirichlet(np.ones(6), size=3)
+    penalty = np.array([0.0, 1.0, 5.0])
+
+    result = optimizer.solve(risk_aversion, lower=-10, upper=10, holdings=holdings,
+                             turnover_penalty=penalty)
+
+    assert (result['diagnostics']['method'] == 'closed_form').all()
+    for k in range(3):
+        # Stationarity of the Lagrangian plus the budget constraint
+        kkt = np.zeros((7, 7))
+        kkt[:6, :6] = risk_aversion[k] * cov_matrix.values + penalty[k] * np.eye(6)
+        kkt[:6, 6] = kkt[6, :6] = 1.0
+        rhs = np.append(expected_returns.values + penalty[k] * holdings[k], 1.0)
+        assert np.allclose(result['weights'].values[k], np.linalg.solve(kkt, rhs)[:6])
+
+    # Diagnostics report the penalized objective that was maximized
+    w = result['weights'].values
+    deviations = w - holdings
+    objective = (w @ expected_returns.values - 0.5 * risk_aversion * np.einsum('ki,ij,kj->k', w, cov_matrix.values, w)
+                 - 0.5 * penalty * (deviations ** 2).sum(axis=1))
+    assert np.allclose(result['diagnostics']['utility'], objective)
+    assert np.allclose(result['diagnostics']['turnover'], np.abs(deviations).sum(axis=1))
+
+
+def test_bounded_accounts_use_slsqp(universe):
+    """Accounts whose optimum violates their bounds are solved numerically."""
+    expected_returns, cov_matrix = universe
+    optimizer = BatchOptimizer(expected_returns, cov_matrix)
+    upper = np.full((4, 6), 1.0)
+    upper[2] = 0.25
+
+    result = optimizer.solve([1.0, 2.0, 3.0, 200.0], lower=0.0, upper=upper,
+                             account_ids=['a', 'b', 'c', 'd'], n_jobs=1, chunk_size=2)
+    weights, diagnostics = result['weights'], result['diagnostics']
+
+    assert list(weights.index) == ['a', 'b', 'c', 'd']
+    assert list(weights.columns) == list(expected_returns.index)
+    assert np.allclose(weights.sum(axis=1), 1.0)
+    assert (weights.values > -1e-8).all()
+    assert (weights.loc['c'] <= 0.25 + 1e-8).all()
+    assert diagnostics.loc['a', 'method'] == 'slsqp'
+    assert diagnostics['success'].all()
+    # Without holdings there is no turnover to report
+    assert diagnostics['turnover'].isna().all()
+
+
+def test_process_pool_matches_serial(universe):
+    """Chunking over worker processes gives the serial solution."""
+    expected_returns, cov_matrix = universe
+    optimizer = BatchOptimizer(expected_returns, cov_matrix)
+    risk_aversion = np.linspace(0.5, 5, 6)
+
+    serial = optimizer.solve(risk_aversion, n_jobs=1)['weights']
+    parallel = optimizer.solve(risk_aversion, n_jobs=2, chunk_size=2)['weights']
+
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_invalid_bounds(universe):
+    """Bounds that cannot sum to one are rejected."""
+    optimizer = BatchOptimizer(*universe)
+    with pytest.raises(ValueError):
+        optimizer.solve([1.0], upper=0.1)
@@ -1,20 +1,75 @@
 import unittest
+import numpy as np
+from src.data.synthetic import generate_market_caps, generate_returns
 from src.optimization.black_litterman import BlackLittermanModel
 
 class TestBlackLittermanModel(unittest.TestCase):
 
     def setUp(self):
-        self.model = BlackLittermanModel()
+        returns = generate_returns(n_assets=4, n_days=756, seed=7)
+        self.cov_matrix = returns.cov() * 252
+        self.model = BlackLittermanModel(
+            market_caps=generate_market_caps(4, seed=7),
+            risk_aversion=2.5,
+            cov_matrix=self.cov_matrix
+        )
+        self.P = np.array([[1.0, -1.0, 0.0, 0.0],
+                           [0.0, 0.0, 1.0, 0.0]])
+        self.Q = np.array([0.02, 0.10])
 
     def test_adjust_views(self):
-        views = {'AAPL': 0.05, 'GOOGL': 0.03}
-        adjusted_views = self.model.adjust_views(views)
+        adjusted_views = self.model.adjust_views(self.P, self.Q)
         self.assertIsInstance(adjusted_views, dict)
+        self.assertAlmostEqual(np.sum(adjusted_views['weights']), 1.0, places=6)
+        self.assertGreater(adjusted_views['volatility'], 0)
 
-    def test_calculate_weights(self):
-        expected_weights = self.model.calculate_weights()
-        self.assertGreaterEqual(sum(expected_weights.values()), 0.99)
-        self.assertLessEqual(sum(expected_weights.values()), 1.01)
+    def test_posterior_moves_towards_views(self):
+        posterior = np.asarray(self.model.incorporate_views(self.P, self.Q))
+        prior = np.asarray(self.model.equil_returns)
+        prior_spread = prior[0] - prior[1]
+        posterior_spread = posterior[0] - posterior[1]
+        self.assertLess(abs(posterior_spread - 0.02), abs(prior_spread - 0.02))
+
+    def test_equilibrium_returns_imply_market_weights(self):
+        weights = np.linalg.solve(2.5 * self.cov_matrix.values, self.model.equil_returns)
+        self.assertTrue(np.allclose(weights, self.model.weights_market))
+
+    def test_posterior_matches_textbook_formula(self):
+        omega = np.diag([0.001, 0.004])
+        tau_sigma = self.model.tau * self.cov_matrix.values
+        pi = self.model.equil_returns
+        expected = np.linalg.inv(np.linalg.inv(tau_sigma) + self.P.T @ np.linalg.inv(omega) @ self.P) @ (
+            np.linalg.inv(tau_sigma) @ pi + self.P.T @ np.linalg.inv(omega) @ self.Q)
+        posterior = self.model.incorporate_views(self.P, self.Q, omega)
+        self.assertTrue(np.allclose(posterior, expected))
+
+    def test_full_confidence_views_hold_exactly(self):
+        posterior = self.model.incorporate_views(self.P, self.Q, confidences=1.0)
+        self.assertTrue(np.allclose(self.P @ posterior, self.Q))
+
+    def test_idzorek_tilt_matches_confidence(self):
+        """Each view alone tilts the unconstrained weights by its confidence times the 100% tilt."""
+        confidences = np.array([0.25, 0.8])
+        omega = self.model.idzorek_omega(self.P, confidences)
+        self.assertTrue(np.allclose(omega, np.diag(np.diag(omega))))
+
+        cov = self.cov_matrix.values
+        market = np.linalg.solve(2.5 * cov, self.model.equil_returns)
+        for k, confidence in enumerate(confidences):
+            view = self.P[k:k + 1]
+            partial = self.model.incorporate_views(view, self.Q[k:k + 1], omega[k:k + 1, k:k + 1])
+            certain = self.model.incorporate_views(view, self.Q[k:k + 1], confidences=1.0)
+            tilt = np.linalg.solve(2.5 * cov, partial) - market
+            full_tilt = np.linalg.solve(2.5 * cov, certain) - market
+            self.assertTrue(np.allclose(tilt, confidence * full_tilt))
+
+    def test_confidences_validation(self):
+        with self.assertRaises(ValueError):
+            self.model.incorporate_views(self.P, self.Q, confidences=[0.5, 0.0])
+        with self.assertRaises(ValueError):
+            self.model.incorporate_views(self.P, self.Q, omega=np.eye(2), confidences=0.5)
+        result = self.model.adjust_views(self.P, self.Q, confidences=[0.5, 0.9])
+        self.assertAlmostEqual(np.sum(result['weights']), 1.0, places=6)
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
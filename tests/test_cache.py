@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.synthetic import generate_market_caps, generate_returns
+from src.optimization.black_litterman import BlackLittermanModel
+from src.optimization.cache import SolutionCache, hash_problem, problem_features
+from src.optimization.markowitz import MarkowitzOptimizer
+
+
+@pytest.fixture
+def moments():
+    returns = generate_returns(n_assets=6, n_days=750, seed=5)
+    return returns.mean() * 252, returns.cov() * 252
+
+
+def test_hash_problem(moments):
+    """Keys change with the method, parameters and array shapes."""
+    mu, cov = moments
+    assert hash_problem(mu, cov, method='a') != hash_problem(mu, cov, method='b')
+    assert hash_problem(mu, cov, target=0.1) != hash_problem(mu, cov, target=0.11)
+    # Same bytes, different shape
+    assert hash_problem(np.zeros(4)) != hash_problem(np.zeros((2, 2)))
+
+
+def test_hits_come_back_with_the_callers_labels(moments):
+    """Cache hits are formatted with the caller's asset labels and container type."""
+    mu, cov = moments
+    cache = SolutionCache()
+    first = MarkowitzOptimizer(mu, cov, cache=cache).minimize_volatility()
+
+    names = [f'X{i}' for i in range(len(mu))]
+    relabelled = MarkowitzOptimizer(pd.Series(mu.values, index=names),
+                                    pd.DataFrame(cov.values, index=names, columns=names),
+                                    cache=cache).minimize_volatility()
+    plain = MarkowitzOptimizer(mu.values, cov.values, cache=cache).minimize_volatility()
+
+    assert cache.stats()['hits'] == 2
+    assert list(relabelled['weights'].index) == names
+    assert isinstance(plain['weights'], np.ndarray)
+    assert np.allclose(relabelled['weights'], first['weights'])
+    assert np.allclose(plain['weights'], first['weights'])
+
+    P, Q = np.eye(len(mu))[:1], np.array([0.05])
+    caps = np.ones(len(mu))
+    BlackLittermanModel(caps, 2.5, cov, cache=cache).adjust_views(P, Q)
+    labelled = BlackLittermanModel(caps, 2.5, pd.DataFrame(cov.values, index=names, columns=names),
+                                   cache=cache).adjust_views(P, Q)
+    bare = BlackLittermanModel(caps, 2.5, cov.values, cache=cache).adjust_views(P, Q)
+    assert cache.stats()['hits'] == 4
+    assert list(labelled['weights'].index) == names
+    assert isinstance(bare['weights'], np.ndarray)
+
+
+def test_memory_lru_eviction():
+    """The least recently used entry is evicted from memory first."""
+    cache = SolutionCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['entries'] == 2
+    assert stats['hits'] == 3 and stats['misses'] == 1
+
+
+def test_get_returns_a_copy():
+    """Mutating a returned solution does not change the cached one."""
+    cache = SolutionCache()
+    cache.put('a', {'weights': np.array([0.5, 0.5])})
+    cache.get('a')['weights'][0] = 1.0
+    assert cache.get('a')['weights'][0] == 0.5
+
+
+def test_disk_tier_persists_and_evicts(tmp_path):
+    """Solutions survive in the disk tier, which is bounded by size."""
+    cache = SolutionCache(max_entries=1, directory=str(tmp_path))
+    cache.put('a', np.arange(10.0))
+    cache.put('b', np.arange(5.0))
+
+    # 'a' left memory but is still on disk, also for a new process
+    reopened = SolutionCache(directory=str(tmp_path))
+    assert np.array_equal(reopened.get('a'), np.arange(10.0))
+    assert reopened.stats()['disk_hits'] == 1
+    assert reopened.stats()['disk_entries'] == 2
+
+    # Least recently used files are evicted first
+    os.utime(tmp_path / 'b.pkl', (1, 1))
+    os.utime(tmp_path / 'a.pkl', (2, 2))
+    size = reopened.stats()['disk_bytes']
+    small = SolutionCache(directory=str(tmp_path), max_disk_bytes=size)
+    small.put('c', np.arange(5.0))
+    stats = small.stats()
+    assert stats['disk_evictions'] >= 1
+    assert stats['disk_bytes'] <= size
+    assert not (tmp_path / 'b.pkl').exists()
+
+    small.clear()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_warm_start_uses_nearest_problem(moments):
+    """Warm starts come from the closest cached problem within the tolerance."""
+    mu, cov = moments
+    cache = SolutionCache(warm_start_tolerance=0.05)
+    features = problem_features(mu, cov)
+    cache.put('a', None, kind='k', features=features, weights=np.full(6, 1 / 6))
+    cache.put('b', None, kind='k', features=features * 1.01, weights=np.arange(6.0))
+
+    assert np.array_equal(cache.warm_start('k', features * 1.009), np.arange(6.0))
+    assert cache.warm_start('other', features) is None
+    assert cache.warm_start('k', features * 2) is None
+    assert cache.stats()['warm_starts'] == 1
+
+
+def test_markowitz_uses_cache(moments):
+    """Repeated Markowitz problems are served from the cache."""
+    mu, cov = moments
+    cache = SolutionCache()
+    first = MarkowitzOptimizer(mu, cov, cache=cache).minimize_volatility()
+    second = MarkowitzOptimizer(mu.copy(), cov.copy(), cache=cache).minimize_volatility()
+
+    pd.testing.assert_series_equal(first['weights'], second['weights'])
+    assert cache.stats()['hits'] == 1
+
+    frontier = MarkowitzOptimizer(mu, cov, cache=cache).efficient_frontier(points=4)
+    again = MarkowitzOptimizer(mu, cov, cache=cache).efficient_frontier(points=4)
+    pd.testing.assert_frame_equal(frontier, again)
+
+
+def test_markowitz_warm_start_on_perturbed_inputs(moments):
+    """A slightly different problem is warm-started and reaches the same optimum."""
+    mu, cov = moments
+    cache = SolutionCache()
+    MarkowitzOptimizer(mu, cov, cache=cache).minimize_volatility()
+
+    perturbed = MarkowitzOptimizer(mu * 1.001, cov * 1.001, cache=cache)
+    result = perturbed.minimize_volatility()
+    reference = MarkowitzOptimizer(mu * 1.001, cov * 1.001).minimize_volatility()
+
+    assert cache.stats()['warm_starts'] == 1
+    assert result['volatility'] == pytest.approx(reference['volatility'], rel=1e-4)
+
+
+def test_black_litterman_uses_cache():
+    """Black-Litterman solves are cached and warm-started."""
+    returns = generate_returns(n_assets=4, n_days=756, seed=7)
+    cache = SolutionCache()
+    P = np.array([[1.0, -1.0, 0.0, 0.0]])
+    Q = np.array([0.02])
+
+    def model():
+        return BlackLittermanModel(generate_market_caps(4, seed=7), 2.5, returns.cov() * 252, cache=cache)
+
+    first = model().adjust_views(P, Q)
+    second = model().adjust_views(P, Q)
+    assert np.allclose(first['weights'], second['weights'])
+    assert cache.stats()['hits'] == 1
+
+    model().adjust_views(P, Q * 1.01)
+    assert cache.stats()['warm_starts'] == 1
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pickle
+import sys
+import os
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.covariance import CovarianceAccumulator, blocked_covariance, iter_blocks, nearest_psd
+
+
+def _sample_returns(n_days=500, n_assets=6, seed=0):
+    rng = np.random.default_rng(seed)
+    data = rng.normal(0.0005, 0.02, size=(n_days, n_assets)) + 5.0
+    return pd.DataFrame(data, columns=[f'A{i}' for i in range(n_assets)])
+
+
+def test_blocked_covariance_matches_pandas():
+    """Accumulating over blocks gives the same result as DataFrame.cov."""
+    returns = _sample_returns()
+    cov = blocked_covariance(iter_blocks(returns, 37))
+
+    pd.testing.assert_frame_equal(cov, returns.cov(), rtol=1e-10, atol=1e-14)
+
+
+def test_pairwise_missing_data_matches_pandas():
+    """Missing values are handled pairwise, as in pandas."""
+    returns = _sample_returns()
+    rng = np.random.default_rng(1)
+    returns = returns.mask(rng.random(returns.shape) < 0.2)
+    returns.iloc[:120, 2] = np.nan  # late listing
+
+    accumulator = CovarianceAccumulator()
+    for block in iter_blocks(returns, 50):
+        accumulator.update(block)
+
+    pd.testing.assert_frame_equal(accumulator.covariance(), returns.cov(), rtol=1e-10, atol=1e-14)
+    pd.testing.assert_series_equal(accumulator.means(), returns.mean(), rtol=1e-12)
+
+
+def test_merge_partial_accumulators():
+    """Accumulators built on separate chunks can be merged after pickling."""
+    returns = _sample_returns().to_numpy(copy=True)
+    returns[5:40, 0] = np.nan
+
+    partials = []
+    for chunk in np.array_split(returns, 4):
+        partial = CovarianceAccumulator().update(chunk)
+        partials.append(pickle.loads(pickle.dumps(partial)))
+
+    merged = CovarianceAccumulator()
+    for partial in partials:
+        merged.merge(partial)
+
+    expected = pd.DataFrame(returns).cov().values
+    assert np.allclose(merged.covariance(), expected, rtol=1e-10, atol=1e-14)
+
+
+def test_min_periods():
+    """Pairs with too few joint observations are reported as NaN."""
+    returns = _sample_returns(n_days=20, n_assets=2)
+    returns.iloc[:18, 1] = np.nan
+
+    cov = blocked_covariance([returns], min_periods=5)
+
+    assert np.isnan(cov.loc['A0', 'A1'])
+    assert np.isfinite(cov.loc['A0', 'A0'])
+
+
+def test_nearest_psd_repairs_indefinite_matrix():
+    """Negative eigenvalues are removed and the variances are kept."""
+    cov = pd.DataFrame([[1.0, 0.9, -0.9], [0.9, 1.0, 0.9], [-0.9, 0.9, 1.0]],
+                       index=list('abc'), columns=list('abc'))
+    assert np.linalg.eigvalsh(cov).min() < 0
+
+    repaired = nearest_psd(cov)
+
+    assert list(repaired.index) == list('abc')
+    assert np.linalg.eigvalsh(repaired).min() >= -1e-12
+    assert np.allclose(np.diag(repaired), 1.0)
+    # Already positive semi-definite matrices are returned unchanged
+    assert nearest_psd(repaired) is repaired
@@ -1,23 +1,32 @@
 import unittest
+import numpy as np
 from src.data.data_loader import DataLoader
+from src.data.market_data import MarketData, SyntheticSource
 
 class TestDataLoader(unittest.TestCase):
 
     def setUp(self):
-        self.data_loader = DataLoader()
+        self.symbols = ['AAA', 'BBB', 'CCC']
+        self.data_loader = DataLoader(self.symbols, start_date='2019-01-01', end_date='2021-12-31',
+                                      market_data=MarketData(source=SyntheticSource(seed=5)))
 
     def test_load_data(self):
-        # Assuming load_data returns a DataFrame or similar structure
-        data = self.data_loader.load_data('path/to/data.csv')
+        data = self.data_loader.load_data()
         self.assertIsNotNone(data)
         self.assertGreater(len(data), 0)
+        self.assertListEqual(list(data.columns), self.symbols)
 
-    def test_preprocess_data(self):
-        raw_data = self.data_loader.load_data('path/to/data.csv')
-        processed_data = self.data_loader.preprocess_data(raw_data)
-        self.assertIsNotNone(processed_data)
-        self.assertGreater(len(processed_data), 0)
-        # Add more assertions based on expected preprocessing outcomes
+    def test_calculate_returns(self):
+        returns = self.data_loader.calculate_returns()
+        self.assertEqual(len(returns), len(self.data_loader.data) - 1)
+        self.assertFalse(returns.isna().any().any())
+
+    def test_annualized_statistics(self):
+        returns = self.data_loader.calculate_returns()
+        cov = self.data_loader.get_covariance_matrix()
+        self.assertTrue(np.allclose(self.data_loader.get_annualized_returns(), returns.mean() * 252))
+        self.assertTrue(np.allclose(cov, returns.cov() * 252))
+        self.assertTrue(np.allclose(self.data_loader.get_covariance_matrix(block_size=100), cov))
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,69 @@
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.optimization.discrete_allocation import DiscreteAllocation
+
+
+def _deviation(weights, prices, value, shares):
+    return np.abs(weights * value - shares * prices).sum()
+
+
+def test_greedy_allocation_respects_budget():
+    """Greedy allocation spends no more than the budget and reports leftover cash."""
+    weights = pd.Series([0.5, 0.3, 0.2], index=['A', 'B', 'C'])
+    prices = pd.Series([120.0, 45.0, 310.0], index=['C', 'B', 'A'])[['A', 'B', 'C']]
+
+    result = DiscreteAllocation(weights, prices, total_portfolio_value=10000).greedy_portfolio()
+    allocation = result['allocation']
+
+    assert list(allocation.index) == ['A', 'B', 'C']
+    spent = (allocation * prices).sum()
+    assert spent <= 10000
+    assert np.isclose(result['leftover'], 10000 - spent)
+    assert np.isclose(result['weights'].sum(), spent / 10000)
+
+
+def test_prices_are_aligned_by_name():
+    """Prices given in a different order are matched to the weights by name."""
+    weights = pd.Series([0.0, 1.0], index=['A', 'B'])
+    prices = pd.Series([10.0, 1000.0], index=['B', 'A'])
+
+    result = DiscreteAllocation(weights, prices, total_portfolio_value=100).greedy_portfolio()
+
+    assert result['allocation']['B'] == 10
+    assert result['allocation']['A'] == 0
+
+
+def test_milp_is_optimal_within_rounding_and_beats_greedy():
+    """The MILP finds the best up/down rounding, which greedy may miss."""
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        weights = rng.dirichlet(np.ones(6))
+        prices = rng.uniform(10, 300, 6)
+        allocation = DiscreteAllocation(weights, prices, total_portfolio_value=1500)
+
+        greedy = allocation.greedy_portfolio()
+        exact = allocation.milp_portfolio()
+        assert exact['tracking_error'] <= greedy['tracking_error'] + 1e-12
+        assert exact['leftover'] >= -1e-9
+
+        floor = np.floor(weights * 1500 / prices)
+        best = min(_deviation(weights, prices, 1500, floor + np.array(up))
+                   for up in itertools.product([0, 1], repeat=6)
+                   if (floor + np.array(up)) @ prices <= 1500)
+        assert np.isclose(exact['tracking_error'] * 1500, best)
+
+
+def test_invalid_inputs():
+    """Short positions and non-positive prices are rejected."""
+    with pytest.raises(ValueError):
+        DiscreteAllocation(np.array([1.2, -0.2]), np.array([10.0, 10.0]))
+    with pytest.raises(ValueError):
+        DiscreteAllocation(np.array([0.5, 0.5]), np.array([10.0, 0.0]))
@@ -0,0 +1,144 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.data_loader import DataLoader
+from src.data.market_data import FileSource, MarketData, MarketDataSource, SyntheticSource
+
+
+class CountingSource(MarketDataSource):
+    """Synthetic source that records every fetch and can be slowed down."""
+
+    def __init__(self, delay=0.0):
+        self.inner = SyntheticSource(seed=1)
+        self.delay = delay
+        self.calls = []
+        self.ranges = []
+        self._lock = threading.Lock()
+
+    def fetch(self, tickers, start_date, end_date):
+        with self._lock:
+            self.calls.append(list(tickers))
+            self.ranges.append((start_date, end_date))
+        time.sleep(self.delay)
+        return self.inner.fetch(tickers, start_date, end_date)
+
+
+def test_synthetic_source_is_reproducible():
+    """A ticker's history does not depend on the other tickers requested."""
+    source = SyntheticSource(seed=3)
+    both = source.fetch(['AAA', 'BBB'], pd.Timestamp('2020-01-01'), pd.Timestamp('2020-06-30'))
+    alone = source.fetch(['BBB'], pd.Timestamp('2020-01-01'), pd.Timestamp('2020-06-30'))
+
+    pd.testing.assert_series_equal(both['BBB'], alone['BBB'])
+    assert (both > 0).all().all()
+
+
+def test_cached_range_serves_sub_range():
+    """A request inside a cached range is served without another load."""
+    source = CountingSource()
+    market_data = MarketData(source=source)
+
+    full = market_data.get_price_data(['AAA', 'BBB'], '2020-01-01', '2020-12-31')
+    part = market_data.get_price_data('AAA', '2020-03-01', '2020-03-31')
+
+    assert len(source.calls) == 1
+    pd.testing.assert_series_equal(part, full['AAA'].loc['2020-03-01':'2020-03-31'])
+    assert market_data.cache_info()['hits'] == 1
+
+
+def test_overlapping_range_fetches_only_missing_dates():
+    """A partially cached range loads the missing dates and is cached as one union."""
+    source = CountingSource()
+    market_data = MarketData(source=source)
+
+    market_data.get_price_data(['AAA', 'BBB'], '2020-03-01', '2020-08-31')
+    prices = market_data.get_price_data(['AAA', 'BBB'], '2020-01-01', '2020-12-31')
+
+    assert source.ranges[1:] == [(pd.Timestamp('2020-01-01'), pd.Timestamp('2020-02-29')),
+                                 (pd.Timestamp('2020-09-01'), pd.Timestamp('2020-12-31'))]
+    assert all(calls == ['AAA', 'BBB'] for calls in source.calls)
+    expected = SyntheticSource(seed=1).fetch(['AAA', 'BBB'], pd.Timestamp('2020-01-01'),
+                                             pd.Timestamp('2020-12-31'))
+    assert np.allclose(prices.values, expected.values)
+    assert market_data.cache_info()['entries'] == 2
+
+    market_data.get_price_data('AAA', '2020-02-01', '2020-10-31')
+    assert len(source.calls) == 3
+
+
+def test_get_returns_uses_the_calling_threads_prices():
+    """Returns come from the prices passed in or last retrieved by the same thread."""
+    market_data = MarketData(source=CountingSource())
+    prices = market_data.get_price_data(['AAA', 'BBB'], '2020-01-01', '2020-12-31')
+
+    other = threading.Thread(target=market_data.get_price_data, args=('CCC', '2021-01-01', '2021-06-30'))
+    other.start()
+    other.join()
+
+    pd.testing.assert_frame_equal(market_data.get_returns(), prices.pct_change().dropna())
+    assert market_data.returns_data is not None
+    assert len(market_data.get_returns('monthly', prices=prices)) == 11
+    with pytest.raises(ValueError):
+        MarketData(source=CountingSource()).get_returns()
+
+
+def test_concurrent_requests_are_coalesced():
+    """Two callers asking for the same data cause a single load."""
+    source = CountingSource(delay=0.2)
+    market_data = MarketData(source=source)
+    results = []
+
+    def request():
+        results.append(market_data.get_price_data(['AAA', 'BBB'], '2021-01-01', '2021-06-30'))
+
+    threads = [threading.Thread(target=request) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(source.calls) == 1
+    pd.testing.assert_frame_equal(results[0], results[1])
+    assert market_data.cache_info()['coalesced'] == 2
+
+
+def test_size_based_eviction():
+    """The least recently used entries are evicted to respect the byte budget."""
+    source = CountingSource()
+    one_year = SyntheticSource(seed=1).fetch(['AAA'], pd.Timestamp('2020-01-01'), pd.Timestamp('2020-12-31'))
+    budget = int(one_year['AAA'].memory_usage(deep=True)) * 2
+    market_data = MarketData(source=source, max_cache_bytes=budget)
+
+    for ticker in ['AAA', 'BBB', 'CCC']:
+        market_data.get_price_data(ticker, '2020-01-01', '2020-12-31')
+
+    info = market_data.cache_info()
+    assert info['entries'] == 2
+    assert info['evictions'] == 1
+    assert info['bytes'] <= budget
+
+    market_data.get_price_data('AAA', '2020-01-01', '2020-12-31')
+    assert len(source.calls) == 4
+
+
+def test_file_source_and_data_loader_delegation(tmp_path):
+    """DataLoader can load prices from CSV files through MarketData."""
+    prices = SyntheticSource().fetch(['AAA', 'BBB'], pd.Timestamp('2020-01-01'), pd.Timestamp('2020-12-31'))
+    prices.to_csv(tmp_path / 'panel.csv')
+
+    market_data = MarketData(source=FileSource(str(tmp_path / 'panel.csv')))
+    loader = DataLoader(['AAA', 'BBB'], start_date='2020-02-01', end_date='2020-11-30',
+                        market_data=market_data)
+    data = loader.load_data()
+
+    assert list(data.columns) == ['AAA', 'BBB']
+    assert np.allclose(data.values, prices.loc['2020-02-01':'2020-11-30'].values)
+    assert loader.get_covariance_matrix().shape == (2, 2)
@@ -8,27 +8,30 @@ import os
 # Add the src directory to the path so we can import our modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+from src.data.synthetic import generate_returns
 from src.optimization.markowitz import MarkowitzOptimizer
 
 class TestMarkowitzOptimizer(unittest.TestCase):
 
     def setUp(self):
-        self.optimizer = MarkowitzOptimizer()
+        returns = generate_returns(n_assets=5, n_days=756, seed=42)
+        self.expected_returns = returns.mean() * 252
+        self.cov_matrix = returns.cov() * 252
+        self.optimizer = MarkowitzOptimizer(self.expected_returns, self.cov_matrix)
 
-    def test_calculate_optimal_weights(self):
-        expected_weights = [0.4, 0.6]  # Example expected weights
-        returns = [0.1, 0.2]  # Example returns
-        risks = [0.15, 0.25]  # Example risks
-        optimal_weights = self.optimizer.calculate_optimal_weights(returns, risks)
-        self.assertAlmostEqual(optimal_weights[0], expected_weights[0], places=2)
-        self.assertAlmostEqual(optimal_weights[1], expected_weights[1], places=2)
+    def test_minimize_volatility_with_target_return(self):
+        target = self.expected_returns.median()
+        result = self.optimizer.minimize_volatility(target_return=target)
+        self.assertAlmostEqual(result['expected_return'], target, places=4)
+        self.assertAlmostEqual(result['weights'].sum(), 1.0, places=6)
+        self.assertListEqual(list(result['weights'].index), list(self.expected_returns.index))
 
-    def test_get_efficient_frontier(self):
-        expected_frontier = [(0.1, 0.15), (0.2, 0.25)]  # Example expected frontier points
-        frontier = self.optimizer.get_efficient_frontier()
-        self.assertEqual(len(frontier), len(expected_frontier))
-        for point in frontier:
-            self.assertIn(point, expected_frontier)
+    def test_efficient_frontier(self):
+        frontier = self.optimizer.efficient_frontier(points=8)
+        self.assertEqual(len(frontier), 8)
+        self.assertListEqual(list(frontier.columns), ['Return', 'Volatility', 'Sharpe'])
+        # Volatility increases along the frontier
+        self.assertTrue((np.diff(frontier['Volatility']) > -1e-6).all())
 
 def test_portfolio_return_calculation():
     """Test that portfolio return calculation is correct."""
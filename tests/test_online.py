@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.online import OnlineEstimator
+from src.optimization.markowitz import MarkowitzOptimizer
+
+
+def _bars(n_bars=400, n_assets=5, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(0.001, 0.02, size=(n_bars, n_assets))
+
+
+def test_welford_matches_sample_statistics():
+    """Without decay the estimates equal the sample mean and covariance."""
+    bars = _bars()
+    estimator = OnlineEstimator(bars.shape[1]).update_many(bars)
+
+    assert estimator.nobs == len(bars)
+    assert np.allclose(estimator.mean, bars.mean(axis=0))
+    assert np.allclose(estimator.covariance, np.cov(bars.T))
+
+
+def test_ewma_matches_pandas():
+    """With decay the estimates equal pandas' exponentially weighted moments."""
+    bars = pd.DataFrame(_bars(n_bars=2000))
+    estimator = OnlineEstimator(bars.shape[1], alpha=0.25).update_many(bars)
+
+    ewm = bars.ewm(alpha=0.25, adjust=False)
+    assert np.allclose(estimator.mean, ewm.mean().iloc[-1].values)
+    assert np.allclose(estimator.covariance, ewm.cov(bias=True).loc[len(bars) - 1].values)
+
+
+def test_halflife_and_validation():
+    """Half-life is converted to a smoothing factor and bad input is rejected."""
+    estimator = OnlineEstimator(3, halflife=10)
+    assert np.isclose((1 - estimator.alpha) ** 10, 0.5)
+
+    with pytest.raises(ValueError):
+        OnlineEstimator(3, halflife=10, alpha=0.1)
+    with pytest.raises(ValueError):
+        estimator.update(np.zeros(4))
+
+
+def test_snapshot_feeds_optimizer():
+    """Snapshots are labelled, annualized and usable by MarkowitzOptimizer."""
+    columns = ['A', 'B', 'C', 'D', 'E']
+    estimator = OnlineEstimator(columns=columns, annualization=252).update_many(_bars())
+    snapshot = estimator.snapshot()
+
+    assert list(snapshot.expected_returns.index) == columns
+    assert np.allclose(snapshot.cov_matrix.values, estimator.covariance * 252)
+
+    result = MarkowitzOptimizer(snapshot.expected_returns, snapshot.cov_matrix).minimize_volatility()
+    assert np.isclose(result['weights'].sum(), 1.0)
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+import tracemalloc
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.data_loader import DataLoader
+from src.data.market_data import MarketData, SyntheticSource
+from src.data.synthetic import generate_prices, generate_returns
+from src.optimization.black_litterman import BlackLittermanModel
+from src.optimization.markowitz import MarkowitzOptimizer
+from src.optimization.resampling import draw_samples
+from src.utils import risk_metrics
+from src.utils.precision import as_float64, storage_dtype
+
+
+def _loader(precision):
+    return DataLoader(['AAA', 'BBB', 'CCC', 'DDD'], start_date='2018-01-01', end_date='2021-12-31',
+                      market_data=MarketData(SyntheticSource(seed=2)), precision=precision)
+
+
+def test_storage_dtype():
+    assert storage_dtype('float32') == np.float32
+    assert storage_dtype() == np.float64
+    with pytest.raises(ValueError):
+        storage_dtype('float16')
+
+
+def test_as_float64_copies_only_when_needed():
+    series = pd.Series([1.0, 2.0])
+    assert as_float64(series) is series
+    assert as_float64(series.astype(np.float32)).dtype == np.float64
+    assert as_float64(np.ones(3, dtype=np.float32)).dtype == np.float64
+
+
+def test_data_loader_float32_storage_with_float64_statistics():
+    single, double = _loader('float32'), _loader('float64')
+
+    returns = single.calculate_returns()
+    assert (returns.dtypes == np.float32).all()
+    assert returns.memory_usage(index=False).sum() * 2 == \
+        double.calculate_returns().memory_usage(index=False).sum()
+
+    cov = single.get_covariance_matrix()
+    means = single.get_annualized_returns()
+    assert (cov.dtypes == np.float64).all() and means.dtype == np.float64
+    assert np.allclose(cov, double.get_covariance_matrix(), rtol=1e-5)
+    assert np.allclose(means, double.get_annualized_returns(), rtol=1e-4, atol=1e-7)
+
+
+def test_optimizer_weights_barely_change():
+    single, double = _loader('float32'), _loader('float64')
+    weights = [MarkowitzOptimizer(loader.get_annualized_returns(),
+                                  loader.get_covariance_matrix()).minimize_volatility()['weights']
+               for loader in (single, double)]
+    assert np.abs(weights[0] - weights[1]).max() < 1e-4
+
+
+def test_float32_scenarios_accumulate_in_float64():
+    returns = generate_returns(n_assets=5, n_days=500, seed=4)
+    means, covs = draw_samples(returns, 64, method='parametric', seed=0, precision='float32')
+
+    assert means.dtype == np.float64 and covs.dtype == np.float64
+    # Sampling error, not rounding, dominates: the average stays close to the estimate
+    assert np.allclose(covs.mean(axis=0), returns.cov() * 252, rtol=0.1, atol=1e-3)
+
+
+def test_risk_metrics_of_float32_returns():
+    returns = generate_returns(n_assets=1, n_days=2000, seed=8).iloc[:, 0].to_numpy()
+    single = returns.astype(np.float32)
+
+    assert risk_metrics.calculate_sharpe_ratio(single) == pytest.approx(
+        risk_metrics.calculate_sharpe_ratio(returns), rel=1e-5)
+    assert risk_metrics.calculate_maximum_drawdown(single) == pytest.approx(
+        risk_metrics.calculate_maximum_drawdown(returns), rel=1e-5)
+
+
+@pytest.mark.parametrize('missing', ['drop', 'pairwise'])
+def test_float32_returns_allocate_less(missing):
+    """float32 storage lowers peak memory instead of casting a float64 panel at the end."""
+    prices = generate_prices(100, 3000, seed=6)
+    peaks = {}
+    for precision in ('float64', 'float32'):
+        loader = DataLoader(list(prices.columns), precision=precision, missing=missing)
+        loader.data = prices
+        tracemalloc.start()
+        try:
+            loader.calculate_returns()
+            peaks[precision] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    # The float64 returns panel alone is 2.4 MB
+    assert peaks['float64'] - peaks['float32'] > 0.9 * 100 * 2999 * 4
+
+
+def test_black_litterman_upcasts_float32_covariance():
+    """Black-Litterman solves in float64 even with a float32 covariance."""
+    cov = (generate_returns(n_assets=4, n_days=750, seed=9).cov() * 252).astype(np.float32)
+    model = BlackLittermanModel(np.ones(4), 2.5, cov)
+
+    assert (model.cov_matrix.dtypes == np.float64).all()
+    assert model.incorporate_views(np.array([[1.0, -1.0, 0.0, 0.0]]), np.array([0.02])).dtype == np.float64
@@ -0,0 +1,76 @@
+import json
+import numpy as np
+import pytest
+import sys
+import os
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.synthetic import generate_market_caps, generate_returns
+from src.optimization.black_litterman import BlackLittermanModel
+from src.optimization.markowitz import MarkowitzOptimizer
+from src.utils.profiling import Profiler, disable_profiling, enable_profiling, get_profiler
+
+
+@pytest.fixture
+def profiler():
+    yield enable_profiling()
+    disable_profiling()
+
+
+def _optimizer():
+    returns = generate_returns(n_assets=4, n_days=500, seed=0)
+    return MarkowitzOptimizer(returns.mean() * 252, returns.cov() * 252)
+
+
+def test_disabled_profiler_records_nothing():
+    """With profiling off the hooks are no-ops."""
+    disable_profiling()
+    get_profiler().reset()
+    _optimizer().minimize_volatility()
+
+    report = get_profiler().report()
+    assert report['stages'] == {}
+    assert report['solvers'] == {}
+
+
+def test_stage_timing():
+    """Stages accumulate call counts and durations."""
+    profiler = Profiler(enabled=True)
+    for _ in range(3):
+        with profiler.stage('work'):
+            sum(range(1000))
+
+    stage = profiler.report()['stages']['work']
+    assert stage['calls'] == 3
+    assert 0 < stage['max'] <= stage['total']
+
+
+def test_solver_statistics(profiler):
+    """Optimizer stages and SLSQP counters are recorded."""
+    _optimizer().minimize_volatility()
+
+    report = profiler.report()
+    assert report['stages']['markowitz.minimize_volatility']['calls'] == 1
+    solver = report['solvers']['markowitz.minimize_volatility']
+    assert solver['calls'] == 1
+    assert solver['nit'] > 0
+    assert solver['nfev'] > 0
+    assert solver['constraint_evaluations'] > 0
+
+
+def test_black_litterman_and_json_export(profiler, tmp_path):
+    """Black-Litterman stages appear in the exported JSON report."""
+    returns = generate_returns(n_assets=4, n_days=500, seed=1)
+    model = BlackLittermanModel(generate_market_caps(4), 2.5, returns.cov() * 252)
+    model.adjust_views(np.array([[1.0, -1.0, 0.0, 0.0]]), np.array([0.02]))
+
+    filename = tmp_path / 'report.json'
+    profiler.export_json(filename)
+    with open(filename) as f:
+        report = json.load(f)
+
+    assert report['run_id'] == profiler.run_id
+    assert 'black_litterman.adjust_views' in report['stages']
+    assert report['solvers']['black_litterman.optimize_portfolio']['calls'] == 1
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.synthetic import generate_market_caps, generate_returns
+from src.optimization.black_litterman import BlackLittermanModel
+from src.optimization.markowitz import MarkowitzOptimizer
+from src.optimization.rebalancing import RebalancingOptimizer
+
+
+@pytest.fixture
+def optimizer():
+    returns = generate_returns(n_assets=6, n_days=750, seed=21)
+    return MarkowitzOptimizer(returns.mean() * 252, returns.cov() * 252)
+
+
+def test_costs_reduce_turnover(optimizer):
+    """Higher trading costs lead to less trading, and prohibitive costs to none."""
+    holdings = pd.Series(1 / 6, index=optimizer.asset_names)
+    turnovers = [optimizer.rebalance(holdings, risk_aversion=10, linear_cost=c)['turnover']
+                 for c in (0.0, 0.01, 0.05)]
+
+    assert turnovers[0] > turnovers[1] > turnovers[2]
+    result = optimizer.rebalance(holdings, risk_aversion=10, linear_cost=10.0)
+    assert result['turnover'] == 0
+    assert result['trades'].empty
+
+
+def test_zero_cost_matches_mean_variance_optimum(optimizer):
+    """Without costs the target does not depend on the starting holdings."""
+    first = optimizer.rebalance(np.full(6, 1 / 6), risk_aversion=2)
+    second = optimizer.rebalance(np.eye(6)[0], risk_aversion=2)
+
+    assert np.allclose(first['weights'], second['weights'], atol=1e-4)
+    assert np.isclose(first['weights'].sum(), 1.0)
+
+
+def test_report_contents(optimizer):
+    """Expected costs and the trade list are consistent with the weights."""
+    holdings = np.full(6, 1 / 6)
+    result = optimizer.rebalance(holdings, risk_aversion=3, linear_cost=0.002,
+                                 impact_cost=0.05, impact_exponent=1.5)
+    trades = result['trades']
+
+    assert np.allclose(trades['target'] - trades['current'], trades['trade'])
+    assert np.isclose(result['costs']['linear'], 0.002 * result['turnover'])
+    assert np.isclose(result['costs']['impact'], (0.05 * trades['trade'].abs() ** 1.5).sum())
+    assert set(trades['side']) <= {'buy', 'sell'}
+    assert (trades.loc[trades['trade'] > 0, 'side'] == 'buy').all()
+
+
+def test_band_applied_in_rebalance(optimizer):
+    """No executed trade is smaller than the band."""
+    holdings = np.full(6, 1 / 6)
+    result = optimizer.rebalance(holdings, risk_aversion=50, linear_cost=0.001, no_trade_band=0.02)
+
+    assert np.isclose(result['weights'].sum(), 1.0)
+    assert (result['trades']['trade'].abs() >= 0.02).all()
+
+
+def test_band_with_holdings_not_fully_invested():
+    """Cash left in the portfolio is invested in trades outside the band."""
+    rebalancer = RebalancingOptimizer(np.array([0.08, 0.06, 0.07, 0.05]), np.diag([0.04, 0.03, 0.05, 0.02]),
+                                      risk_aversion=5)
+    holdings = np.array([0.02, 0.03, 0.03, 0.02])
+
+    result = rebalancer.rebalance(holdings, linear_cost=0.001, no_trade_band=0.05)
+
+    assert result['success']
+    assert np.isclose(result['weights'].sum(), 1.0)
+    assert (result['trades']['trade'].abs() >= 0.05).all()
+
+
+def test_infeasible_band_is_reported():
+    """A band that leaves no way to meet the budget fails instead of returning bad weights."""
+    rebalancer = RebalancingOptimizer(np.array([0.08, 0.06, 0.07, 0.05]), np.diag([0.04, 0.03, 0.05, 0.02]))
+    holdings = np.array([0.2, 0.2, 0.2, 0.3])
+
+    # No single asset can be bought by more than 0.1, below the band
+    result = rebalancer.rebalance(holdings, no_trade_band=0.15, bounds=(0, 0.3))
+
+    assert not result['success']
+
+
+def test_black_litterman_rebalance():
+    """Black-Litterman rebalancing uses the posterior returns."""
+    returns = generate_returns(n_assets=4, n_days=750, seed=22)
+    model = BlackLittermanModel(generate_market_caps(4), 2.5, returns.cov() * 252)
+    P = np.array([[1.0, 0.0, 0.0, -1.0]])
+
+    result = model.rebalance(P, np.array([0.05]), model.weights_market, linear_cost=0.001)
+
+    assert np.isclose(result['weights'].sum(), 1.0)
+    assert result['weights'].iloc[0] > model.weights_market[0]
+
+
+def test_invalid_exponent(optimizer):
+    """Impact exponents below one would make the cost concave."""
+    with pytest.raises(ValueError):
+        RebalancingOptimizer(optimizer.expected_returns, optimizer.cov_matrix).rebalance(
+            np.full(6, 1 / 6), impact_cost=0.1, impact_exponent=0.5)
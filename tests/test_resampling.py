@@ -0,0 +1,71 @@
+import numpy as np
+import sys
+import os
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.synthetic import generate_returns
+from src.optimization.markowitz import MarkowitzOptimizer
+from src.optimization.resampling import (_moments, draw_samples, frontier_weights,
+                                         resampled_frontier_weights)
+
+
+def test_bootstrap_moments_match_resampled_panel():
+    """Weighting rows by bootstrap counts equals resampling them."""
+    returns = generate_returns(n_assets=4, n_days=60, seed=0).values
+    counts = np.random.default_rng(0).multinomial(60, np.full(60, 1 / 60), size=3)
+
+    means, covs = _moments(returns, counts.astype(float))
+
+    for k in range(3):
+        panel = np.repeat(returns, counts[k], axis=0)
+        assert np.allclose(means[k], panel.mean(axis=0))
+        assert np.allclose(covs[k], np.cov(panel, rowvar=False))
+
+
+def test_draw_samples_shapes_and_centre():
+    """Samples are annualized and scattered around the point estimates."""
+    returns = generate_returns(n_assets=5, n_days=500, seed=1)
+    for method in ('bootstrap', 'parametric'):
+        means, covs = draw_samples(returns, 200, method=method, seed=2)
+        assert means.shape == (200, 5)
+        assert covs.shape == (200, 5, 5)
+        assert np.allclose(means.mean(axis=0), returns.mean() * 252, atol=0.05)
+        assert np.allclose(covs.mean(axis=0), returns.cov() * 252, rtol=0.1, atol=1e-3)
+
+
+def test_frontier_weights_are_feasible_and_ordered():
+    """Frontier portfolios are fully invested, long-only and increase in return."""
+    returns = generate_returns(n_assets=6, n_days=500, seed=3)
+    mu, cov = returns.mean().values * 252, returns.cov().values * 252
+
+    weights = frontier_weights(mu, cov, points=10)
+
+    assert np.allclose(weights.sum(axis=1), 1.0)
+    assert (weights > -1e-8).all()
+    assert (np.diff(weights @ mu) > -1e-6).all()
+    assert np.isclose(weights[-1] @ mu, mu.max(), atol=1e-6)
+
+
+def test_process_pool_matches_serial():
+    """Averaging over worker processes gives the serial result."""
+    returns = generate_returns(n_assets=4, n_days=300, seed=4)
+    means, covs = draw_samples(returns, 6, seed=5)
+
+    serial = resampled_frontier_weights(means, covs, points=5, n_jobs=1)
+    parallel = resampled_frontier_weights(means, covs, points=5, n_jobs=2)
+
+    assert np.allclose(serial, parallel)
+
+
+def test_optimizer_resampled_frontier():
+    """MarkowitzOptimizer exposes the resampled frontier with labelled weights."""
+    returns = generate_returns(n_assets=4, n_days=500, seed=6)
+    optimizer = MarkowitzOptimizer(returns.mean() * 252, returns.cov() * 252)
+
+    result = optimizer.resampled_efficient_frontier(returns, n_samples=8, points=6, n_jobs=1, seed=0)
+
+    assert list(result['frontier'].columns) == ['Return', 'Volatility', 'Sharpe']
+    assert list(result['weights'].columns) == list(returns.columns)
+    assert np.allclose(result['weights'].sum(axis=1), 1.0)
@@ -0,0 +1,228 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+import sys
+import os
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.data_loader import DataLoader
+from src.data.market_data import MarketData, SyntheticSource
+from src.optimization.markowitz import MarkowitzOptimizer
+from src.service import OptimizationService
+
+SYMBOLS = ['AAA', 'BBB', 'CCC', 'DDD']
+UNIVERSE = {'symbols': SYMBOLS, 'start_date': '2020-01-01', 'end_date': '2022-12-31'}
+
+
+class GatedExecutor(ThreadPoolExecutor):
+    """Thread pool whose tasks wait until ``gate`` is set."""
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.gate = threading.Event()
+
+    def submit(self, fn, *args, **kwargs):
+        def run():
+            self.gate.wait(timeout=10)
+            return fn(*args, **kwargs)
+        return super().submit(run)
+
+
+async def request(address, method, path, payload=None):
+    """Send one HTTP request and return the status and decoded JSON body."""
+    if isinstance(address, str):
+        reader, writer = await asyncio.open_unix_connection(address)
+    else:
+        reader, writer = await asyncio.open_connection(*address)
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(content)
+
+
+def run_service(scenario, **kwargs):
+    """Start a service on a free localhost port, run ``scenario(service)`` and stop it."""
+    async def main():
+        kwargs.setdefault('market_data', MarketData(SyntheticSource(seed=3)))
+        service = OptimizationService(**kwargs)
+        await service.start(**kwargs_start)
+        try:
+            return await scenario(service)
+        finally:
+            await service.close()
+
+    kwargs_start = {'path': kwargs.pop('path')} if 'path' in kwargs else {}
+    return asyncio.run(main())
+
+
+def test_markowitz_in_process_pool():
+    async def scenario(service):
+        status, health = await request(service.address, 'GET', '/health')
+        assert status == 200 and health == {'status': 'ok'}
+        return await request(service.address, 'POST', '/optimize/markowitz', UNIVERSE)
+
+    # The service creates and shuts down its own process pool
+    status, result = run_service(scenario, max_workers=1)
+
+    loader = DataLoader(SYMBOLS, UNIVERSE['start_date'], UNIVERSE['end_date'],
+                        market_data=MarketData(SyntheticSource(seed=3)))
+    loader.load_data()
+    expected = MarkowitzOptimizer(loader.get_annualized_returns(),
+                                  loader.get_covariance_matrix()).minimize_volatility()
+    assert status == 200
+    assert list(result['weights']) == SYMBOLS
+    assert np.allclose(list(result['weights'].values()), expected['weights'], atol=1e-6)
+    assert result['volatility'] == pytest.approx(expected['volatility'])
+
+
+def test_identical_requests_are_coalesced():
+    async def scenario(service):
+        payload = dict(UNIVERSE, points=5)
+        responses = await asyncio.gather(*[
+            request(service.address, 'POST', '/optimize/markowitz', payload) for _ in range(4)])
+        return responses, service.stats()
+
+    responses, stats = run_service(scenario, max_workers=1, executor=ThreadPoolExecutor(1))
+
+    assert all(status == 200 for status, _ in responses)
+    assert all(body == responses[0][1] for _, body in responses)
+    assert len(responses[0][1]['frontier']['Return']) == 5
+    assert stats['solves'] == 1
+    assert stats['coalesced'] == 3
+    assert stats['universes'] == 1
+    # Prices were loaded once for the shared universe
+    assert stats['market_data']['loads'] == 1
+
+
+def test_full_queue_rejects_with_503():
+    executor = GatedExecutor()
+
+    async def scenario(service):
+        await request(service.address, 'POST', '/universe', UNIVERSE)
+
+        async def solve(target):
+            payload = dict(UNIVERSE, target_return=target)
+            return await request(service.address, 'POST', '/optimize/markowitz', payload)
+
+        first = asyncio.create_task(solve(0.01))
+        while service.stats()['in_flight'] < 1 or service.stats()['queue_depth']:
+            await asyncio.sleep(0.01)
+        second = asyncio.create_task(solve(0.02))
+        while service.stats()['queue_depth'] < 1:
+            await asyncio.sleep(0.01)
+
+        rejected = await solve(0.03)
+        executor.gate.set()
+        return rejected, await first, await second, service.stats()
+
+    rejected, first, second, stats = run_service(scenario, max_workers=1, max_queue=1, executor=executor)
+
+    assert rejected[0] == 503
+    assert first[0] == 200 and second[0] == 200
+    assert stats['rejected'] == 1
+    assert stats['solves'] == 2
+
+
+def test_black_litterman_mean_variance_and_stats():
+    async def scenario(service):
+        views = dict(UNIVERSE, market_caps=[4, 3, 2, 1], P=[[1, -1, 0, 0]], Q=[0.02])
+        bl = await request(service.address, 'POST', '/optimize/black_litterman', views)
+        mv = await request(service.address, 'POST', '/optimize/mean_variance',
+                           dict(UNIVERSE, risk_aversion=[1.0, 5.0]))
+        bad = await request(service.address, 'POST', '/optimize/black_litterman',
+                            dict(UNIVERSE, market_caps=[1, 1], P=[[1, 0]], Q=[0.0]))
+        missing = await request(service.address, 'POST', '/optimize/markowitz', {})
+        unknown = await request(service.address, 'GET', '/nope')
+        wrong_method = await request(service.address, 'GET', '/optimize/markowitz')
+        stats = await request(service.address, 'GET', '/stats')
+        return bl, mv, bad, missing, unknown, wrong_method, stats
+
+    bl, mv, bad, missing, unknown, wrong_method, stats = run_service(
+        scenario, max_workers=1, executor=ThreadPoolExecutor(1))
+
+    assert bl[0] == 200
+    assert sum(bl[1]['weights'].values()) == pytest.approx(1.0, abs=1e-6)
+    assert mv[0] == 200 and len(mv[1]['weights']) == 2
+    assert all(sum(w.values()) == pytest.approx(1.0) for w in mv[1]['weights'])
+    assert bad[0] == 400 and missing[0] == 400
+    assert unknown[0] == 404 and wrong_method[0] == 405
+
+    latency = stats[1]['latency_ms']
+    assert latency['/optimize/black_litterman']['count'] == 2
+    assert 0 < latency['/optimize/black_litterman']['p50'] <= latency['/optimize/black_litterman']['p99']
+    assert stats[1]['errors'] == 4
+
+
+def test_unix_socket(tmp_path):
+    path = str(tmp_path / 'service.sock')
+
+    async def scenario(service):
+        return await request(service.address, 'POST', '/universe', UNIVERSE)
+
+    status, body = run_service(scenario, path=path, max_workers=1, executor=ThreadPoolExecutor(1))
+    assert status == 200
+    assert body == dict(UNIVERSE, n_assets=4)
+
+
+def test_invalid_content_length_gets_400():
+    async def scenario(service):
+        reader, writer = await asyncio.open_connection(*service.address)
+        writer.write(b"POST /universe HTTP/1.1\r\nHost: localhost\r\nContent-Length: abc\r\n\r\n")
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response
+
+    response = run_service(scenario, max_workers=1, executor=ThreadPoolExecutor(1))
+    assert response.startswith(b'HTTP/1.1 400')
+
+
+def test_cancelled_universe_load_is_retried_and_universes_are_bounded():
+    async def scenario(service):
+        loading = asyncio.create_task(service.universe(SYMBOLS, '2020-01-01', '2022-12-31'))
+        await asyncio.sleep(0)
+        loading.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await loading
+        # The cancelled load does not leave a pending entry behind
+        assert not service._universes
+        universe = await asyncio.wait_for(service.universe(SYMBOLS, '2020-01-01', '2022-12-31'), 10)
+
+        for symbols in (SYMBOLS[:2], SYMBOLS[:3], SYMBOLS[1:]):
+            await service.universe(symbols, '2020-01-01', '2022-12-31')
+        return universe, service.stats()
+
+    universe, stats = run_service(scenario, max_workers=1, executor=ThreadPoolExecutor(1), max_universes=2)
+    assert list(universe.expected_returns.index) == SYMBOLS
+    assert stats['universes'] == 2
+
+
+def test_workers_keep_universe_statistics():
+    """Statistics are sent to a worker once; later solves send only their parameters."""
+    async def scenario(service):
+        results = []
+        for target in (None, 0.08, None):
+            payload = dict(UNIVERSE) if target is None else dict(UNIVERSE, target_return=target)
+            results.append(await request(service.address, 'POST', '/optimize/markowitz', payload))
+        no_end = await request(service.address, 'POST', '/optimize/markowitz',
+                               {'symbols': SYMBOLS, 'start_date': '2020-01-01'})
+        return results, no_end, service.stats()
+
+    results, no_end, stats = run_service(scenario, max_workers=1, executor=ThreadPoolExecutor(1))
+
+    assert all(status == 200 for status, _ in results)
+    assert results[0][1] == results[2][1]
+    assert stats['universe_transfers'] == 1
+    assert stats['solves'] == 3
+    # Without an explicit end date the universe would change with the day
+    assert no_end[0] == 400
@@ -0,0 +1,35 @@
+import subprocess
+import sys
+import os
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def _loaded_modules(statement):
+    check = f"{statement}\nimport sys\nprint(' '.join(sorted(sys.modules)))"
+    output = subprocess.run([sys.executable, '-c', check], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return set(output.split())
+
+
+def test_package_import_skips_heavy_dependencies():
+    """matplotlib, yfinance and scipy.optimize are only imported on first use."""
+    loaded = _loaded_modules('import src.optimization.markowitz, src.optimization.black_litterman, '
+                             'src.optimization.batch, src.optimization.discrete_allocation, '
+                             'src.data.data_loader, src.visualization.efficient_frontier, '
+                             'src.visualization.performance_charts')
+    for module in ('scipy.optimize', 'matplotlib', 'yfinance'):
+        assert module not in loaded
+
+
+def test_cli_help_does_not_import_optimizers():
+    result = subprocess.run([sys.executable, os.path.join('src', 'main.py'), '--help'], cwd=ROOT,
+                            capture_output=True, text=True)
+    assert result.returncode == 0
+    assert '--symbols' in result.stdout
+
+    loaded = _loaded_modules("import runpy, sys\nsys.argv = ['main.py', '--help']\n"
+                             "try:\n    runpy.run_path('src/main.py', run_name='__main__')\n"
+                             "except SystemExit:\n    pass")
+    assert 'pandas' not in loaded
+    assert 'src.optimization.markowitz' not in loaded
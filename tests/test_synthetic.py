@@ -0,0 +1,38 @@
+import numpy as np
+import sys
+import os
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.synthetic import generate_market_caps, generate_prices, generate_returns
+
+
+def test_generate_returns_is_seeded():
+    """The same seed gives the same panel and a different seed does not."""
+    first = generate_returns(n_assets=20, n_days=100, seed=1)
+    second = generate_returns(n_assets=20, n_days=100, seed=1)
+    other = generate_returns(n_assets=20, n_days=100, seed=2)
+
+    assert first.shape == (100, 20)
+    assert first.equals(second)
+    assert not first.equals(other)
+
+
+def test_generate_returns_has_factor_structure():
+    """A common market factor makes assets positively correlated on average."""
+    returns = generate_returns(n_assets=30, n_days=2000, seed=3)
+    corr = returns.corr().values
+    off_diagonal = corr[~np.eye(30, dtype=bool)]
+
+    assert off_diagonal.mean() > 0.2
+    assert 0.1 < returns.std().mean() * np.sqrt(252) < 0.5
+
+
+def test_generate_prices_and_market_caps():
+    """Prices start at the initial price and stay positive; caps are positive."""
+    prices = generate_prices(n_assets=5, n_days=500, initial_price=50.0, seed=4)
+
+    assert np.allclose(prices.iloc[0], 50.0)
+    assert (prices > 0).all().all()
+    assert (generate_market_caps(5) > 0).all()